@@ -0,0 +1,236 @@
+"""
+Batch Pipeline Runner
+Runs many videos through the pipeline with a dedicated worker pool per stage
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from video_pipeline_orchestrator import VideoPipelineOrchestrator
+    from analysers.replay_heatmap import extract_video_id
+except ImportError:
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from ab.dc.video_pipeline_orchestrator import VideoPipelineOrchestrator
+    from ab.dc.analysers.replay_heatmap import extract_video_id
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of input for a stage worker
+_STOP = object()
+
+
+def load_queue_file(queue_file: Path) -> List[str]:
+    """
+    Load video URLs or IDs from a queue file
+
+    One URL or video ID per line. Blank lines and lines starting with '#'
+    are ignored.
+
+    Args:
+        queue_file: Path to queue file
+
+    Returns:
+        List of URLs or video IDs
+    """
+    urls = []
+    with open(queue_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                urls.append(line)
+    return urls
+
+
+class BatchPipelineRunner:
+    """
+    Runs a batch of videos through VideoPipelineOrchestrator stages concurrently
+
+    Each stage has its own pool of worker threads sized for the resource it
+    uses (network downloads, CPU encodes, LLM/image calls, upload quota).
+    Stages are connected by bounded queues, so a fast stage blocks instead of
+    piling up work in front of a slow one, while every pool stays busy with
+    a different video.
+    """
+
+    def __init__(
+        self,
+        orchestrator: VideoPipelineOrchestrator,
+        download_workers: int = 2,
+        encode_workers: Optional[int] = None,
+        llm_workers: int = 4,
+        upload_workers: int = 1,
+        queue_size: int = 2
+    ):
+        """
+        Initialize batch runner
+
+        Args:
+            orchestrator: Orchestrator used to run each stage
+            download_workers: Concurrent fetch jobs (moments, video, subtitles)
+            encode_workers: Concurrent clip encodes (default: cores / 4, min 1)
+            llm_workers: Concurrent AI metadata/thumbnail jobs
+            upload_workers: Concurrent publish jobs
+            queue_size: Maximum videos waiting in front of each stage
+        """
+        if encode_workers is None:
+            # Each ffmpeg encode is already multi-threaded
+            encode_workers = max(1, (os.cpu_count() or 1) // 4)
+
+        self.orchestrator = orchestrator
+        self.queue_size = queue_size
+        self.pool_sizes = {
+            "fetch": download_workers,
+            "encode": encode_workers,
+            "enrich": llm_workers,
+            "publish": upload_workers
+        }
+
+        for stage, size in self.pool_sizes.items():
+            if size < 1:
+                raise ValueError(f"{stage} workers must be >= 1, got: {size}")
+
+    def run(
+        self,
+        urls: List[str],
+        publish: bool = False,
+        privacy: str = "public",
+        dry_run: bool = False,
+        resume: bool = True
+    ) -> Dict:
+        """
+        Process all videos through the pipeline
+
+        Args:
+            urls: YouTube URLs or video IDs
+            publish: Whether to publish clips to YouTube
+            privacy: Privacy status (public, private, unlisted)
+            dry_run: Test without actually publishing
+            resume: Reuse completed steps recorded in pipeline_state.json
+
+        Returns:
+            Dictionary with batch results:
+            {
+                'total_videos': int,
+                'successful': int,
+                'failed': int,
+                'results': List[Dict],  # Per-video results, in input order
+                'total_time': float
+            }
+
+            A video listed more than once runs once; its duplicates share
+            the first entry's result.
+        """
+        start_time = time.time()
+        stages = self.orchestrator.STAGES
+        stage_options = {"publish": publish, "privacy": privacy, "dry_run": dry_run}
+
+        results: List[Optional[Dict]] = [None] * len(urls)
+        results_lock = threading.Lock()
+
+        # Stage i reads from queues[i]; the first queue holds every input
+        queues = [queue.Queue()] + [queue.Queue(maxsize=self.queue_size) for _ in stages[1:]]
+
+        def finish(index: int, result: Dict):
+            with results_lock:
+                results[index] = result
+
+        def worker(stage_index: int):
+            stage = stages[stage_index]
+            inbox = queues[stage_index]
+            is_last = stage_index == len(stages) - 1
+
+            while True:
+                item = inbox.get()
+                if item is _STOP:
+                    break
+
+                index, url, job = item
+                try:
+                    if job is None:
+                        job = self.orchestrator.create_job(url, resume=resume)
+                        if not job["success"]:
+                            finish(index, job)
+                            continue
+
+                    logger.info(f"[{stage}] {job['video_id']}")
+                    failure = self.orchestrator.run_stage(job, stage, **stage_options)
+
+                except Exception as e:
+                    logger.error(f"[{stage}] Pipeline error for {url}: {e}", exc_info=True)
+                    failure = {"success": False, "error": str(e)}
+
+                if failure:
+                    finish(index, failure)
+                elif is_last:
+                    finish(index, job["result"])
+                else:
+                    # Blocks while the next stage is saturated (backpressure)
+                    queues[stage_index + 1].put((index, url, job))
+
+        pools = []
+        for stage_index, stage in enumerate(stages):
+            threads = [
+                threading.Thread(
+                    target=worker,
+                    args=(stage_index,),
+                    name=f"pipeline-{stage}-{n}",
+                    daemon=True
+                )
+                for n in range(self.pool_sizes[stage])
+            ]
+            for thread in threads:
+                thread.start()
+            pools.append(threads)
+
+        logger.info(
+            f"Processing {len(urls)} video(s) with pools: "
+            + ", ".join(f"{stage}={size}" for stage, size in self.pool_sizes.items())
+        )
+
+        # Two workers on the same video would race on its downloads, clips
+        # and pipeline_state.json, so each video id is queued only once
+        first_index: Dict[str, int] = {}
+        duplicates: Dict[int, int] = {}
+        for index, url in enumerate(urls):
+            video_id = extract_video_id(url)
+            if video_id and video_id in first_index:
+                duplicates[index] = first_index[video_id]
+                continue
+            if video_id:
+                first_index[video_id] = index
+            queues[0].put((index, url, None))
+
+        if duplicates:
+            logger.info(f"Skipping {len(duplicates)} duplicate video(s) in batch")
+
+        # Drain stages in order: once a stage's workers exit, stop the next one
+        for stage_index, threads in enumerate(pools):
+            for _ in threads:
+                queues[stage_index].put(_STOP)
+            for thread in threads:
+                thread.join()
+
+        for index, original in duplicates.items():
+            results[index] = results[original]
+
+        successful = sum(1 for r in results if r and r.get("success"))
+        total_time = time.time() - start_time
+
+        logger.info(
+            f"Batch complete: {successful}/{len(urls)} video(s) succeeded in {total_time:.1f}s"
+        )
+
+        return {
+            "total_videos": len(urls),
+            "successful": successful,
+            "failed": len(urls) - successful,
+            "results": results,
+            "total_time": round(total_time, 2)
+        }
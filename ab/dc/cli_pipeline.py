@@ -13,6 +13,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from ab.dc.video_pipeline_orchestrator import VideoPipelineOrchestrator
+from ab.dc.batch_pipeline_runner import BatchPipelineRunner, load_queue_file
 
 # Setup logging
 logging.basicConfig(
@@ -43,6 +44,13 @@ Examples:
   # Custom clip duration limits
   %(prog)s VIDEO_ID --max-duration 60 --min-duration 20
 
+  # Re-run from scratch instead of resuming from pipeline_state.json
+  %(prog)s VIDEO_ID --no-resume
+
+  # Batch: several videos, or a queue file with one URL per line
+  %(prog)s VIDEO_ID_1 VIDEO_ID_2 VIDEO_ID_3
+  %(prog)s --queue-file overnight.txt --encode-workers 2 --llm-workers 6
+
 Complete Workflow:
   The pipeline automatically:
   1. Extracts popular moments using YouTube heatmap data
@@ -56,6 +64,7 @@ Output Structure:
   output/
   └── youtube/
       └── VIDEO_ID/
+          ├── pipeline_state.json        # Step manifest used to resume runs
           ├── video_metadata.json        # Full video information
           ├── moments.json                # Popular moments detected
           ├── VIDEO_ID.mp4               # Downloaded video
@@ -80,10 +89,16 @@ Requirements:
         """
     )
 
-    # Required argument
+    # Input videos
     parser.add_argument(
         'url',
-        help='YouTube URL or video ID'
+        nargs='*',
+        help='YouTube URL(s) or video ID(s)'
+    )
+    parser.add_argument(
+        '--queue-file',
+        type=Path,
+        help='File with one YouTube URL or video ID per line (# for comments)'
     )
 
     # Output options
@@ -143,6 +158,49 @@ Requirements:
         action='store_true',
         help='Skip AI thumbnail generation'
     )
+    proc_group.add_argument(
+        '--no-resume',
+        action='store_true',
+        help='Ignore pipeline_state.json and re-run every step from scratch'
+    )
+    proc_group.add_argument(
+        '--transcribe-missing',
+        action='store_true',
+        help='Transcribe clips with Whisper when the video has no subtitles (needs openai-whisper)'
+    )
+
+    # Batch options
+    batch_group = parser.add_argument_group('Batch Options (multiple videos)')
+    batch_group.add_argument(
+        '--download-workers',
+        type=int,
+        default=2,
+        help='Concurrent moment/video/subtitle downloads (default: 2)'
+    )
+    batch_group.add_argument(
+        '--encode-workers',
+        type=int,
+        default=None,
+        help='Concurrent clip encodes (default: CPU cores / 4)'
+    )
+    batch_group.add_argument(
+        '--llm-workers',
+        type=int,
+        default=4,
+        help='Concurrent AI metadata/thumbnail jobs (default: 4)'
+    )
+    batch_group.add_argument(
+        '--upload-workers',
+        type=int,
+        default=1,
+        help='Concurrent publish jobs (default: 1)'
+    )
+    batch_group.add_argument(
+        '--queue-size',
+        type=int,
+        default=2,
+        help='Videos allowed to wait in front of each stage (default: 2)'
+    )
 
     # Advanced options
     adv_group = parser.add_argument_group('Advanced Options')
@@ -167,6 +225,20 @@ Requirements:
     if args.dry_run and not args.publish:
         parser.error("--dry-run requires --publish flag")
 
+    urls = list(args.url)
+    if args.queue_file:
+        if not args.queue_file.exists():
+            parser.error(f"Queue file not found: {args.queue_file}")
+        urls.extend(load_queue_file(args.queue_file))
+
+    if not urls:
+        parser.error("Provide at least one URL or --queue-file")
+
+    if len(urls) > 1:
+        return run_batch(args, urls)
+
+    args.url = urls[0]
+
     # Show configuration
     print("="*70)
     print("VIDEO PROCESSING PIPELINE")
@@ -186,7 +258,8 @@ Requirements:
         provider=args.provider,
         output_base=args.output,
         max_clip_duration=args.max_duration,
-        min_clip_duration=args.min_duration
+        min_clip_duration=args.min_duration,
+        transcribe_missing_subtitles=args.transcribe_missing
     )
 
     # Process video
@@ -194,7 +267,8 @@ Requirements:
         url_or_id=args.url,
         publish=args.publish,
         privacy=args.privacy,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        resume=not args.no_resume
     )
 
     # Display results
@@ -237,5 +311,64 @@ Requirements:
         return 1
 
 
+def run_batch(args, urls) -> int:
+    """Run several videos through the pipeline with per-stage worker pools"""
+    print("="*70)
+    print("VIDEO PROCESSING PIPELINE (BATCH)")
+    print("="*70)
+    print(f"Videos: {len(urls)}")
+    print(f"Output: {args.output}")
+    print(f"Clip Duration: {args.min_duration}s - {args.max_duration}s")
+    if args.publish:
+        print(f"Publishing: {'DRY RUN' if args.dry_run else 'ENABLED'} (privacy: {args.privacy})")
+    else:
+        print("Publishing: DISABLED")
+    print("="*70)
+    print()
+
+    orchestrator = VideoPipelineOrchestrator(
+        provider=args.provider,
+        output_base=args.output,
+        max_clip_duration=args.max_duration,
+        min_clip_duration=args.min_duration,
+        transcribe_missing_subtitles=args.transcribe_missing
+    )
+
+    runner = BatchPipelineRunner(
+        orchestrator,
+        download_workers=args.download_workers,
+        encode_workers=args.encode_workers,
+        llm_workers=args.llm_workers,
+        upload_workers=args.upload_workers,
+        queue_size=args.queue_size
+    )
+
+    batch = runner.run(
+        urls,
+        publish=args.publish,
+        privacy=args.privacy,
+        dry_run=args.dry_run,
+        resume=not args.no_resume
+    )
+
+    print("\n" + "="*70)
+    print("BATCH COMPLETED")
+    print("="*70)
+    for url, result in zip(urls, batch["results"]):
+        if result and result.get("success"):
+            summary = result.get("summary", {})
+            print(f"  OK   {url}: {summary.get('clips_created', 0)} clips "
+                  f"-> {summary.get('video_dir')}")
+        else:
+            error = result.get("error", "Unknown error") if result else "Not processed"
+            print(f"  FAIL {url}: {error}")
+    print()
+    print(f"Successful: {batch['successful']}/{batch['total_videos']}")
+    print(f"Total time: {batch['total_time']:.1f}s")
+    print("="*70)
+
+    return 0 if batch["failed"] == 0 else 1
+
+
 if __name__ == '__main__':
     sys.exit(main())
@@ -217,6 +217,11 @@ Examples:
     )
 
     # Force options
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        help='Finish all clips within this many seconds, choosing faster presets as needed'
+    )
     parser.add_argument(
         '--force-redownload',
         action='store_true',
@@ -241,6 +246,8 @@ Examples:
             kwargs['force_redownload'] = True
         if args.force_reprocess:
             kwargs['force_reprocess'] = True
+        if args.deadline is not None:
+            kwargs['encode_deadline'] = args.deadline
 
         # FFmpeg options
         ffmpeg_options = {}
@@ -278,7 +285,7 @@ Examples:
         if args.aspect_ratio:
             ffmpeg_options['aspect_ratio'] = args.aspect_ratio
 
-        result = process_video_moments(moments_data, **ffmpeg_options)
+        result = process_video_moments(moments_data, encode_deadline=args.deadline, **ffmpeg_options)
 
     elif not sys.stdin.isatty():
         # Load from stdin (pipe)
@@ -298,7 +305,7 @@ Examples:
         if args.aspect_ratio:
             ffmpeg_options['aspect_ratio'] = args.aspect_ratio
 
-        result = process_video_moments(moments_data, **ffmpeg_options)
+        result = process_video_moments(moments_data, encode_deadline=args.deadline, **ffmpeg_options)
 
     else:
         parser.print_help()
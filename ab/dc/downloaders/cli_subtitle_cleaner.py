@@ -95,7 +95,8 @@ def clean_directory(args):
             directory=directory,
             pattern=args.pattern,
             include_llm_instructions=not args.text_only,
-            overwrite=args.force
+            overwrite=args.force,
+            workers=args.workers
         )
 
         if created_files:
@@ -142,7 +143,13 @@ SUBTITLE CLEANER - USAGE EXAMPLES
 7. Force overwrite existing files:
    python cli_subtitle_cleaner.py batch videos/ --force
 
-8. Process specific clip subtitles:
+   (batch only re-cleans new or changed files, tracked in
+   .subtitle_cleaner_manifest.json inside the directory)
+
+8. Clean a large directory with 8 worker processes:
+   python cli_subtitle_cleaner.py batch subtitles/ --workers 8
+
+9. Process specific clip subtitles:
    python cli_subtitle_cleaner.py batch processed_videos/RusBe_8arLQ/
 
 INTEGRATION WITH VIDEO CLIPPER
@@ -282,7 +289,13 @@ def main():
     batch_parser.add_argument(
         '--force',
         action='store_true',
-        help='Overwrite existing .md files'
+        help='Re-process all files, including unchanged ones'
+    )
+    batch_parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of worker processes (default: 1)'
     )
     batch_parser.set_defaults(func=clean_directory)
 
@@ -52,6 +52,12 @@ Examples:
   # Disable timestamps
   python cli_transcriber.py --url "URL" --no-timestamps
 
+  # Long video: transcribe 5-minute chunks in parallel on all cores
+  python cli_transcriber.py --file "/path/to/video.mp4" --chunk-seconds 300
+
+  # Gameplay/stream video: skip silent stretches before transcribing
+  python cli_transcriber.py --file "/path/to/video.mp4" --vad
+
 Available Whisper models (larger = more accurate but slower):
   • tiny   - Fastest, least accurate (~1GB VRAM)
   • base   - Good balance (default) (~1GB VRAM)
@@ -109,6 +115,28 @@ Common language codes:
         default=None,
         help='Output directory for transcription files (default: from config)'
     )
+    parser.add_argument(
+        '--chunk-seconds',
+        type=float,
+        default=None,
+        help='Split long audio into chunks of about this length and transcribe them in parallel'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for --chunk-seconds (default: CPU count)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always run Whisper, ignoring cached transcriptions'
+    )
+    parser.add_argument(
+        '--vad',
+        action='store_true',
+        help='Skip silent stretches and transcribe only detected speech'
+    )
 
     # Download options (for --url)
     parser.add_argument(
@@ -161,6 +189,10 @@ def print_result_summary(result: dict):
     print(f"Detected language: {result['detected_language']}")
     print(f"Model used: {result['model_used']}")
     print(f"Processing time: {result['processing_time']:.1f}s")
+    if result.get('cached'):
+        print("Result reused from transcription cache")
+    if 'skipped_seconds' in result:
+        print(f"Skipped non-speech audio: {result['skipped_seconds']:.1f}s")
 
     if 'markdown_file' in result:
         print(f"Markdown saved to: {result['markdown_file']}")
@@ -246,7 +278,11 @@ def main():
                 model_size=args.model,
                 language=args.language,
                 include_timestamps=include_timestamps,
-                download_if_needed=not args.no_download
+                download_if_needed=not args.no_download,
+                chunk_seconds=args.chunk_seconds,
+                workers=args.workers,
+                use_cache=not args.no_cache,
+                vad=args.vad
             )
 
         elif args.video_id:
@@ -268,7 +304,11 @@ def main():
                 model_size=args.model,
                 language=args.language,
                 include_timestamps=include_timestamps,
-                output_dir=output_dir
+                output_dir=output_dir,
+                chunk_seconds=args.chunk_seconds,
+                workers=args.workers,
+                use_cache=not args.no_cache,
+                vad=args.vad
             )
 
         elif args.file:
@@ -288,7 +328,11 @@ def main():
                 model_size=args.model,
                 language=args.language,
                 include_timestamps=include_timestamps,
-                output_dir=output_dir
+                output_dir=output_dir,
+                chunk_seconds=args.chunk_seconds,
+                workers=args.workers,
+                use_cache=not args.no_cache,
+                vad=args.vad
             )
 
         # Print result summary
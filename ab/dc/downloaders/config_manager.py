@@ -44,6 +44,8 @@ class Config:
         # Transcription settings
         self.transcriptions_path = Path(os.getenv('TRANSCRIPTIONS_PATH', 'transcriptions/'))
         self.whisper_model = os.getenv('WHISPER_MODEL', 'base')
+        self.whisper_model_memory_mb = int(os.getenv('WHISPER_MODEL_MEMORY_MB', '0'))  # 0 = unlimited
+        self.transcription_cache_dir = os.getenv('TRANSCRIPTION_CACHE_DIR', 'transcriptions/.cache')  # Empty to disable
         self.transcription_language = os.getenv('TRANSCRIPTION_LANGUAGE', '')  # Empty for auto-detection
         self.include_timestamps = self._str_to_bool(os.getenv('INCLUDE_TIMESTAMPS', 'true'))
 
@@ -53,6 +55,9 @@ class Config:
             os.getenv('ENABLE_PARALLEL_PROCESSING', 'true')
         )
         self.clip_timeout = int(os.getenv('CLIP_TIMEOUT', '600'))
+        self.encode_deadline_seconds = float(os.getenv('ENCODE_DEADLINE_SECONDS', '0'))  # 0 = fixed preset
+        self.encode_stats_path = Path(os.getenv('ENCODE_STATS_PATH', 'encode_stats.json'))
+        self.media_probe_cache_path = os.getenv('MEDIA_PROBE_CACHE_PATH', 'media_probe_cache.json')  # Empty for memory only
 
         # Limits
         self.max_video_duration = int(os.getenv('MAX_VIDEO_DURATION', '7200'))
@@ -64,6 +69,11 @@ class Config:
             os.getenv('CLEANUP_SOURCE_VIDEO', 'false')
         )
 
+        # Storage budgets (LRU eviction of files the pipeline wrote, 0 = unlimited = never evict)
+        self.storage_index_path = os.getenv('STORAGE_INDEX_PATH', 'storage_index.db')  # Empty to disable
+        self.downloads_budget_mb = float(os.getenv('DOWNLOADS_BUDGET_MB', '0'))
+        self.processed_budget_mb = float(os.getenv('PROCESSED_BUDGET_MB', '0'))
+
         # Logging
         self.log_level = os.getenv('LOG_LEVEL', 'INFO')
 
@@ -5,12 +5,29 @@ Converts videos to specified aspect ratio, organizing output by ratio
 """
 
 import argparse
+import json
+import os
 import subprocess
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import logging
 
+from ffmpeg_runner import run_ffmpeg
+from media_probe import get_media_probe, file_fingerprint
+
+# Bump when the conversion command changes in a way that affects outputs
+MANIFEST_VERSION = 1
+
+MANIFEST_FILENAME = ".convert_manifest.json"
+
+# ffmpeg threads per conversion when the pool picks its own layout
+# (x264 scales well to about this many threads on short clips)
+DEFAULT_THREADS_PER_JOB = 4
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -65,7 +82,7 @@ def get_aspect_ratio_filter(aspect_ratio: str) -> Optional[str]:
 
 def get_video_info(video_path: Path) -> Optional[Dict]:
     """
-    Get video information using ffprobe
+    Get video information using ffprobe (cached by the shared media probe)
 
     Args:
         video_path: Path to video file
@@ -74,31 +91,16 @@ def get_video_info(video_path: Path) -> Optional[Dict]:
         Dictionary with video info or None if failed
     """
     try:
-        command = [
-            'ffprobe',
-            '-v', 'error',
-            '-select_streams', 'v:0',
-            '-show_entries', 'stream=width,height,duration,codec_name',
-            '-show_entries', 'format=duration,size',
-            '-of', 'default=noprint_wrappers=1',
-            str(video_path)
-        ]
-
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=True
-        )
-
-        info = {}
-        for line in result.stdout.strip().split('\n'):
-            if '=' in line:
-                key, value = line.split('=', 1)
-                info[key] = value
-
-        return info
+        info = get_media_probe().probe(video_path)
+        video = info['video'] or {}
+
+        return {
+            'width': video.get('width', 0),
+            'height': video.get('height', 0),
+            'codec_name': video.get('codec'),
+            'duration': info['duration'],
+            'size': info['file_size']
+        }
 
     except Exception as e:
         logger.warning(f"Não foi possível extrair info do vídeo: {e}")
@@ -133,11 +135,15 @@ def convert_video(
     crf: int = 23,
     preset: str = 'medium',
     force: bool = False,
-    timeout: int = 1200
+    timeout: int = 1200,
+    threads: Optional[int] = None
 ) -> bool:
     """
     Convert video to specified aspect ratio
 
+    The output is written to a temporary name and renamed when complete,
+    so an interrupted conversion never leaves a partial file at output_path.
+
     Args:
         input_path: Path to input video
         output_path: Path for output video
@@ -147,6 +153,7 @@ def convert_video(
         preset: Encoding preset
         force: Overwrite if exists
         timeout: Timeout in seconds (default: 1200 = 20 min)
+        threads: ffmpeg threads (default: ffmpeg decides)
 
     Returns:
         True if successful, False otherwise
@@ -164,6 +171,8 @@ def convert_video(
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    temp_path = output_path.with_name(f".{output_path.stem}.converting{output_path.suffix}")
+
     # Build FFmpeg command
     command = [
         'ffmpeg',
@@ -177,48 +186,316 @@ def convert_video(
         '-movflags', '+faststart',
     ]
 
-    if force:
-        command.append('-y')
+    if threads:
+        command.extend(['-threads', str(threads)])
 
-    command.append(str(output_path))
+    # The temporary file is ours to overwrite
+    command.extend(['-y', str(temp_path)])
 
     logger.info(f"Convertendo: {input_path.name} -> {aspect_ratio}")
     logger.debug(f"FFmpeg command: {' '.join(command)}")
 
     try:
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            check=True
-        )
+        result = run_ffmpeg(command, timeout=timeout, label=output_path.name)
 
         # Verify output
-        if not output_path.exists():
+        if not temp_path.exists():
             logger.error(f"Arquivo de saída não foi criado: {output_path}")
             return False
 
-        file_size = output_path.stat().st_size
+        file_size = temp_path.stat().st_size
         if file_size == 0:
             logger.error("Arquivo de saída está vazio")
+            temp_path.unlink()
             return False
 
-        logger.info(f"Convertido com sucesso: {output_path.name} ({file_size / 1024 / 1024:.1f}MB)")
+        os.replace(temp_path, output_path)
+
+        logger.info(
+            f"Convertido com sucesso: {output_path.name} ({file_size / 1024 / 1024:.1f}MB, "
+            f"{result.stats.wall_seconds:.1f}s, {result.stats.speed:.2f}x)"
+        )
         return True
 
     except subprocess.TimeoutExpired:
         logger.error("Timeout durante conversão")
-        return False
 
     except subprocess.CalledProcessError as e:
         error_msg = e.stderr if e.stderr else str(e)
         logger.error(f"Erro FFmpeg: {error_msg}")
-        return False
 
     except Exception as e:
         logger.error(f"Erro inesperado: {e}")
-        return False
+
+    if temp_path.exists():
+        temp_path.unlink()
+    return False
+
+
+def conversion_params(aspect_ratio: str, codec: str, crf: int, preset: str) -> Dict:
+    """
+    Encode parameters that determine a conversion's output
+
+    Args:
+        aspect_ratio: Target aspect ratio
+        codec: Video codec
+        crf: Quality
+        preset: Encoding preset
+
+    Returns:
+        Dictionary recorded in the manifest
+    """
+    return {
+        'version': MANIFEST_VERSION,
+        'ratio': aspect_ratio,
+        'codec': codec,
+        'crf': crf,
+        'preset': preset
+    }
+
+
+class ConversionManifest:
+    """
+    Record of completed conversions
+
+    Each output is recorded with the fingerprint (size, mtime, inode) of the
+    input it was made from and the encode parameters, so a re-run only
+    converts inputs that are new, changed, or requested with other settings.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Load manifest
+
+        Args:
+            path: Manifest JSON file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load entries from disk"""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Manifest ilegível, ignorando {self.path}: {e}")
+            return {}
+
+    def status(self, input_path: Path, output_path: Path, params: Dict) -> str:
+        """
+        Check whether an output is up to date
+
+        Args:
+            input_path: Input video
+            output_path: Converted video
+            params: Encode parameters (see conversion_params)
+
+        Returns:
+            'current' if the output was made from this input with these
+            parameters, 'untracked' if the output exists but is not in the
+            manifest, otherwise 'stale'
+        """
+        if not output_path.exists():
+            return 'stale'
+
+        with self._lock:
+            entry = self._entries.get(str(output_path.resolve()))
+
+        if entry is None:
+            return 'untracked'
+
+        try:
+            current = (
+                entry['input_fingerprint'] == file_fingerprint(input_path)
+                and entry['output_size'] == output_path.stat().st_size
+            )
+        except OSError:
+            return 'stale'
+
+        return 'current' if current and entry['params'] == params else 'stale'
+
+    def record(self, input_path: Path, output_path: Path, params: Dict):
+        """
+        Record a completed conversion and save the manifest
+
+        Args:
+            input_path: Input video
+            output_path: Converted video
+            params: Encode parameters (see conversion_params)
+        """
+        entry = {
+            'input': str(input_path),
+            'input_fingerprint': file_fingerprint(input_path),
+            'output_size': output_path.stat().st_size,
+            'params': params
+        }
+
+        with self._lock:
+            self._entries[str(output_path.resolve())] = entry
+            try:
+                self._save()
+            except OSError as e:
+                logger.warning(f"Falha ao salvar manifest {self.path}: {e}")
+
+    def _save(self):
+        """Write manifest atomically (lock held)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+
+def plan_workers(
+    jobs: int,
+    workers: Optional[int] = None,
+    threads: Optional[int] = None,
+    cores: Optional[int] = None
+) -> tuple:
+    """
+    Split the CPU cores between concurrent conversions
+
+    Short clips don't scale to many encoder threads, so by default several
+    conversions run at once with a few threads each; with fewer jobs than
+    slots, each job gets a larger share of the cores.
+
+    Args:
+        jobs: Number of conversions
+        workers: Concurrent conversions (default: from the core budget)
+        threads: ffmpeg threads per conversion (default: from the core budget)
+        cores: Cores to use (default: all)
+
+    Returns:
+        Tuple of (workers, threads)
+    """
+    cores = cores or os.cpu_count() or 1
+    auto_threads = threads is None
+
+    if workers is None:
+        if auto_threads:
+            # Round up; threads are re-split across the workers below
+            workers = -(-cores // min(DEFAULT_THREADS_PER_JOB, cores))
+        else:
+            workers = max(1, cores // threads)
+
+    workers = max(1, min(workers, jobs))
+    if auto_threads:
+        threads = max(1, cores // workers)
+
+    return workers, threads
+
+
+def batch_convert(
+    video_files: List[Path],
+    aspect_ratios: List[str],
+    output_dir_for: Callable[[str], Path],
+    manifest: ConversionManifest,
+    codec: str = 'libx264',
+    crf: int = 23,
+    preset: str = 'medium',
+    force: bool = False,
+    timeout: int = 1200,
+    workers: Optional[int] = None,
+    threads: Optional[int] = None
+) -> Dict:
+    """
+    Convert many videos to one or more aspect ratios on a worker pool
+
+    Outputs that the manifest shows were made from the same input with the
+    same parameters are skipped; untracked outputs newer than their input
+    (e.g. from before the manifest existed) are adopted. Remaining jobs run
+    largest input first so the pool drains evenly.
+
+    Args:
+        video_files: Input videos
+        aspect_ratios: Target aspect ratios (each input is converted to all)
+        output_dir_for: Function returning the output folder for a ratio
+        manifest: Conversion manifest
+        codec: Video codec
+        crf: Quality
+        preset: Encoding preset
+        force: Convert even if the output is current
+        timeout: Timeout per conversion in seconds
+        workers: Concurrent conversions (default: from the core budget)
+        threads: ffmpeg threads per conversion (default: from the core budget)
+
+    Returns:
+        Dictionary with total, converted, skipped, failed, workers, threads
+    """
+    jobs = []
+    skipped = 0
+
+    for video_path in video_files:
+        for aspect_ratio in aspect_ratios:
+            output_path = output_dir_for(aspect_ratio) / generate_output_filename(video_path, aspect_ratio)
+            params = conversion_params(aspect_ratio, codec, crf, preset)
+
+            if not force:
+                status = manifest.status(video_path, output_path, params)
+                if status == 'untracked' and output_path.stat().st_mtime >= video_path.stat().st_mtime:
+                    manifest.record(video_path, output_path, params)
+                    status = 'current'
+                if status == 'current':
+                    logger.debug(f"Atualizado (pulando): {output_path.name}")
+                    skipped += 1
+                    continue
+
+            jobs.append((video_path, output_path, aspect_ratio, params))
+
+    total = len(video_files) * len(aspect_ratios)
+    summary = {'total': total, 'converted': 0, 'skipped': skipped, 'failed': 0, 'workers': 0, 'threads': 0}
+    if not jobs:
+        return summary
+
+    workers, threads = plan_workers(len(jobs), workers, threads)
+    summary.update(workers=workers, threads=threads)
+    logger.info(f"Convertendo {len(jobs)} arquivo(s) ({skipped} atualizados): {workers} worker(s) x {threads} thread(s)")
+
+    # Longest jobs first
+    jobs.sort(key=lambda job: job[0].stat().st_size, reverse=True)
+
+    def run(job) -> bool:
+        video_path, output_path, aspect_ratio, params = job
+        success = convert_video(
+            input_path=video_path,
+            output_path=output_path,
+            aspect_ratio=aspect_ratio,
+            codec=codec,
+            crf=crf,
+            preset=preset,
+            force=True,
+            timeout=timeout,
+            threads=threads
+        )
+        if success:
+            manifest.record(video_path, output_path, params)
+        return success
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run, job): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            output_path = futures[future][1]
+            try:
+                success = future.result()
+            except Exception as e:
+                logger.error(f"Erro inesperado em {output_path.name}: {e}")
+                success = False
+
+            summary['converted' if success else 'failed'] += 1
+            logger.info(f"[{done}/{len(jobs)}] {'OK' if success else 'FALHOU'}: {output_path.name}")
+
+    # Salva as sondagens do lote de uma vez
+    get_media_probe().save()
+    return summary
 
 
 def find_video_files(path: Path) -> List[Path]:
@@ -276,6 +553,9 @@ Exemplos:
   # Forçar re-conversão mesmo se existir
   %(prog)s video.mp4 --ratio 4:5 --force
 
+  # Converter uma pasta para vários ratios (só arquivos novos ou alterados)
+  %(prog)s videos/ -r 9:16 -r 1:1 -r 4:5
+
 Aspect ratios suportados:
   9:16  - Vertical (Reels, TikTok, Shorts) 1080x1920
   16:9  - Horizontal (YouTube) 1920x1080
@@ -293,8 +573,9 @@ Aspect ratios suportados:
     parser.add_argument(
         '--ratio', '-r',
         required=True,
+        action='append',
         choices=['9:16', '16:9', '1:1', '4:5'],
-        help='Aspect ratio de saída'
+        help='Aspect ratio de saída (repita -r para vários)'
     )
 
     parser.add_argument(
@@ -344,6 +625,24 @@ Aspect ratios suportados:
         help='Timeout por vídeo em segundos (padrão: 1200 = 20min)'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Conversões simultâneas (padrão: conforme núcleos da CPU)'
+    )
+
+    parser.add_argument(
+        '--threads',
+        type=int,
+        help='Threads do FFmpeg por conversão (padrão: núcleos / workers)'
+    )
+
+    parser.add_argument(
+        '--manifest',
+        type=str,
+        help=f'Manifest de conversões (padrão: {MANIFEST_FILENAME} na pasta de saída ou de entrada)'
+    )
+
     args = parser.parse_args()
 
     # Set log level
@@ -366,67 +665,60 @@ Aspect ratios suportados:
 
     logger.info(f"Encontrados {len(video_files)} vídeo(s) para processar")
 
+    # Remove duplicate ratios, keeping order
+    ratios = list(dict.fromkeys(args.ratio))
+    base_dir = input_path.parent if input_path.is_file() else input_path
+
     # Determine output directory
-    if args.output:
-        output_dir = Path(args.output).resolve()
-    else:
+    def output_dir_for(aspect_ratio: str) -> Path:
+        if args.output:
+            return Path(args.output).resolve()
         # Create folder named with ratio next to input
-        ratio_folder = args.ratio.replace(':', 'x')
-        if input_path.is_file():
-            output_dir = input_path.parent / ratio_folder
-        else:
-            output_dir = input_path / ratio_folder
+        return base_dir / aspect_ratio.replace(':', 'x')
 
-    logger.info(f"Pasta de saída: {output_dir}")
+    for ratio in ratios:
+        logger.info(f"Pasta de saída ({ratio}): {output_dir_for(ratio)}")
 
-    # Process videos
-    successful = 0
-    failed = 0
-    skipped = 0
-
-    for i, video_path in enumerate(video_files, 1):
-        logger.info(f"\n[{i}/{len(video_files)}] Processando: {video_path.name}")
-
-        # Generate output filename
-        output_filename = generate_output_filename(video_path, args.ratio)
-        output_path = output_dir / output_filename
-
-        # Check if already exists
-        if output_path.exists() and not args.force:
-            logger.info(f"Já existe (pulando): {output_filename}")
-            skipped += 1
-            continue
-
-        # Convert video
-        success = convert_video(
-            input_path=video_path,
-            output_path=output_path,
-            aspect_ratio=args.ratio,
-            codec=args.codec,
-            crf=args.crf,
-            preset=args.preset,
-            force=args.force,
-            timeout=args.timeout
-        )
+    if args.manifest:
+        manifest_path = Path(args.manifest)
+    elif args.output:
+        manifest_path = Path(args.output).resolve() / MANIFEST_FILENAME
+    else:
+        manifest_path = base_dir / MANIFEST_FILENAME
+    manifest = ConversionManifest(manifest_path)
 
-        if success:
-            successful += 1
-        else:
-            failed += 1
+    # Process videos
+    summary = batch_convert(
+        video_files=video_files,
+        aspect_ratios=ratios,
+        output_dir_for=output_dir_for,
+        manifest=manifest,
+        codec=args.codec,
+        crf=args.crf,
+        preset=args.preset,
+        force=args.force,
+        timeout=args.timeout,
+        workers=args.workers,
+        threads=args.threads
+    )
 
     # Summary
     print("\n" + "=" * 60)
     print("RESUMO DA CONVERSÃO")
     print("=" * 60)
-    print(f"Total de vídeos: {len(video_files)}")
-    print(f"Convertidos com sucesso: {successful}")
-    print(f"Já existiam (pulados): {skipped}")
-    print(f"Falharam: {failed}")
-    print(f"Pasta de saída: {output_dir}")
+    print(f"Total de vídeos: {len(video_files)} x {len(ratios)} ratio(s) = {summary['total']}")
+    print(f"Convertidos com sucesso: {summary['converted']}")
+    print(f"Já atualizados (pulados): {summary['skipped']}")
+    print(f"Falharam: {summary['failed']}")
+    if summary['workers']:
+        print(f"Workers: {summary['workers']} x {summary['threads']} thread(s)")
+    for ratio in ratios:
+        print(f"Pasta de saída ({ratio}): {output_dir_for(ratio)}")
     print("=" * 60)
 
     # Exit code
-    if failed == len(video_files):
+    failed = summary['failed']
+    if failed and failed == summary['total']:
         sys.exit(1)  # All failed
     elif failed > 0:
         sys.exit(2)  # Some failed
@@ -0,0 +1,190 @@
+"""
+Download Coordinator
+De-duplicates concurrent downloads of the same video within and across
+processes
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process de-duplication only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def temp_download_path(output_path: Path) -> Path:
+    """
+    Get the temporary path a download is written to before the final rename
+
+    The name is deterministic, so an interrupted download can be found
+    (and resumed) by the next attempt.
+
+    Args:
+        output_path: Final file path
+
+    Returns:
+        Hidden temporary path next to the final file
+    """
+    output_path = Path(output_path)
+    return output_path.with_name(f".{output_path.stem}.download{output_path.suffix}")
+
+
+def _file_identity(path: Path) -> Optional[tuple]:
+    """Identity of a file (inode, size, mtime) or None if missing"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class DownloadCoordinator:
+    """
+    Runs at most one download per output path at a time
+
+    Within a process, callers for a path that is already downloading wait
+    for the in-flight download and share its result (or its exception).
+    Across processes, an exclusive lock file per output path serializes
+    downloads. Under the lock, a complete file already at the output path
+    (produced by another thread or process, before or while we waited) is
+    reused instead of downloading it again.
+
+    Downloads are written to a temporary name and renamed into place only
+    when complete, so readers never see a partial file at the final path.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def fetch(
+        self,
+        output_path: Path,
+        download: Callable[[Path], None],
+        is_complete: Optional[Callable[[Path], bool]] = None
+    ) -> Path:
+        """
+        Download a file once, sharing the result with concurrent callers
+
+        Args:
+            output_path: Final file path
+            download: Function writing the complete file to the given
+                temporary path (raises on failure)
+            is_complete: Check whether an existing output_path is a complete
+                file that can be reused (default: any non-empty file)
+
+        Returns:
+            Path to the downloaded file (output_path)
+
+        Raises:
+            Whatever download raised, for the caller that ran it and for
+            every caller that waited on it
+        """
+        output_path = Path(output_path)
+        key = str(output_path.resolve())
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            logger.info(f"Waiting for in-flight download: {output_path.name}")
+            return future.result()
+
+        try:
+            path = self._download_locked(output_path, download, is_complete)
+            future.set_result(path)
+            return path
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def is_downloading(self, output_path: Path) -> bool:
+        """
+        Check whether this process is downloading a path
+
+        Args:
+            output_path: Final file path
+
+        Returns:
+            True if a download for the path is in flight
+        """
+        with self._lock:
+            return str(Path(output_path).resolve()) in self._inflight
+
+    def _download_locked(
+        self,
+        output_path: Path,
+        download: Callable[[Path], None],
+        is_complete: Optional[Callable[[Path], bool]]
+    ) -> Path:
+        """Download under the inter-process lock for output_path"""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with _exclusive_lock(output_path):
+            # Another caller may have finished this download before or while we waited
+            identity = _file_identity(output_path)
+            if identity is not None and identity[1] > 0 and (is_complete is None or is_complete(output_path)):
+                logger.info(f"Reusing completed download: {output_path.name}")
+                return output_path
+
+            temp_path = temp_download_path(output_path)
+            download(temp_path)
+
+            if not temp_path.exists():
+                raise FileNotFoundError(f"Download completed but file not found: {temp_path}")
+
+            os.replace(temp_path, output_path)
+            return output_path
+
+
+@contextmanager
+def _exclusive_lock(output_path: Path) -> Iterator[None]:
+    """Hold an exclusive lock file for a download (blocks until acquired)"""
+    if fcntl is None:
+        yield
+        return
+
+    lock_path = output_path.with_name(f".{output_path.name}.lock")
+    with open(lock_path, 'a') as lock_file:
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logger.info(f"Waiting for another process downloading: {output_path.name}")
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+_coordinator: Optional[DownloadCoordinator] = None
+_coordinator_lock = threading.Lock()
+
+
+def get_download_coordinator() -> DownloadCoordinator:
+    """
+    Get the process-wide download coordinator
+
+    Returns:
+        Shared DownloadCoordinator instance
+    """
+    global _coordinator
+    with _coordinator_lock:
+        if _coordinator is None:
+            _coordinator = DownloadCoordinator()
+        return _coordinator
@@ -0,0 +1,306 @@
+"""
+Encode Planner
+Measures encode speed per codec, resolution and preset on this host and
+picks presets that meet a batch deadline
+"""
+
+import os
+import json
+import time
+import socket
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# x264/x265 presets, fastest first
+PRESETS = [
+    'ultrafast', 'superfast', 'veryfast', 'faster', 'fast',
+    'medium', 'slow', 'slower', 'veryslow'
+]
+
+# Typical libx264 speed relative to 'medium', used to extrapolate presets
+# that have not been measured yet on this host
+RELATIVE_PRESET_SPEED = {
+    'ultrafast': 6.0,
+    'superfast': 4.5,
+    'veryfast': 3.0,
+    'faster': 2.0,
+    'fast': 1.4,
+    'medium': 1.0,
+    'slow': 0.65,
+    'slower': 0.3,
+    'veryslow': 0.12,
+}
+
+# Weight of the newest measurement in the moving average
+SPEED_EWMA_ALPHA = 0.3
+
+# Planned speed is discounted by this factor to leave headroom
+DEADLINE_SAFETY = 0.8
+
+
+class EncodeStats:
+    """
+    Persistent encode speed measurements for this host
+
+    Speeds are realtime factors (media seconds encoded per wall second for
+    one encode), kept as an exponentially weighted moving average per
+    codec, source height, aspect ratio and preset.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Load stats file
+
+        Args:
+            path: JSON stats file (shared files keep one section per host)
+        """
+        self.path = Path(path)
+        self.host = socket.gethostname()
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        """Load stats from disk"""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable encode stats {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        """Write stats atomically (lock held)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def _key(codec: str, height: int, aspect_ratio: str, preset: str) -> str:
+        return f"{codec}|{height}|{aspect_ratio}|{preset}"
+
+    def record(
+        self,
+        codec: str,
+        height: int,
+        aspect_ratio: str,
+        preset: str,
+        media_seconds: float,
+        wall_seconds: float
+    ) -> float:
+        """
+        Add a measurement
+
+        Args:
+            codec: Video codec
+            height: Source video height
+            aspect_ratio: Output aspect ratio
+            preset: Encoding preset
+            media_seconds: Duration of the encoded clip
+            wall_seconds: Time the encode took
+
+        Returns:
+            Updated speed estimate
+        """
+        if media_seconds <= 0 or wall_seconds <= 0:
+            return 0.0
+
+        speed = media_seconds / wall_seconds
+        key = self._key(codec, height, aspect_ratio, preset)
+
+        with self._lock:
+            host_stats = self._data.setdefault(self.host, {})
+            entry = host_stats.get(key)
+            if entry:
+                entry['speed'] = SPEED_EWMA_ALPHA * speed + (1 - SPEED_EWMA_ALPHA) * entry['speed']
+                entry['samples'] += 1
+            else:
+                entry = host_stats[key] = {'speed': speed, 'samples': 1}
+            entry['updated_at'] = time.time()
+
+            try:
+                self._save()
+            except OSError as e:
+                logger.warning(f"Failed to save encode stats: {e}")
+
+            return entry['speed']
+
+    def speed(self, codec: str, height: int, aspect_ratio: str, preset: str) -> Optional[float]:
+        """
+        Estimate encode speed
+
+        Uses the measurement for the exact preset when available, otherwise
+        extrapolates from the closest measured preset at the same settings.
+
+        Args:
+            codec: Video codec
+            height: Source video height
+            aspect_ratio: Output aspect ratio
+            preset: Encoding preset
+
+        Returns:
+            Realtime factor, or None if nothing was measured for these settings
+        """
+        with self._lock:
+            host_stats = self._data.get(self.host, {})
+            entry = host_stats.get(self._key(codec, height, aspect_ratio, preset))
+            if entry:
+                return entry['speed']
+
+            measured = [
+                (p, host_stats[self._key(codec, height, aspect_ratio, p)])
+                for p in PRESETS
+                if self._key(codec, height, aspect_ratio, p) in host_stats
+            ]
+
+        if not measured:
+            return None
+
+        # Prefer the measurement with the most samples, then the nearest preset
+        target = PRESETS.index(preset)
+        base_preset, base = max(
+            measured,
+            key=lambda item: (item[1]['samples'], -abs(PRESETS.index(item[0]) - target))
+        )
+        return base['speed'] * RELATIVE_PRESET_SPEED[preset] / RELATIVE_PRESET_SPEED[base_preset]
+
+
+class AdaptivePresetPlanner:
+    """
+    Chooses a preset per clip so a batch of encodes finishes by a deadline
+
+    Before each clip, the remaining media seconds are compared with the
+    remaining time and worker count to get the required speed, and the
+    slowest (best compression) preset whose estimated speed meets it is
+    used. If earlier clips ran slow and the queue backs up, later clips
+    automatically get faster presets.
+    """
+
+    def __init__(
+        self,
+        stats: EncodeStats,
+        codec: str,
+        height: int,
+        aspect_ratio: str,
+        total_media_seconds: float,
+        deadline_seconds: float,
+        workers: int = 1,
+        slowest_preset: str = 'medium'
+    ):
+        """
+        Initialize planner for one batch
+
+        Args:
+            stats: Encode speed measurements
+            codec: Video codec (libx264, libx265)
+            height: Source video height
+            aspect_ratio: Output aspect ratio
+            total_media_seconds: Total duration of all clips in the batch
+            deadline_seconds: Wall time budget for the whole batch
+            workers: Concurrent encodes
+            slowest_preset: Slowest preset to use even with time to spare
+        """
+        self.stats = stats
+        self.codec = codec
+        self.height = height
+        self.aspect_ratio = aspect_ratio
+        self.deadline_seconds = deadline_seconds
+        self.workers = max(1, workers)
+        self.slowest_preset = slowest_preset if slowest_preset in PRESETS else 'medium'
+
+        self._remaining_media = total_media_seconds
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        self.choices: List[str] = []
+
+    def next_preset(self, clip_seconds: float) -> str:
+        """
+        Pick the preset for the next clip and reserve its work
+
+        Args:
+            clip_seconds: Duration of the clip about to be encoded
+
+        Returns:
+            Preset name
+        """
+        with self._lock:
+            remaining_time = self.deadline_seconds - (time.monotonic() - self._started)
+            remaining_media = self._remaining_media
+            self._remaining_media = max(0.0, self._remaining_media - clip_seconds)
+
+            if remaining_time <= 0:
+                preset = PRESETS[0]
+            else:
+                required = remaining_media / (remaining_time * self.workers) / DEADLINE_SAFETY
+                preset = self._slowest_meeting(required)
+
+            self.choices.append(preset)
+
+        logger.info(
+            f"Adaptive preset: {preset} for {clip_seconds:.0f}s clip "
+            f"({remaining_media:.0f}s media left, {max(0.0, remaining_time):.0f}s to deadline)"
+        )
+        return preset
+
+    def _slowest_meeting(self, required_speed: float) -> str:
+        """Slowest allowed preset whose estimated speed meets the requirement"""
+        candidates = PRESETS[:PRESETS.index(self.slowest_preset) + 1]
+
+        for preset in reversed(candidates):
+            speed = self.stats.speed(self.codec, self.height, self.aspect_ratio, preset)
+            if speed is None:
+                # Nothing measured yet: start at the configured preset to learn
+                return self.slowest_preset
+            if speed >= required_speed:
+                return preset
+
+        return candidates[0]
+
+    def record(self, preset: str, media_seconds: float, wall_seconds: float):
+        """
+        Record a finished encode
+
+        Args:
+            preset: Preset used
+            media_seconds: Media encoded (ffmpeg progress out_time)
+            wall_seconds: Duration of the ffmpeg run
+        """
+        speed = self.stats.record(
+            self.codec, self.height, self.aspect_ratio, preset, media_seconds, wall_seconds
+        )
+        logger.debug(f"Encode speed {self.codec}/{self.height}p/{preset}: {speed:.2f}x")
+
+
+_stats: Optional[EncodeStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_encode_stats(path: Optional[Path] = None) -> EncodeStats:
+    """
+    Get the process-wide encode stats
+
+    Args:
+        path: Stats file (default: ENCODE_STATS_PATH env var or encode_stats.json)
+
+    Returns:
+        Shared EncodeStats instance
+    """
+    global _stats
+    path = Path(path or os.getenv('ENCODE_STATS_PATH', 'encode_stats.json'))
+    with _stats_lock:
+        if _stats is None or _stats.path != path:
+            _stats = EncodeStats(path)
+        return _stats
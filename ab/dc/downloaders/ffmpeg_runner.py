@@ -0,0 +1,420 @@
+"""
+FFmpeg Runner
+Runs ffmpeg with live progress reporting and per-job resource usage
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import signal
+import logging
+import threading
+import subprocess
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds between progress log lines for one job
+PROGRESS_LOG_INTERVAL = 5.0
+
+_OUTPUT_HEADER = re.compile(r"^Output #0, ([\w,]+), to ")
+_STREAM_LINE = re.compile(r"^\s+Stream #0:\d+\S*: (Video|Audio): (\w+)(.*)$")
+_MUXER_SUMMARY = re.compile(
+    r"video:\s*(\d+)\s*(?:kB|KiB)\s+audio:\s*(\d+)\s*(?:kB|KiB).*?muxing overhead:\s*([\d.]+|unknown)"
+)
+_CHANNEL_LAYOUTS = {'mono': 1, 'stereo': 2, '2.1': 3, 'quad': 4, '5.0': 5, '5.1': 6, '7.1': 8}
+
+
+@dataclass
+class FFmpegProgress:
+    """Snapshot of one ffmpeg -progress block"""
+    frame: int = 0
+    fps: float = 0.0
+    bitrate_kbps: float = 0.0
+    total_size: int = 0
+    out_time_seconds: float = 0.0
+    speed: float = 0.0
+    done: bool = False
+    percent: Optional[float] = None  # Only when the expected duration is known
+
+
+@dataclass
+class FFmpegStats:
+    """Resource usage and final progress of a finished ffmpeg job"""
+    label: str
+    returncode: int
+    wall_seconds: float
+    cpu_user_seconds: Optional[float] = None
+    cpu_system_seconds: Optional[float] = None
+    max_rss_mb: Optional[float] = None
+    frames: int = 0
+    fps: float = 0.0
+    speed: float = 0.0
+    out_time_seconds: float = 0.0
+    bitrate_kbps: float = 0.0
+    total_size: int = 0
+
+    @property
+    def cpu_seconds(self) -> Optional[float]:
+        """Total CPU time (user + system)"""
+        if self.cpu_user_seconds is None:
+            return None
+        return self.cpu_user_seconds + (self.cpu_system_seconds or 0.0)
+
+
+@dataclass
+class FFmpegResult:
+    """Result of run_ffmpeg (mirrors subprocess.CompletedProcess)"""
+    args: List[str]
+    returncode: int
+    stderr: str
+    stats: FFmpegStats
+    stdout: Optional[str] = None
+    progress: List[FFmpegProgress] = field(default_factory=list, repr=False)
+
+    @property
+    def output_summary(self) -> Dict:
+        """Output streams and muxer summary parsed from stderr"""
+        return parse_output_summary(self.stderr)
+
+
+def _with_progress_args(command: List[str]) -> List[str]:
+    """Insert -progress pipe:1 -nostats after the ffmpeg binary"""
+    return [command[0], '-progress', 'pipe:1', '-nostats'] + list(command[1:])
+
+
+def _parse_time(value: str) -> float:
+    """Parse ffmpeg out_time (HH:MM:SS.micro) to seconds"""
+    try:
+        hours, minutes, seconds = value.split(':')
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    except ValueError:
+        return 0.0
+
+
+def _parse_number(value: str) -> float:
+    """Parse ffmpeg numeric values such as '2.5x', '1234.5kbits/s' or 'N/A'"""
+    value = value.strip().rstrip('x').replace('kbits/s', '')
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+def _build_progress(values: Dict[str, str], duration: Optional[float]) -> FFmpegProgress:
+    """Build a progress snapshot from one block of key=value lines"""
+    if 'out_time_us' in values:
+        out_time = _parse_number(values['out_time_us']) / 1_000_000
+    elif 'out_time_ms' in values:
+        # Despite the name, out_time_ms is in microseconds
+        out_time = _parse_number(values['out_time_ms']) / 1_000_000
+    else:
+        out_time = _parse_time(values.get('out_time', '0:0:0'))
+
+    progress = FFmpegProgress(
+        frame=int(_parse_number(values.get('frame', '0'))),
+        fps=_parse_number(values.get('fps', '0')),
+        bitrate_kbps=_parse_number(values.get('bitrate', '0')),
+        total_size=int(_parse_number(values.get('total_size', '0'))),
+        out_time_seconds=max(0.0, out_time),
+        speed=_parse_number(values.get('speed', '0')),
+        done=values.get('progress') == 'end'
+    )
+    if duration:
+        progress.percent = min(100.0, 100.0 * progress.out_time_seconds / duration)
+    return progress
+
+
+def parse_output_summary(stderr: str) -> Dict:
+    """
+    Parse the output stream layout and muxer summary from ffmpeg stderr
+
+    Reads the 'Output #0' block (codec, resolution, frame rate, sample
+    rate, channels of each stream) and the final 'video:..kB audio:..kB
+    muxing overhead' line. Requires the default 'info' log level.
+
+    Args:
+        stderr: ffmpeg stderr
+
+    Returns:
+        Dictionary with format_name, 'video'/'audio' sub-dicts (None if
+        absent), video_kb, audio_kb and muxing_overhead, or an empty dict
+        if no output block was found
+    """
+    summary: Dict = {}
+    in_output = False
+
+    for line in stderr.splitlines():
+        header = _OUTPUT_HEADER.match(line)
+        if header:
+            in_output = True
+            summary = {'format_name': header.group(1), 'video': None, 'audio': None}
+            continue
+
+        if in_output:
+            if line and not line[0].isspace():
+                in_output = False
+            else:
+                stream = _STREAM_LINE.match(line)
+                if stream:
+                    kind, codec, params = stream.groups()
+                    key = kind.lower()
+                    if summary[key] is None:
+                        summary[key] = _parse_stream_params(kind, codec, params)
+                continue
+
+        muxer = _MUXER_SUMMARY.search(line)
+        if muxer and summary:
+            summary['video_kb'] = int(muxer.group(1))
+            summary['audio_kb'] = int(muxer.group(2))
+            overhead = muxer.group(3)
+            summary['muxing_overhead'] = float(overhead) if overhead != 'unknown' else None
+
+    return summary
+
+
+def _parse_stream_params(kind: str, codec: str, params: str) -> Dict:
+    """Parse the parameters of one 'Stream #0:n: Video|Audio:' line"""
+    bitrate = re.search(r"(\d+) kb/s", params)
+    info = {'codec': codec, 'bit_rate': int(bitrate.group(1)) * 1000 if bitrate else 0}
+
+    if kind == 'Video':
+        size = re.search(r"(\d{2,5})x(\d{2,5})", params)
+        fps = re.search(r"([\d.]+) fps", params)
+        pix_fmt = re.search(r"\), (\w+)(?:\(|,)", params) or re.search(r"^[^,]*, (\w+)", params)
+        info.update({
+            'width': int(size.group(1)) if size else 0,
+            'height': int(size.group(2)) if size else 0,
+            'fps': float(fps.group(1)) if fps else 0.0,
+            'pix_fmt': pix_fmt.group(1) if pix_fmt else None
+        })
+    else:
+        sample_rate = re.search(r"(\d+) Hz", params)
+        channels = re.search(r"Hz, ([\w.]+)", params)
+        layout = channels.group(1) if channels else ''
+        count = re.match(r"(\d+) channels", params[channels.start(1):]) if channels else None
+        info.update({
+            'sample_rate': int(sample_rate.group(1)) if sample_rate else 0,
+            'channels': int(count.group(1)) if count else _CHANNEL_LAYOUTS.get(layout, 0)
+        })
+
+    return info
+
+
+def run_ffmpeg(
+    command: List[str],
+    timeout: Optional[float] = None,
+    check: bool = True,
+    on_progress: Optional[Callable[[FFmpegProgress], None]] = None,
+    duration: Optional[float] = None,
+    label: Optional[str] = None
+) -> FFmpegResult:
+    """
+    Run an ffmpeg command, streaming progress and measuring resource usage
+
+    The command gets '-progress pipe:1 -nostats', so ffmpeg writes its
+    key/value progress blocks to stdout while stderr is drained on a
+    separate thread. Each block is passed to on_progress and logged every
+    few seconds. On exit, CPU time and peak RSS of the ffmpeg process are
+    read from wait4() and logged (and appended as JSON lines to
+    FFMPEG_STATS_LOG if set).
+
+    Args:
+        command: ffmpeg command (binary first, without progress options)
+        timeout: Kill ffmpeg after this many seconds
+        check: Raise CalledProcessError on a non-zero exit code
+        on_progress: Called with an FFmpegProgress for each progress block
+        duration: Expected output duration in seconds (enables percent)
+        label: Name used in logs and stats (default: output file name)
+
+    Returns:
+        FFmpegResult with return code, stderr and stats
+
+    Raises:
+        subprocess.TimeoutExpired: If timeout is exceeded
+        subprocess.CalledProcessError: If check is set and ffmpeg fails
+    """
+    label = label or os.path.basename(command[-1])
+    full_command = _with_progress_args(command)
+
+    started = time.monotonic()
+    process = subprocess.Popen(
+        full_command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors='replace'
+    )
+
+    stderr_lines: List[str] = []
+    stderr_thread = threading.Thread(
+        target=lambda: stderr_lines.extend(process.stderr),
+        daemon=True
+    )
+    stderr_thread.start()
+
+    timed_out = threading.Event()
+    reaped = threading.Event()
+    reap_lock = threading.Lock()
+
+    def kill():
+        # Never signal a reaped child: its PID may already be reused
+        with reap_lock:
+            if not reaped.is_set():
+                timed_out.set()
+                _kill(process)
+
+    timer = threading.Timer(timeout, kill) if timeout else None
+    if timer:
+        timer.daemon = True
+        timer.start()
+
+    snapshots: List[FFmpegProgress] = []
+    values: Dict[str, str] = {}
+    last_log = started
+
+    try:
+        for line in process.stdout:
+            key, sep, value = line.strip().partition('=')
+            if not sep:
+                continue
+            values[key] = value
+            if key != 'progress':
+                continue
+
+            progress = _build_progress(values, duration)
+            snapshots.append(progress)
+            values = {}
+
+            if on_progress:
+                try:
+                    on_progress(progress)
+                except Exception as e:
+                    logger.warning(f"ffmpeg progress callback failed: {e}")
+
+            now = time.monotonic()
+            if not progress.done and now - last_log >= PROGRESS_LOG_INTERVAL:
+                last_log = now
+                _log_progress(label, progress)
+    except BaseException:
+        # Don't wait on an ffmpeg that keeps running
+        with reap_lock:
+            _kill(process)
+        raise
+    finally:
+        if timer:
+            timer.cancel()
+        with reap_lock:
+            reaped.set()
+        returncode, rusage = _wait(process)
+        stderr_thread.join()
+        process.stdout.close()
+        process.stderr.close()
+
+    wall_seconds = time.monotonic() - started
+    stderr = ''.join(stderr_lines)
+    stats = _build_stats(label, returncode, wall_seconds, rusage, snapshots)
+    _log_stats(stats)
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(full_command, timeout, stderr=stderr)
+
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, full_command, stderr=stderr)
+
+    return FFmpegResult(
+        args=full_command,
+        returncode=returncode,
+        stderr=stderr,
+        stats=stats,
+        progress=snapshots
+    )
+
+
+def _kill(process: subprocess.Popen):
+    """Kill the process without letting Popen reap it (_wait reaps it for wait4)"""
+    if not hasattr(os, 'wait4'):
+        process.kill()
+        return
+
+    try:
+        os.kill(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _wait(process: subprocess.Popen):
+    """Reap the process, returning (returncode, rusage or None)"""
+    if not hasattr(os, 'wait4'):
+        return process.wait(), None
+
+    _, status, rusage = os.wait4(process.pid, 0)
+    returncode = os.waitstatus_to_exitcode(status)
+    # Tell Popen the child is already reaped
+    process.returncode = returncode
+    return returncode, rusage
+
+
+def _build_stats(
+    label: str,
+    returncode: int,
+    wall_seconds: float,
+    rusage,
+    snapshots: List[FFmpegProgress]
+) -> FFmpegStats:
+    """Combine resource usage and the last progress block"""
+    stats = FFmpegStats(label=label, returncode=returncode, wall_seconds=round(wall_seconds, 3))
+
+    if rusage is not None:
+        # ru_maxrss is KB on Linux, bytes on macOS
+        rss_divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        stats.cpu_user_seconds = round(rusage.ru_utime, 3)
+        stats.cpu_system_seconds = round(rusage.ru_stime, 3)
+        stats.max_rss_mb = round(rusage.ru_maxrss / rss_divisor, 1)
+
+    if snapshots:
+        last = snapshots[-1]
+        stats.frames = last.frame
+        stats.fps = last.fps
+        stats.speed = last.speed
+        stats.out_time_seconds = round(last.out_time_seconds, 3)
+        stats.bitrate_kbps = last.bitrate_kbps
+        stats.total_size = last.total_size
+
+    return stats
+
+
+def _log_progress(label: str, progress: FFmpegProgress):
+    """Log one progress snapshot"""
+    percent = f" ({progress.percent:.0f}%)" if progress.percent is not None else ""
+    logger.info(
+        f"ffmpeg {label}: {progress.out_time_seconds:.1f}s{percent} "
+        f"speed={progress.speed:.2f}x fps={progress.fps:.1f} bitrate={progress.bitrate_kbps:.0f}kbps",
+        extra={'ffmpeg_progress': asdict(progress), 'ffmpeg_label': label}
+    )
+
+
+def _log_stats(stats: FFmpegStats):
+    """Log job stats and append them to FFMPEG_STATS_LOG if configured"""
+    cpu = f"{stats.cpu_seconds:.1f}s" if stats.cpu_seconds is not None else "n/a"
+    rss = f"{stats.max_rss_mb:.0f}MB" if stats.max_rss_mb is not None else "n/a"
+    logger.info(
+        f"ffmpeg {stats.label}: exit {stats.returncode} in {stats.wall_seconds:.1f}s, "
+        f"cpu {cpu}, peak RSS {rss}, speed {stats.speed:.2f}x",
+        extra={'ffmpeg_stats': asdict(stats)}
+    )
+
+    stats_log = os.getenv('FFMPEG_STATS_LOG')
+    if not stats_log:
+        return
+
+    record = dict(asdict(stats), cpu_seconds=stats.cpu_seconds, finished_at=time.time())
+    try:
+        with open(stats_log, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+    except OSError as e:
+        logger.warning(f"Failed to write ffmpeg stats to {stats_log}: {e}")
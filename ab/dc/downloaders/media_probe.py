@@ -0,0 +1,464 @@
+"""
+Media Probe
+Cached ffprobe results shared by the downloader, cutter, converter and
+publisher validators
+"""
+
+import os
+import copy
+import atexit
+import json
+import time
+import logging
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the probe record layout changes to invalidate persisted entries
+PROBE_VERSION = 1
+
+# Entries kept in the persisted cache (oldest probes are dropped first)
+MAX_CACHE_ENTRIES = 10000
+
+
+class ProbeError(RuntimeError):
+    """Raised when ffprobe cannot read a file"""
+    pass
+
+
+def file_fingerprint(path: Path) -> List[int]:
+    """
+    Identity of a file used to validate cached probe records
+
+    Args:
+        path: Media file
+
+    Returns:
+        [size, mtime_ns, inode]
+
+    Raises:
+        OSError: If the file can't be read
+    """
+    stat = Path(path).stat()
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+def _parse_rate(value: Optional[str]) -> float:
+    """Parse an ffprobe frame rate such as '30000/1001'"""
+    try:
+        return float(Fraction(value)) if value else 0.0
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _to_int(value) -> int:
+    """Convert an ffprobe number (string or 'N/A') to int"""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _to_float(value) -> float:
+    """Convert an ffprobe number (string or 'N/A') to float"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def build_probe_record(data: Dict) -> Dict:
+    """
+    Normalize ffprobe JSON into the record returned by MediaProbe
+
+    Args:
+        data: ffprobe -show_format -show_streams JSON
+
+    Returns:
+        Dictionary with file_size, duration, format_name, bit_rate (bps),
+        stream_types, and 'video'/'audio' sub-dicts for the first stream
+        of each type (None if absent)
+    """
+    streams = data.get('streams', [])
+    format_info = data.get('format', {})
+
+    video_stream = next((s for s in streams if s.get('codec_type') == 'video'), None)
+    audio_stream = next((s for s in streams if s.get('codec_type') == 'audio'), None)
+
+    video = None
+    if video_stream:
+        video = {
+            'codec': video_stream.get('codec_name', 'unknown'),
+            'width': _to_int(video_stream.get('width')),
+            'height': _to_int(video_stream.get('height')),
+            'fps': _parse_rate(video_stream.get('r_frame_rate')),
+            'bit_rate': _to_int(video_stream.get('bit_rate')),
+            'duration': _to_float(video_stream.get('duration')),
+            'pix_fmt': video_stream.get('pix_fmt')
+        }
+
+    audio = None
+    if audio_stream:
+        audio = {
+            'codec': audio_stream.get('codec_name', 'unknown'),
+            'channels': _to_int(audio_stream.get('channels')),
+            'sample_rate': _to_int(audio_stream.get('sample_rate')),
+            'bit_rate': _to_int(audio_stream.get('bit_rate'))
+        }
+
+    return {
+        'file_size': _to_int(format_info.get('size')),
+        'duration': _to_float(format_info.get('duration')),
+        'format_name': format_info.get('format_name', ''),
+        'bit_rate': _to_int(format_info.get('bit_rate')),
+        'stream_types': [s.get('codec_type') for s in streams],
+        'video': video,
+        'audio': audio
+    }
+
+
+def record_from_encode(result, output_path: Path) -> Optional[Dict]:
+    """
+    Build a probe record from an ffmpeg run instead of probing its output
+
+    Duration comes from the final progress block, streams and codecs from
+    the 'Output #0' block and the muxer summary, and the size from the
+    finished file, so a just-encoded file needs no ffprobe.
+
+    Args:
+        result: FFmpegResult of a successful run (see ffmpeg_runner)
+        output_path: File the run wrote
+
+    Returns:
+        Probe record plus 'fingerprint' and 'source': 'encode', or None if
+        the run didn't report enough to describe the output
+    """
+    summary = result.output_summary
+    progress = result.progress[-1] if result.progress else None
+    if not summary.get('video') or progress is None or not progress.done:
+        return None
+
+    duration = progress.out_time_seconds
+    if duration <= 0:
+        return None
+
+    try:
+        fingerprint = file_fingerprint(output_path)
+    except OSError:
+        return None
+
+    file_size = fingerprint[0]
+    video = dict(summary['video'], duration=duration)
+    if not video['bit_rate'] and summary.get('video_kb'):
+        video['bit_rate'] = int(summary['video_kb'] * 1024 * 8 / duration)
+
+    return {
+        'file_size': file_size,
+        'duration': duration,
+        'format_name': summary['format_name'],
+        'bit_rate': int(file_size * 8 / duration),
+        'stream_types': ['video'] + (['audio'] if summary.get('audio') else []),
+        'video': video,
+        'audio': summary.get('audio'),
+        'fingerprint': fingerprint,
+        'source': 'encode'
+    }
+
+
+class MediaProbe:
+    """
+    ffprobe wrapper with a cache keyed by file identity
+
+    Each file is probed once for its format and all streams; the record is
+    a superset of what the callers need. Records are cached in memory and
+    in a JSON file, keyed by resolved path and validated against size,
+    mtime and inode, so a re-written file is probed again while an
+    unchanged one never is. Failed probes are not cached.
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        ffprobe_path: str = 'ffprobe',
+        timeout: int = 30
+    ):
+        """
+        Initialize probe
+
+        Args:
+            cache_path: JSON file to persist records (None for memory only)
+            ffprobe_path: Path to ffprobe binary
+            timeout: ffprobe timeout in seconds
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.ffprobe_path = ffprobe_path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load persisted records"""
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable probe cache {self.cache_path}: {e}")
+            return {}
+
+        if data.get('version') != PROBE_VERSION:
+            return {}
+        return data.get('entries', {})
+
+    def save(self):
+        """Persist records if any changed since the last save"""
+        if not self.cache_path:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+
+            entries = self._entries
+            if len(entries) > MAX_CACHE_ENTRIES:
+                newest = sorted(entries.items(), key=lambda item: item[1]['probed_at'])[-MAX_CACHE_ENTRIES:]
+                entries = self._entries = dict(newest)
+
+            payload = json.dumps({'version': PROBE_VERSION, 'entries': entries})
+            self._dirty = False
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f".{self.cache_path.name}.", suffix=".tmp", dir=self.cache_path.parent
+            )
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.cache_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to save probe cache {self.cache_path}: {e}")
+
+    def cached(self, path: Path) -> Optional[Dict]:
+        """
+        Get the cached record for an unchanged file without probing
+
+        Args:
+            path: Media file
+
+        Returns:
+            Probe record or None if not cached (or the file changed)
+        """
+        path = Path(path)
+        try:
+            identity = file_fingerprint(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(str(path.resolve()))
+
+        if entry and entry['identity'] == identity:
+            return copy.deepcopy(entry['record'])
+        return None
+
+    def store(self, path: Path, record: Dict, persist: bool = False):
+        """
+        Cache a record for a file without probing it
+
+        Used for files whose properties are already known (e.g. from the
+        encode that wrote them). The record is bound to the file's current
+        size, mtime and inode.
+
+        Args:
+            path: Media file
+            record: Probe record (see build_probe_record)
+            persist: Save the cache file now (otherwise call save() once
+                per batch; the shared probe also saves at exit)
+        """
+        path = Path(path)
+        try:
+            identity = file_fingerprint(path)
+        except OSError:
+            return
+
+        with self._lock:
+            self._entries[str(path.resolve())] = {
+                'identity': identity,
+                'record': copy.deepcopy(record),
+                'probed_at': time.time()
+            }
+            self._dirty = True
+
+        if persist:
+            self.save()
+
+    def probe(
+        self,
+        path: Path,
+        persist: bool = False,
+        ffprobe_path: Optional[str] = None
+    ) -> Dict:
+        """
+        Probe a media file, using the cache when the file is unchanged
+
+        Args:
+            path: Media file
+            persist: Save the cache file after a new probe (otherwise call
+                save() once per batch; the shared probe also saves at exit)
+            ffprobe_path: ffprobe binary for this call (default: self.ffprobe_path)
+
+        Returns:
+            Probe record (see build_probe_record)
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ProbeError: If ffprobe fails or its output can't be parsed
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Media file not found: {path}")
+
+        record = self.cached(path)
+        if record is not None:
+            return record
+
+        identity = file_fingerprint(path)
+        record = self._run_ffprobe(path, ffprobe_path or self.ffprobe_path)
+
+        with self._lock:
+            self._entries[str(path.resolve())] = {
+                'identity': identity,
+                'record': record,
+                'probed_at': time.time()
+            }
+            self._dirty = True
+
+        if persist:
+            self.save()
+        return copy.deepcopy(record)
+
+    def probe_many(
+        self,
+        paths: Iterable[Path],
+        max_workers: int = 4
+    ) -> Dict[Path, Optional[Dict]]:
+        """
+        Probe many files concurrently
+
+        Cached files are answered without spawning ffprobe; the cache file
+        is saved once at the end.
+
+        Args:
+            paths: Media files
+            max_workers: Concurrent ffprobe processes
+
+        Returns:
+            Mapping of path to probe record (None if the probe failed)
+        """
+        paths = [Path(p) for p in paths]
+        results: Dict[Path, Optional[Dict]] = {}
+        pending = []
+
+        for path in paths:
+            record = self.cached(path)
+            if record is not None:
+                results[path] = record
+            else:
+                pending.append(path)
+
+        def probe_one(path: Path) -> Optional[Dict]:
+            try:
+                return self.probe(path, persist=False)
+            except (FileNotFoundError, ProbeError) as e:
+                logger.warning(f"Probe failed for {path}: {e}")
+                return None
+
+        if pending:
+            logger.debug(f"Probing {len(pending)} files ({len(paths) - len(pending)} cached)")
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as executor:
+                for path, record in zip(pending, executor.map(probe_one, pending)):
+                    results[path] = record
+            self.save()
+
+        return {path: results[path] for path in paths}
+
+    def _run_ffprobe(self, path: Path, ffprobe_path: str) -> Dict:
+        """Run ffprobe for format and streams"""
+        command = [
+            ffprobe_path,
+            '-v', 'error',
+            '-print_format', 'json',
+            '-show_format',
+            '-show_streams',
+            str(path)
+        ]
+
+        try:
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout
+            )
+        except subprocess.TimeoutExpired:
+            raise ProbeError("ffprobe timed out")
+        except OSError as e:
+            raise ProbeError(f"Could not run ffprobe: {e}")
+
+        if result.returncode != 0:
+            raise ProbeError(f"ffprobe failed: {result.stderr.strip()}")
+
+        try:
+            return build_probe_record(json.loads(result.stdout))
+        except json.JSONDecodeError as e:
+            raise ProbeError(f"Failed to parse ffprobe output: {e}")
+
+
+_probe: Optional[MediaProbe] = None
+_probe_lock = threading.Lock()
+
+
+def get_media_probe() -> MediaProbe:
+    """
+    Get the process-wide media probe
+
+    The cache file comes from MEDIA_PROBE_CACHE_PATH (default:
+    media_probe_cache.json); an empty value keeps the cache in memory only.
+    The ffprobe binary comes from FFPROBE_PATH. New records are saved
+    when a batch calls save() and at interpreter exit.
+
+    Returns:
+        Shared MediaProbe instance
+    """
+    global _probe
+    cache_path = os.getenv('MEDIA_PROBE_CACHE_PATH', 'media_probe_cache.json')
+    cache_path = Path(cache_path) if cache_path else None
+
+    with _probe_lock:
+        if _probe is None or _probe.cache_path != cache_path:
+            if _probe is not None:
+                _probe.save()
+            else:
+                atexit.register(_save_media_probe)
+            _probe = MediaProbe(cache_path, ffprobe_path=os.getenv('FFPROBE_PATH', 'ffprobe'))
+        return _probe
+
+
+def _save_media_probe():
+    """Persist the shared probe's records at interpreter exit"""
+    if _probe is not None:
+        _probe.save()
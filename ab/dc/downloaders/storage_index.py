@@ -0,0 +1,676 @@
+"""
+Storage Index
+SQLite index of downloaded videos, clips and artefacts with disk-budget
+LRU eviction
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+BYTES_PER_MB = 1024 * 1024
+
+# Rows fetched per eviction round
+_EVICT_BATCH = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    pinned INTEGER NOT NULL DEFAULT 0,
+    owned INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS roots (
+    root TEXT PRIMARY KEY,
+    total_bytes INTEGER NOT NULL DEFAULT 0,
+    file_count INTEGER NOT NULL DEFAULT 0,
+    owned_bytes INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Per-root totals are maintained by triggers, so size queries are O(1).
+# Created after older databases are migrated (see StorageIndex._migrate).
+_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS files_insert AFTER INSERT ON files BEGIN
+    INSERT INTO roots (root) SELECT NEW.root
+    WHERE NOT EXISTS (SELECT 1 FROM roots WHERE root = NEW.root);
+    UPDATE roots SET total_bytes = total_bytes + NEW.size, file_count = file_count + 1,
+        owned_bytes = owned_bytes + NEW.size * NEW.owned
+    WHERE root = NEW.root;
+END;
+
+CREATE TRIGGER IF NOT EXISTS files_delete AFTER DELETE ON files BEGIN
+    UPDATE roots SET total_bytes = total_bytes - OLD.size, file_count = file_count - 1,
+        owned_bytes = owned_bytes - OLD.size * OLD.owned
+    WHERE root = OLD.root;
+END;
+
+CREATE TRIGGER IF NOT EXISTS files_update AFTER UPDATE OF size, root, owned ON files BEGIN
+    UPDATE roots SET total_bytes = total_bytes - OLD.size, file_count = file_count - 1,
+        owned_bytes = owned_bytes - OLD.size * OLD.owned
+    WHERE root = OLD.root;
+    INSERT INTO roots (root) SELECT NEW.root
+    WHERE NOT EXISTS (SELECT 1 FROM roots WHERE root = NEW.root);
+    UPDATE roots SET total_bytes = total_bytes + NEW.size, file_count = file_count + 1,
+        owned_bytes = owned_bytes + NEW.size * NEW.owned
+    WHERE root = NEW.root;
+END;
+
+CREATE INDEX IF NOT EXISTS files_evict ON files (root, owned, pinned, last_access);
+"""
+
+
+class StorageIndex:
+    """
+    Index of files under named storage roots (e.g. downloads, processed)
+
+    Every registered file is stored with its size, last access time and pin
+    state. Per-root byte totals are kept up to date by SQLite triggers, so
+    they are read without walking the directory tree.
+
+    Only files registered by the pipeline itself are owned and can be
+    evicted: eviction deletes the least recently used owned, unpinned files
+    of a root until they fit its budget. Files found on disk by reconcile()
+    are counted in the totals but never deleted.
+    """
+
+    def __init__(self, db_path: Path, roots: Dict[str, Path]):
+        """
+        Open (or create) the index
+
+        Args:
+            db_path: SQLite database file
+            roots: Storage root name -> directory (e.g. {'downloads': Path('downloads/')})
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.roots = {name: Path(path).resolve() for name, path in roots.items()}
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add columns introduced after a database was created, then (re)create triggers"""
+        with self._transaction() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+            if 'owned' not in columns:
+                # Existing rows may have come from reconcile, so they stay unowned
+                conn.execute("ALTER TABLE files ADD COLUMN owned INTEGER NOT NULL DEFAULT 0")
+
+            root_columns = {row[1] for row in conn.execute("PRAGMA table_info(roots)")}
+            if 'owned_bytes' not in root_columns:
+                # Older triggers do not maintain owned_bytes; replace them
+                conn.execute("ALTER TABLE roots ADD COLUMN owned_bytes INTEGER NOT NULL DEFAULT 0")
+                for trigger in ("files_insert", "files_delete", "files_update"):
+                    conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                conn.execute(
+                    "UPDATE roots SET owned_bytes = (SELECT COALESCE(SUM(size), 0) "
+                    "FROM files WHERE files.root = roots.root AND owned = 1)"
+                )
+            conn.execute("DROP INDEX IF EXISTS files_lru")
+
+        self._conn.executescript(_TRIGGERS)
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one write transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def root_for(self, path: Path) -> Optional[str]:
+        """
+        Find the storage root containing a path
+
+        Args:
+            path: File or directory path
+
+        Returns:
+            Root name or None if the path is outside every root
+        """
+        resolved = Path(path).resolve()
+        for name, root in self.roots.items():
+            if resolved == root or root in resolved.parents:
+                return name
+        return None
+
+    # Registration
+
+    def register(
+        self,
+        path: Path,
+        kind: str = "artefact",
+        pinned: Optional[bool] = None
+    ) -> bool:
+        """
+        Add or refresh a file in the index and mark it as just used
+
+        Registered files are owned by the pipeline and may be evicted.
+
+        Args:
+            path: File path
+            kind: File kind ('source', 'clip', 'artefact', ...)
+            pinned: Set pin state (None keeps the current state)
+
+        Returns:
+            True if the file was indexed, False if missing or outside the roots
+        """
+        path = Path(path).resolve()
+        root = self.root_for(path)
+        if root is None:
+            return False
+
+        try:
+            size = path.stat().st_size
+        except OSError:
+            self.forget(path)
+            return False
+
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO files (path, root, kind, size, last_access, pinned, owned)
+                VALUES (?, ?, ?, ?, ?, ?, 1)
+                ON CONFLICT (path) DO UPDATE SET
+                    root = excluded.root,
+                    kind = excluded.kind,
+                    size = excluded.size,
+                    last_access = excluded.last_access,
+                    owned = 1,
+                    pinned = CASE WHEN ? IS NULL THEN files.pinned ELSE excluded.pinned END
+                """,
+                (str(path), root, kind, size, time.time(), int(bool(pinned)), pinned)
+            )
+        return True
+
+    def register_tree(self, directory: Path, kind: str = "artefact") -> int:
+        """
+        Register every file under a directory
+
+        Args:
+            directory: Directory to walk
+            kind: File kind for all files
+
+        Returns:
+            Number of files indexed
+        """
+        count = 0
+        for file_path in _walk_files(Path(directory)):
+            if self._is_own_file(file_path):
+                continue
+            if self.register(file_path, kind):
+                count += 1
+        return count
+
+    def touch(self, path: Path):
+        """
+        Mark a file (or every file under a directory) as just used
+
+        Args:
+            path: File or directory path
+        """
+        self._update_prefix(Path(path), "last_access = ?", (time.time(),))
+
+    def pin(self, path: Path, pinned: bool = True):
+        """
+        Protect a file (or every file under a directory) from eviction
+
+        Args:
+            path: File or directory path
+            pinned: New pin state
+        """
+        self._update_prefix(Path(path), "pinned = ?", (int(pinned),))
+
+    @contextmanager
+    def pinned(self, path: Path) -> Iterator[None]:
+        """Keep a path pinned for the duration of a block"""
+        self.pin(path)
+        try:
+            yield
+        finally:
+            self.pin(path, False)
+
+    def forget(self, path: Path):
+        """
+        Remove a file (or every file under a directory) from the index
+
+        Args:
+            path: File or directory path
+        """
+        path = str(Path(path).resolve())
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM files WHERE path = ? OR (path >= ? AND path < ?)",
+                (path, path + os.sep, path + chr(ord(os.sep) + 1))
+            )
+
+    def _update_prefix(self, path: Path, assignment: str, params: tuple):
+        """Update one row or all rows under a directory prefix"""
+        path = str(path.resolve())
+        with self._transaction() as conn:
+            conn.execute(
+                f"UPDATE files SET {assignment} WHERE path = ? OR (path >= ? AND path < ?)",
+                params + (path, path + os.sep, path + chr(ord(os.sep) + 1))
+            )
+
+    # Size queries
+
+    def total_bytes(self, root: str) -> int:
+        """
+        Get the indexed size of a storage root
+
+        Args:
+            root: Root name
+
+        Returns:
+            Total bytes of indexed files under the root
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT total_bytes FROM roots WHERE root = ?", (root,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def owned_bytes(self, root: str) -> int:
+        """
+        Get the size of the files under a root that may be evicted
+
+        Args:
+            root: Root name
+
+        Returns:
+            Total bytes of owned files under the root
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT owned_bytes FROM roots WHERE root = ?", (root,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def directory_bytes(self, directory: Path) -> int:
+        """
+        Get the indexed size of a directory (range scan on the path key)
+
+        Args:
+            directory: Directory path
+
+        Returns:
+            Total bytes of indexed files under the directory
+        """
+        directory = str(Path(directory).resolve())
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM files WHERE path >= ? AND path < ?",
+                (directory + os.sep, directory + chr(ord(os.sep) + 1))
+            ).fetchone()
+        return row[0]
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Get per-root totals
+
+        Returns:
+            Root name -> {'total_mb', 'file_count'}
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT root, total_bytes, file_count FROM roots").fetchall()
+        return {
+            root: {'total_mb': round(total / BYTES_PER_MB, 2), 'file_count': count}
+            for root, total, count in rows
+        }
+
+    # Maintenance
+
+    def reconcile(self, root: str) -> Dict:
+        """
+        Bring a root's index in line with the disk
+
+        Files written outside the index are added, unowned (counted in the
+        totals but never evicted), changed sizes are updated and rows for
+        deleted files are dropped.
+
+        Args:
+            root: Root name
+
+        Returns:
+            Dictionary with added, updated and removed counts
+        """
+        root_dir = self.roots[root]
+        on_disk = {}
+        for file_path in _walk_files(root_dir):
+            if self._is_own_file(file_path):
+                continue
+            try:
+                on_disk[str(file_path)] = file_path.stat().st_size
+            except OSError:
+                continue
+
+        added = updated = removed = 0
+        with self._transaction() as conn:
+            indexed = dict(conn.execute("SELECT path, size FROM files WHERE root = ?", (root,)))
+
+            for path, size in indexed.items():
+                if path not in on_disk:
+                    conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                    removed += 1
+                elif on_disk[path] != size:
+                    conn.execute("UPDATE files SET size = ? WHERE path = ?", (on_disk[path], path))
+                    updated += 1
+
+            for path, size in on_disk.items():
+                if path not in indexed:
+                    try:
+                        mtime = os.path.getmtime(path)
+                    except OSError:
+                        continue
+                    conn.execute(
+                        "INSERT INTO files (path, root, kind, size, last_access, owned) VALUES (?, ?, ?, ?, ?, 0)",
+                        (path, root, "external", size, mtime)
+                    )
+                    added += 1
+
+        logger.info(f"Reconciled storage root '{root}': +{added} ~{updated} -{removed}")
+        return {'added': added, 'updated': updated, 'removed': removed}
+
+    def evict(self, root: str, budget_bytes: int) -> Dict:
+        """
+        Delete least recently used unpinned files until a root fits its budget
+
+        Only owned files are deleted and counted against the budget.
+
+        Args:
+            root: Root name
+            budget_bytes: Maximum bytes of owned files to keep under the root
+
+        Returns:
+            Dictionary with evicted file count and freed bytes
+        """
+        evicted = 0
+        freed = 0
+
+        while True:
+            over = self.owned_bytes(root) - budget_bytes
+            if over <= 0:
+                break
+
+            with self._lock:
+                candidates = self._conn.execute(
+                    "SELECT path, size FROM files WHERE root = ? AND owned = 1 AND pinned = 0 "
+                    "ORDER BY last_access LIMIT ?",
+                    (root, _EVICT_BATCH)
+                ).fetchall()
+
+            if not candidates:
+                logger.warning(
+                    f"Storage root '{root}' is over budget but every remaining file is pinned"
+                )
+                break
+
+            for path, size in candidates:
+                if over <= 0:
+                    break
+                if self._delete_file(Path(path)):
+                    evicted += 1
+                    freed += size
+                over -= size
+
+        if evicted:
+            logger.info(
+                f"Evicted {evicted} file(s) from '{root}', freed {freed / BYTES_PER_MB:.1f}MB"
+            )
+        return {'evicted': evicted, 'freed_bytes': freed}
+
+    def free_space(self, path: Path, needed_bytes: int) -> int:
+        """
+        Evict least recently used owned files from the root containing a path
+
+        Args:
+            path: Path on the storage root to free space on
+            needed_bytes: Bytes to free
+
+        Returns:
+            Bytes freed
+        """
+        root = self.root_for(path)
+        if root is None or needed_bytes <= 0:
+            return 0
+        budget = max(0, self.owned_bytes(root) - needed_bytes)
+        return self.evict(root, budget)['freed_bytes']
+
+    def _delete_file(self, path: Path) -> bool:
+        """Delete an evicted file and its row, then prune empty directories"""
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to evict {path}: {e}")
+            # Pin it so the evictor does not retry the same file forever
+            self.pin(path)
+            return False
+
+        self.forget(path)
+
+        root = self.roots.get(self.root_for(path) or "")
+        parent = path.parent
+        while root is not None and parent != root and root in parent.parents:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+        return True
+
+    def _is_own_file(self, path: Path) -> bool:
+        """Whether a path is the index database (or its WAL/SHM files)"""
+        return path.name.startswith(self.db_path.name) and path.parent == self.db_path.parent.resolve()
+
+
+def _walk_files(directory: Path) -> Iterator[Path]:
+    """Yield resolved paths of all files under a directory"""
+    if not directory.exists():
+        return
+    for dirpath, _, filenames in os.walk(directory.resolve()):
+        for filename in filenames:
+            yield Path(dirpath) / filename
+
+
+class StorageEvictor:
+    """
+    Background thread keeping storage roots under their byte budgets
+
+    Roots without a budget (0 = unlimited) are never evicted, not even to
+    free disk space.
+    """
+
+    def __init__(
+        self,
+        index: StorageIndex,
+        budgets_mb: Dict[str, float],
+        interval: float = 60.0
+    ):
+        """
+        Initialize evictor
+
+        Args:
+            index: Storage index
+            budgets_mb: Root name -> budget in MB (0 = unlimited)
+            interval: Seconds between eviction passes
+        """
+        self.index = index
+        self.budgets_mb = {root: mb for root, mb in budgets_mb.items() if mb > 0}
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> Dict[str, Dict]:
+        """
+        Evict every root down to its budget
+
+        Returns:
+            Root name -> evict() result
+        """
+        return {
+            root: self.index.evict(root, int(budget_mb * BYTES_PER_MB))
+            for root, budget_mb in self.budgets_mb.items()
+        }
+
+    def free_space(self, path: Path, needed_bytes: int) -> int:
+        """
+        Free disk space on a root that has a budget
+
+        Args:
+            path: Path on the storage root to free space on
+            needed_bytes: Bytes to free
+
+        Returns:
+            Bytes freed (0 if the root has no budget)
+        """
+        if self.index.root_for(path) not in self.budgets_mb:
+            return 0
+        return self.index.free_space(path, needed_bytes)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Storage eviction failed: {e}", exc_info=True)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the background thread"""
+        if not self.budgets_mb or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="storage-evictor", daemon=True)
+        self._thread.start()
+        logger.info(
+            "Started storage evictor: "
+            + ", ".join(f"{root}={mb:.0f}MB" for root, mb in self.budgets_mb.items())
+        )
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+_index: Optional[StorageIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_storage_index(config=None) -> Optional[StorageIndex]:
+    """
+    Get the process-wide storage index for the configured roots
+
+    On first use the downloads and processed-videos roots are reconciled
+    with the disk, so files written before the index existed are tracked.
+
+    Args:
+        config: Config instance (default: get_config())
+
+    Returns:
+        Shared StorageIndex, or None if STORAGE_INDEX_PATH is empty
+    """
+    global _index
+
+    if config is None:
+        from config_manager import get_config
+        config = get_config()
+
+    if not config.storage_index_path:
+        return None
+
+    with _index_lock:
+        if _index is None:
+            _index = StorageIndex(
+                Path(config.storage_index_path),
+                {
+                    'downloads': config.downloads_path,
+                    'processed': config.stored_processed_videos
+                }
+            )
+            for root in _index.roots:
+                _index.reconcile(root)
+        return _index
+
+
+_evictor: Optional[StorageEvictor] = None
+
+
+def get_storage_evictor(config=None) -> Optional[StorageEvictor]:
+    """
+    Get the process-wide storage evictor, starting its background thread
+
+    The thread only runs when DOWNLOADS_BUDGET_MB or PROCESSED_BUDGET_MB is
+    set; without budgets nothing is ever evicted.
+
+    Args:
+        config: Config instance (default: get_config())
+
+    Returns:
+        Shared StorageEvictor, or None if the storage index is disabled
+    """
+    global _evictor
+
+    if config is None:
+        from config_manager import get_config
+        config = get_config()
+
+    index = get_storage_index(config)
+    if index is None:
+        return None
+
+    with _index_lock:
+        if _evictor is None:
+            _evictor = StorageEvictor(index, get_storage_budgets(config))
+            _evictor.start()
+        return _evictor
+
+
+def get_storage_budgets(config=None) -> Dict[str, float]:
+    """
+    Get configured byte budgets for the storage roots
+
+    Args:
+        config: Config instance (default: get_config())
+
+    Returns:
+        Root name -> budget in MB (0 = unlimited)
+    """
+    if config is None:
+        from config_manager import get_config
+        config = get_config()
+
+    return {
+        'downloads': config.downloads_budget_mb,
+        'processed': config.processed_budget_mb
+    }
@@ -5,12 +5,18 @@ Handles file paths, directory creation, and storage operations
 
 import os
 import re
+import json
+import hashlib
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bytes hashed from the head and tail of a download for its record
+DOWNLOAD_HASH_SAMPLE_BYTES = 1024 * 1024
+
 
 def sanitize_video_id(video_id: str) -> str:
     """
@@ -148,6 +154,11 @@ def is_video_downloaded(video_id: str, downloads_path: Path) -> bool:
                 logger.warning(f"Video file exists but is empty: {video_path}")
                 return False
 
+            # Files downloaded with a record must still match it
+            if verify_download_record(video_path) is False:
+                logger.warning(f"Video file does not match its download record: {video_path}")
+                return False
+
             logger.info(f"Video already downloaded: {video_path} ({file_size / 1024 / 1024:.1f}MB)")
             return True
 
@@ -157,6 +168,100 @@ def is_video_downloaded(video_id: str, downloads_path: Path) -> bool:
         return False
 
 
+def get_download_record_path(video_path: Path) -> Path:
+    """
+    Get path of the sidecar record written for a completed download
+
+    Args:
+        video_path: Path to video file
+
+    Returns:
+        Path to record file (hidden, next to the video)
+    """
+    return video_path.with_name(f".{video_path.name}.download.json")
+
+
+def _sample_hash(file_path: Path, size: int) -> str:
+    """Hash file size plus its first and last DOWNLOAD_HASH_SAMPLE_BYTES"""
+    digest = hashlib.sha256()
+    digest.update(str(size).encode())
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(DOWNLOAD_HASH_SAMPLE_BYTES))
+        if size > DOWNLOAD_HASH_SAMPLE_BYTES * 2:
+            f.seek(-DOWNLOAD_HASH_SAMPLE_BYTES, os.SEEK_END)
+            digest.update(f.read(DOWNLOAD_HASH_SAMPLE_BYTES))
+    return digest.hexdigest()
+
+
+def write_download_record(video_path: Path, metadata: Optional[Dict] = None) -> Dict:
+    """
+    Record size and hash of a completed, verified download
+
+    Args:
+        video_path: Path to video file
+        metadata: Extra fields to store (e.g. container probe results)
+
+    Returns:
+        Record dictionary
+    """
+    stat = video_path.stat()
+    record = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256_sample': _sample_hash(video_path, stat.st_size),
+        **(metadata or {})
+    }
+
+    record_path = get_download_record_path(video_path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{record_path.name}.", suffix=".tmp", dir=video_path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(record, f, indent=2)
+        os.replace(tmp_path, record_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    return record
+
+
+def verify_download_record(video_path: Path) -> Optional[bool]:
+    """
+    Check a downloaded file against its record
+
+    The size must match. The sample hash is only recomputed when the mtime
+    changed, so the common case costs one stat.
+
+    Args:
+        video_path: Path to video file
+
+    Returns:
+        True if the file matches, False if it does not (or is missing),
+        None if no record exists (e.g. downloaded by an older version)
+    """
+    record_path = get_download_record_path(video_path)
+    try:
+        with open(record_path, 'r', encoding='utf-8') as f:
+            record = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable download record {record_path}: {e}")
+        return None
+
+    try:
+        stat = video_path.stat()
+    except OSError:
+        return False
+
+    if stat.st_size != record.get('size'):
+        return False
+    if stat.st_mtime_ns == record.get('mtime_ns'):
+        return True
+    return _sample_hash(video_path, stat.st_size) == record.get('sha256_sample')
+
+
 def calculate_file_size_mb(file_path: Path) -> float:
     """
     Calculate file size in megabytes
@@ -178,16 +283,21 @@ def calculate_file_size_mb(file_path: Path) -> float:
         return 0.0
 
 
-def calculate_directory_size(directory: Path) -> float:
+def calculate_directory_size(directory: Path, index=None) -> float:
     """
     Calculate total size of all files in directory
 
     Args:
         directory: Directory path
+        index: StorageIndex to read the size from instead of walking
+            the directory (optional, used if it covers the directory)
 
     Returns:
         Total size in MB (rounded to 2 decimals)
     """
+    if index is not None and index.root_for(directory):
+        return round(index.directory_bytes(directory) / (1024 * 1024), 2)
+
     total_size = 0
     try:
         for file_path in directory.rglob('*'):
@@ -260,15 +370,19 @@ def get_available_disk_space(path: Path) -> float:
 def check_disk_space(
     path: Path,
     required_mb: float,
-    buffer_mb: float = 1024
+    buffer_mb: float = 1024,
+    evictor=None
 ) -> tuple[bool, str]:
     """
-    Check if there's enough disk space
+    Check if there's enough disk space, evicting old files if needed
 
     Args:
         path: Path to check
         required_mb: Required space in MB
         buffer_mb: Extra buffer space to keep free (default: 1GB)
+        evictor: StorageEvictor used to evict least recently used files the
+            pipeline wrote when space is short; only roots with a budget
+            are evicted (optional)
 
     Returns:
         Tuple of (has_space, message)
@@ -277,6 +391,12 @@ def check_disk_space(
         available = get_available_disk_space(path)
         needed = required_mb + buffer_mb
 
+        if available < needed and evictor is not None:
+            freed = evictor.free_space(path, int((needed - available) * 1024 * 1024))
+            if freed:
+                logger.info(f"Freed {freed / 1024 / 1024:.1f}MB by evicting old files")
+                available = get_available_disk_space(path)
+
         if available >= needed:
             return True, f"Sufficient disk space: {available:.1f}MB available"
         else:
@@ -4,13 +4,36 @@ Cleans VTT/SRT subtitle files by extracting only text content
 and saving as Markdown for LLM metadata generation
 """
 
+import os
 import re
+import json
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Optional, Dict
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bump when cleaning output changes so process_directory re-cleans everything
+CLEANER_VERSION = 1
+
+# Per-directory record of cleaned inputs used by process_directory
+MANIFEST_FILENAME = ".subtitle_cleaner_manifest.json"
+
+# Compiled once; clean_vtt/clean_srt run them for every subtitle line
+_WEBVTT_HEADER_RE = re.compile(r'^WEBVTT.*?\n\n?', flags=re.MULTILINE)
+_VTT_WORD_TIMING_RE = re.compile(r'<\d{2}:\d{2}:\d{2}\.\d{3}><c>')
+_VTT_CLOSE_TAG_RE = re.compile(r'</c>')
+_TAG_RE = re.compile(r'<[^>]+>')
+_SRT_STYLE_RE = re.compile(r'\{[^}]+\}')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Longest repeated phrase (in words) removed by _remove_consecutive_duplicates
+MAX_DUPLICATE_PHRASE_WORDS = 20
+
 
 class SubtitleCleaner:
     """Cleans subtitle files for LLM processing"""
@@ -36,14 +59,18 @@ class SubtitleCleaner:
             content = f.read()
 
         # Remove WEBVTT header
-        content = re.sub(r'^WEBVTT.*?\n\n?', '', content, flags=re.MULTILINE)
+        content = _WEBVTT_HEADER_RE.sub('', content)
 
         # Split into lines
         lines = content.split('\n')
 
-        # Process line by line, tracking what we've already added
-        result_words = []
-        result_text = ""
+        # Words of the text extracted so far, and its length when joined with spaces
+        result_words: List[str] = []
+        result_length = 0
+
+        # Previous line, if the result already ends with it (auto-captions
+        # repeat the previous line in every cue, which is then a no-op)
+        previous_line = None
 
         for line in lines:
             line = line.strip()
@@ -62,61 +89,63 @@ class SubtitleCleaner:
 
             # Clean VTT tags like <00:00:14.719><c> text </c>
             # Remove all <timestamp><c> tags
-            cleaned = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}><c>', '', line)
-            cleaned = re.sub(r'</c>', '', cleaned)
+            cleaned = _VTT_WORD_TIMING_RE.sub('', line)
+            cleaned = _VTT_CLOSE_TAG_RE.sub('', cleaned)
 
             # Remove other VTT tags
-            cleaned = re.sub(r'<[^>]+>', '', cleaned)
+            cleaned = _TAG_RE.sub('', cleaned)
 
             # Clean up extra spaces
-            cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+            cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
 
             # Skip if empty after cleaning
-            if not cleaned:
+            if not cleaned or cleaned == previous_line:
                 continue
 
             # Check if this line adds new content
             # VTT lines often repeat previous content and add new words
             # We want to extract only the NEW words
+            previous_line = cleaned
 
-            # If current line contains all of result_text, extract the new part
-            if result_text and cleaned.startswith(result_text):
-                # Extract new words
-                new_part = cleaned[len(result_text):].strip()
-                if new_part:
-                    result_text = cleaned
-            elif not result_text:
+            if not result_words:
                 # First line
-                result_text = cleaned
+                result_words = cleaned.split()
+                result_length = len(cleaned)
+
+            elif result_length <= len(cleaned) and cleaned.startswith(' '.join(result_words)):
+                # Current line contains all of the result, keep the extended line
+                result_words = cleaned.split()
+                result_length = len(cleaned)
+
             else:
-                # Line doesn't start with previous text, might be new section
-                # Check if there's any overlap
-                words = cleaned.split()
-                overlap_found = False
-
-                # Try to find where the overlap starts
-                for i in range(len(result_words)):
-                    # Check if current line starts where result ends
-                    tail = ' '.join(result_words[i:])
+                # Line doesn't start with previous text, might be new section.
+                # Find the longest tail of the result that the line starts with;
+                # only tails no longer than the line can match.
+                start = len(result_words)
+                tail_length = -1
+                while start > 1 and tail_length + len(result_words[start - 1]) + 1 <= len(cleaned):
+                    start -= 1
+                    tail_length += len(result_words[start]) + 1
+
+                tail = ' '.join(result_words[start:])
+                for i in range(start, len(result_words)):
                     if cleaned.startswith(tail):
                         # Found overlap, add new part
                         new_part = cleaned[len(tail):].strip()
                         if new_part:
-                            result_text += ' ' + new_part
-                            result_words = result_text.split()
-                        overlap_found = True
+                            result_words.extend(new_part.split())
+                            result_length += len(new_part) + 1
+                            if cleaned[len(tail)] != ' ':
+                                # Overlap ended mid-word, so the result no longer ends with the line
+                                previous_line = None
                         break
-
-                if not overlap_found:
+                    tail = tail[len(result_words[i]) + 1:]
+                else:
                     # No overlap, this is completely new text
-                    result_text += ' ' + cleaned
-
-            result_words = result_text.split()
+                    result_words.extend(cleaned.split())
+                    result_length += len(cleaned) + 1
 
-        # Final cleanup
-        text = re.sub(r'\s+', ' ', result_text).strip()
-
-        return text
+        return ' '.join(result_words)
 
     def clean_srt(self, srt_path: Path) -> str:
         """
@@ -157,19 +186,20 @@ class SubtitleCleaner:
                     continue
 
                 # Remove SRT tags
-                cleaned = re.sub(r'<[^>]+>', '', line)
-                cleaned = re.sub(r'\{[^}]+\}', '', cleaned)
+                cleaned = _TAG_RE.sub('', line)
+                cleaned = _SRT_STYLE_RE.sub('', cleaned)
 
                 # Clean up spaces
-                cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+                cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
 
-                if cleaned:
+                # Skip lines repeated from the previous cue (rolling captions)
+                if cleaned and (not text_lines or cleaned != text_lines[-1]):
                     text_lines.append(cleaned)
 
         # Join and clean
         text = ' '.join(text_lines)
         text = self._remove_consecutive_duplicates(text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE_RE.sub(' ', text).strip()
 
         return text
 
@@ -177,6 +207,10 @@ class SubtitleCleaner:
         """
         Remove consecutive duplicate words and phrases
 
+        At each word the longest phrase (2 to 20 words) that is immediately
+        repeated is kept once. Only lengths at which the phrase's first word
+        recurs are compared, so the scan is linear in the number of words.
+
         Args:
             text: Input text
 
@@ -198,31 +232,54 @@ class SubtitleCleaner:
 
         # Second pass: remove phrase duplicates
         words = deduplicated
+        count = len(words)
+
+        # A phrase of length L repeated at i needs words[i] to recur at i + L.
+        # Index the next occurrence of each word within the phrase window;
+        # most positions have none and are copied through without checks.
+        next_same: Dict[int, int] = {}
+        last_seen: Dict[str, int] = {}
+        for index, word in enumerate(words):
+            previous = last_seen.get(word)
+            if previous is not None and index - previous <= MAX_DUPLICATE_PHRASE_WORDS:
+                next_same[previous] = index
+            last_seen[word] = index
+
         result = []
         i = 0
 
-        while i < len(words):
-            # Check for repeating sequences of different lengths
-            max_check = min(20, len(words) - i)
-            found_duplicate = False
+        for start in sorted(next_same):
+            if start < i:
+                continue
 
-            for seq_len in range(max_check, 1, -1):  # Start from 2 words minimum
-                if i + seq_len * 2 <= len(words):
-                    # Get two sequences
-                    seq1 = words[i:i + seq_len]
-                    seq2 = words[i + seq_len:i + seq_len * 2]
-
-                    if seq1 == seq2:
-                        # Add the sequence once and skip the duplicate
-                        result.extend(seq1)
-                        i += seq_len * 2
-                        found_duplicate = True
-                        break
+            # Words before the next candidate position cannot start a repeat
+            result.extend(words[i:start])
+            i = start
+
+            # Candidate lengths are the recurrences of words[i], 2 words minimum
+            max_end = i + min(MAX_DUPLICATE_PHRASE_WORDS, (count - i) // 2)
+            candidates = []
+            j = next_same[i]
+            while j <= max_end:
+                candidates.append(j - i)
+                j = next_same.get(j, count)
+
+            # Check for repeating sequences, longest first
+            found_duplicate = False
+            for seq_len in reversed(candidates):
+                if words[i:i + seq_len] == words[i + seq_len:i + seq_len * 2]:
+                    # Add the sequence once and skip the duplicate
+                    result.extend(words[i:i + seq_len])
+                    i += seq_len * 2
+                    found_duplicate = True
+                    break
 
             if not found_duplicate:
                 result.append(words[i])
                 i += 1
 
+        result.extend(words[i:])
+
         return ' '.join(result)
 
     def create_llm_markdown(
@@ -363,7 +420,7 @@ class SubtitleCleaner:
     def _split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences"""
         # Simple sentence splitting
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        sentences = _SENTENCE_END_RE.split(text)
         return [s.strip() for s in sentences if s.strip()]
 
     def process_subtitle_file(
@@ -428,8 +485,7 @@ class SubtitleCleaner:
             content = f"# Video Transcript\n\n{text}\n"
 
         # Save to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        _write_text_atomic(output_path, content)
 
         logger.info(f"Created Markdown file: {output_path}")
         return output_path
@@ -439,16 +495,23 @@ class SubtitleCleaner:
         directory: Path,
         pattern: str = "*.vtt",
         include_llm_instructions: bool = True,
-        overwrite: bool = False
+        overwrite: bool = False,
+        workers: int = 1
     ) -> List[Path]:
         """
         Process all subtitle files in directory
 
+        Processed inputs are recorded in a manifest (size, mtime, content hash
+        and cleaner version) in the directory, so later runs only clean new or
+        changed files. Files without a manifest entry whose .md already exists
+        are treated as done and recorded.
+
         Args:
             directory: Directory containing subtitle files
             pattern: File pattern to match (e.g., "*.vtt", "*.srt")
             include_llm_instructions: Include LLM instructions
-            overwrite: Overwrite existing .md files
+            overwrite: Re-process all files, ignoring the manifest
+            workers: Number of worker processes (1 = process in this process)
 
         Returns:
             List of created Markdown files
@@ -456,34 +519,165 @@ class SubtitleCleaner:
         if not directory.exists():
             raise FileNotFoundError(f"Directory not found: {directory}")
 
-        subtitle_files = list(directory.glob(pattern))
+        subtitle_files = sorted(directory.glob(pattern))
         logger.info(f"Found {len(subtitle_files)} subtitle files matching '{pattern}'")
 
-        created_files = []
+        manifest_path = directory / MANIFEST_FILENAME
+        manifest = _load_manifest(manifest_path)
+        entries = manifest['files']
+
+        pending = []
 
         for subtitle_file in subtitle_files:
+            key = str(subtitle_file.relative_to(directory))
             output_path = subtitle_file.with_suffix('.md')
+            stat = subtitle_file.stat()
+            entry = entries.get(key)
+
+            if not overwrite:
+                if entry is None and output_path.exists():
+                    # Cleaned before the manifest existed
+                    logger.info(f"Skipping (already exists): {output_path}")
+                    entries[key] = _manifest_entry(subtitle_file, stat, include_llm_instructions)
+                    continue
 
-            # Skip if file exists and not overwriting
-            if output_path.exists() and not overwrite:
-                logger.info(f"Skipping (already exists): {output_path}")
-                continue
+                if entry and _is_unchanged(entry, subtitle_file, stat, include_llm_instructions):
+                    if output_path.exists():
+                        logger.debug(f"Skipping (unchanged): {subtitle_file.name}")
+                        continue
 
-            try:
-                md_path = self.process_subtitle_file(
-                    subtitle_path=subtitle_file,
-                    include_llm_instructions=include_llm_instructions
-                )
-                created_files.append(md_path)
-                logger.info(f"Processed: {subtitle_file.name} -> {md_path.name}")
+            pending.append((key, subtitle_file, stat))
+
+        logger.info(f"{len(pending)} file(s) new or changed, {len(subtitle_files) - len(pending)} skipped")
+
+        created_files = []
 
-            except Exception as e:
-                logger.error(f"Failed to process {subtitle_file}: {e}")
+        def record(key: str, subtitle_file: Path, stat: os.stat_result, md_path: Path):
+            entries[key] = _manifest_entry(subtitle_file, stat, include_llm_instructions)
+            created_files.append(md_path)
+            logger.info(f"Processed: {subtitle_file.name} -> {md_path.name}")
+
+        try:
+            if workers > 1 and len(pending) > 1:
+                with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+                    futures = {
+                        executor.submit(_clean_file_worker, str(subtitle_file), include_llm_instructions):
+                            (key, subtitle_file, stat)
+                        for key, subtitle_file, stat in pending
+                    }
+
+                    for future in as_completed(futures):
+                        key, subtitle_file, stat = futures[future]
+                        try:
+                            record(key, subtitle_file, stat, Path(future.result()))
+                        except Exception as e:
+                            logger.error(f"Failed to process {subtitle_file}: {e}")
+            else:
+                for key, subtitle_file, stat in pending:
+                    try:
+                        md_path = self.process_subtitle_file(
+                            subtitle_path=subtitle_file,
+                            include_llm_instructions=include_llm_instructions
+                        )
+                        record(key, subtitle_file, stat, md_path)
+
+                    except Exception as e:
+                        logger.error(f"Failed to process {subtitle_file}: {e}")
+
+        finally:
+            # Drop entries for files that no longer exist
+            present = {str(f.relative_to(directory)) for f in subtitle_files}
+            for key in [k for k in entries if k not in present and not (directory / k).exists()]:
+                del entries[key]
+
+            try:
+                _write_text_atomic(manifest_path, json.dumps(manifest, indent=2))
+            except OSError as e:
+                logger.warning(f"Failed to save cleaner manifest {manifest_path}: {e}")
 
-        logger.info(f"Successfully processed {len(created_files)}/{len(subtitle_files)} files")
+        logger.info(f"Successfully processed {len(created_files)}/{len(pending)} files")
         return created_files
 
 
+def _clean_file_worker(subtitle_path: str, include_llm_instructions: bool) -> str:
+    """Clean one subtitle file in a worker process"""
+    md_path = SubtitleCleaner().process_subtitle_file(
+        subtitle_path=Path(subtitle_path),
+        include_llm_instructions=include_llm_instructions
+    )
+    return str(md_path)
+
+
+def _write_text_atomic(path: Path, content: str):
+    """Write text to a file atomically (temp file + rename)"""
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _file_sha256(path: Path) -> str:
+    """Hash full file content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_manifest(manifest_path: Path) -> Dict:
+    """Load the cleaner manifest, starting fresh if missing or unreadable"""
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if isinstance(manifest.get('files'), dict):
+                return manifest
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cleaner manifest {manifest_path}: {e}")
+
+    return {'files': {}}
+
+
+def _manifest_entry(subtitle_file: Path, stat: os.stat_result, include_llm_instructions: bool) -> Dict:
+    """Build the manifest entry for a cleaned subtitle file"""
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': _file_sha256(subtitle_file),
+        'cleaner_version': CLEANER_VERSION,
+        'include_llm_instructions': include_llm_instructions
+    }
+
+
+def _is_unchanged(
+    entry: Dict,
+    subtitle_file: Path,
+    stat: os.stat_result,
+    include_llm_instructions: bool
+) -> bool:
+    """Check whether a subtitle file still matches its manifest entry"""
+    if (entry.get('cleaner_version') != CLEANER_VERSION
+            or entry.get('include_llm_instructions') != include_llm_instructions):
+        return False
+
+    # Fast path: unchanged size and mtime, no need to hash
+    if entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+        return True
+
+    if entry.get('size') != stat.st_size or entry.get('sha256') != _file_sha256(subtitle_file):
+        return False
+
+    # Touched but identical content
+    entry['mtime_ns'] = stat.st_mtime_ns
+    return True
+
+
 def clean_subtitle_to_markdown(
     subtitle_path: Path,
     output_path: Optional[Path] = None,
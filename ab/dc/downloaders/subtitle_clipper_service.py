@@ -6,8 +6,7 @@ Generates subtitle files for each clip/moment based on popular moments extractio
 import sys
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional
-from datetime import timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
 
 # Add parent directories to path
 current_dir = Path(__file__).parent
@@ -21,6 +20,7 @@ from subtitle_downloader import (
     SubtitleDownloadError
 )
 from storage_manager import sanitize_video_id, create_video_directory
+from subtitle_track import SubtitleTrack, format_timestamp
 
 logger = logging.getLogger(__name__)
 
@@ -83,13 +83,16 @@ def get_clip_subtitle_path(
 
 
 def filter_subtitle_segments(
-    segments: List[Dict],
+    segments: Sequence[Dict],
     start_time: float,
     end_time: float
 ) -> List[Dict]:
     """
     Filter subtitle segments to only include those within time range
 
+    When given a SubtitleTrack (as returned by parse_vtt_subtitle), only the
+    cues found by its range index are visited instead of every segment.
+
     Args:
         segments: List of subtitle segments from parse_vtt_subtitle()
         start_time: Start time in seconds
@@ -98,6 +101,9 @@ def filter_subtitle_segments(
     Returns:
         List of segments within the time range, with adjusted timestamps
     """
+    if isinstance(segments, SubtitleTrack):
+        segments = [segments.segment(i) for i in segments.query(start_time, end_time)]
+
     filtered = []
 
     for segment in segments:
@@ -125,6 +131,30 @@ def filter_subtitle_segments(
     return filtered
 
 
+def filter_subtitle_segments_many(
+    track: SubtitleTrack,
+    ranges: Sequence[Tuple[float, float]]
+) -> List[List[Dict]]:
+    """
+    Filter subtitle segments for many time ranges in one pass
+
+    Args:
+        track: Parsed subtitle track from parse_vtt_subtitle()
+        ranges: (start_time, end_time) pairs in seconds
+
+    Returns:
+        Filtered segments for each range (see filter_subtitle_segments), in input order
+    """
+    return [
+        filter_subtitle_segments(
+            [track.segment(i) for i in indices],
+            start_time,
+            end_time
+        )
+        for (start_time, end_time), indices in zip(ranges, track.query_many(ranges))
+    ]
+
+
 def _seconds_to_vtt_timestamp(seconds: float) -> str:
     """
     Convert seconds to VTT timestamp format (HH:MM:SS.mmm)
@@ -135,14 +165,7 @@ def _seconds_to_vtt_timestamp(seconds: float) -> str:
     Returns:
         VTT formatted timestamp
     """
-    td = timedelta(seconds=seconds)
-    total_seconds = int(td.total_seconds())
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    secs = total_seconds % 60
-    milliseconds = int((seconds - int(seconds)) * 1000)
-
-    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{milliseconds:03d}"
+    return format_timestamp(seconds)
 
 
 def generate_vtt_content(segments: List[Dict]) -> str:
@@ -200,7 +223,8 @@ def create_clip_subtitle(
     output_dir: Path,
     language: str = 'en',
     aspect_ratio: str = 'original',
-    format: str = 'vtt'
+    format: str = 'vtt',
+    clip_segments: Optional[List[Dict]] = None
 ) -> Path:
     """
     Create subtitle file for a single clip
@@ -216,6 +240,8 @@ def create_clip_subtitle(
         language: Language code (e.g., 'en', 'pt')
         aspect_ratio: Aspect ratio of the clip
         format: Subtitle format ('vtt' or 'srt')
+        clip_segments: Segments already filtered for this clip (optional);
+            skips parsing full_subtitle_path
 
     Returns:
         Path to created clip subtitle file
@@ -224,11 +250,12 @@ def create_clip_subtitle(
         SubtitleClipperError: If subtitle creation fails
     """
     try:
-        # Parse full subtitle
-        segments = parse_vtt_subtitle(full_subtitle_path)
+        if clip_segments is None:
+            # Parse full subtitle
+            segments = parse_vtt_subtitle(full_subtitle_path)
 
-        # Filter segments for this clip
-        clip_segments = filter_subtitle_segments(segments, start_time, end_time)
+            # Filter segments for this clip
+            clip_segments = filter_subtitle_segments(segments, start_time, end_time)
 
         if not clip_segments:
             logger.warning(
@@ -390,6 +417,13 @@ def process_moments_subtitles(
                 else:
                     logger.info(f"Using existing {language} subtitle: {subtitle_path}")
 
+                # Parse once and slice every moment from the same track
+                track = parse_vtt_subtitle(subtitle_path)
+                moment_segments = filter_subtitle_segments_many(
+                    track,
+                    [(moment['start_time'], moment['end_time']) for moment in moments]
+                )
+
                 # Create clip subtitles for each moment
                 for i, moment in enumerate(moments):
                     try:
@@ -403,18 +437,16 @@ def process_moments_subtitles(
                             output_dir=clips_output_path,
                             language=language,
                             aspect_ratio=aspect_ratio,
-                            format=format
+                            format=format,
+                            clip_segments=moment_segments[i]
                         )
 
-                        # Parse to get segment count
-                        segments = parse_vtt_subtitle(clip_subtitle_path) if format == 'vtt' else []
-
                         all_clip_subtitles.append({
                             "clip_id": i,
                             "language": language,
                             "path": str(clip_subtitle_path),
                             "filename": clip_subtitle_path.name,
-                            "segments_count": len(segments),
+                            "segments_count": len(moment_segments[i]),
                             "start_time": moment['start_time'],
                             "end_time": moment['end_time'],
                             "duration": moment['duration']
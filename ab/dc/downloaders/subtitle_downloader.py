@@ -11,6 +11,7 @@ from typing import Optional, Dict, List
 from datetime import datetime
 
 from storage_manager import sanitize_video_id
+from subtitle_track import SubtitleTrack
 
 logger = logging.getLogger(__name__)
 
@@ -299,15 +300,19 @@ def download_all_subtitles(
     return downloaded
 
 
-def parse_vtt_subtitle(subtitle_path: Path) -> List[Dict]:
+def parse_vtt_subtitle(subtitle_path: Path, cache_dir: Optional[Path] = None) -> SubtitleTrack:
     """
-    Parse VTT subtitle file into structured data
+    Parse VTT (or SRT) subtitle file into structured data
+
+    The file is streamed into a compact SubtitleTrack; segment dicts are
+    built lazily when indexed or iterated.
 
     Args:
         subtitle_path: Path to VTT subtitle file
+        cache_dir: Directory for cached parsed tracks (optional)
 
     Returns:
-        List of subtitle segments:
+        Sequence of subtitle segments:
         [
             {
                 'index': 0,
@@ -327,62 +332,9 @@ def parse_vtt_subtitle(subtitle_path: Path) -> List[Dict]:
         raise SubtitleDownloadError(f"Subtitle file not found: {subtitle_path}")
 
     try:
-        with open(subtitle_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        segments = []
-        lines = content.split('\n')
-
-        i = 0
-        segment_index = 0
-
-        while i < len(lines):
-            line = lines[i].strip()
-
-            # Skip WEBVTT header and empty lines
-            if not line or line.startswith('WEBVTT') or line.startswith('Kind:') or line.startswith('Language:'):
-                i += 1
-                continue
-
-            # Look for timestamp line (format: 00:00:00.000 --> 00:00:03.000)
-            if '-->' in line:
-                try:
-                    # Parse timestamps
-                    parts = line.split('-->')
-                    start_time = parts[0].strip()
-                    end_time = parts[1].strip().split()[0]  # Remove any additional metadata
-
-                    # Collect text lines until next timestamp or empty line
-                    text_lines = []
-                    i += 1
-                    while i < len(lines) and lines[i].strip() and '-->' not in lines[i]:
-                        text_lines.append(lines[i].strip())
-                        i += 1
-
-                    text = ' '.join(text_lines)
-
-                    # Convert timestamps to seconds
-                    start_seconds = _timestamp_to_seconds(start_time)
-                    end_seconds = _timestamp_to_seconds(end_time)
-
-                    segments.append({
-                        'index': segment_index,
-                        'start': start_time,
-                        'end': end_time,
-                        'start_seconds': start_seconds,
-                        'end_seconds': end_seconds,
-                        'text': text
-                    })
-
-                    segment_index += 1
-                except Exception as e:
-                    logger.warning(f"Failed to parse subtitle segment: {e}")
-                    i += 1
-            else:
-                i += 1
-
-        logger.info(f"Parsed {len(segments)} subtitle segments from {subtitle_path}")
-        return segments
+        track = SubtitleTrack.from_file(subtitle_path, cache_dir=cache_dir)
+        logger.info(f"Parsed {len(track)} subtitle segments from {subtitle_path}")
+        return track
 
     except Exception as e:
         raise SubtitleDownloadError(f"Error parsing VTT file: {e}")
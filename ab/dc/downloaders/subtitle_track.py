@@ -0,0 +1,382 @@
+"""
+Subtitle Track
+Compact, streaming parser and in-memory store for VTT/SRT subtitle cues
+"""
+
+import os
+import re
+import pickle
+import hashlib
+import logging
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Bump when the parsed representation changes to invalidate cached tracks
+CACHE_VERSION = 1
+
+# Cue timing line: "00:00:01.000 --> 00:00:03.000 align:start position:0%"
+# (VTT uses '.', SRT uses ',' before milliseconds; hours are optional)
+_TIMESTAMP = r'(?:(\d+):)?(\d{1,2}):(\d{1,2}(?:[.,]\d+)?)'
+_CUE_TIMING_RE = re.compile(rf'^{_TIMESTAMP}\s*-->\s*{_TIMESTAMP}(?:\s|$)')
+
+
+class SubtitleTrack(Sequence):
+    """
+    Subtitle cues stored in flat arrays
+
+    Start and end times are kept in float64 arrays and all cue text in a
+    single string with an offsets array, instead of one dict per cue. The
+    track is also a read-only sequence of segment dicts (the format returned
+    by parse_vtt_subtitle), built lazily on access for existing callers.
+
+    Time range queries use a sorted index built on first use: cue starts in
+    ascending order plus the running maximum of their end times. Both are
+    monotonic, so the candidate cues for a range are bounded by two binary
+    searches instead of a scan of the whole track.
+    """
+
+    def __init__(
+        self,
+        starts: array,
+        ends: array,
+        text: str,
+        offsets: array,
+        source: Optional[Path] = None
+    ):
+        """
+        Initialize track from parsed arrays
+
+        Args:
+            starts: Cue start times in seconds (array('d'))
+            ends: Cue end times in seconds (array('d'))
+            text: All cue texts concatenated
+            offsets: Start offset of each cue text in `text`, plus the end (array('q'))
+            source: Subtitle file the track was parsed from (optional)
+        """
+        self.starts = starts
+        self.ends = ends
+        self.text = text
+        self.offsets = offsets
+        self.source = source
+
+        # Range query index, built lazily (see _ensure_index)
+        self._order: Optional[array] = None
+        self._sorted_starts: Optional[array] = None
+        self._max_ends: Optional[array] = None
+
+    # Parsing
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], source: Optional[Path] = None) -> 'SubtitleTrack':
+        """
+        Parse VTT or SRT cues from an iterable of lines
+
+        Headers, cue identifiers, SRT counters and NOTE blocks are skipped.
+        Cue text lines are stripped and joined with a space.
+
+        Args:
+            lines: Subtitle file lines
+            source: Subtitle file path (optional, for logging)
+
+        Returns:
+            Parsed SubtitleTrack
+        """
+        starts = array('d')
+        ends = array('d')
+        offsets = array('q', [0])
+        texts: List[str] = []
+        text_length = 0
+
+        cue_lines: Optional[List[str]] = None
+
+        for raw_line in lines:
+            line = raw_line.strip()
+
+            if cue_lines is not None:
+                # Cue text runs until a blank line or the next timing line
+                if line and '-->' not in line:
+                    cue_lines.append(line)
+                    continue
+
+                cue_text = ' '.join(cue_lines)
+                texts.append(cue_text)
+                text_length += len(cue_text)
+                offsets.append(text_length)
+                cue_lines = None
+
+            if '-->' not in line:
+                continue
+
+            match = _CUE_TIMING_RE.match(line)
+            if not match:
+                logger.warning(f"Failed to parse subtitle timing: {line}")
+                continue
+
+            starts.append(_match_to_seconds(match.group(1, 2, 3)))
+            ends.append(_match_to_seconds(match.group(4, 5, 6)))
+            cue_lines = []
+
+        if cue_lines is not None:
+            cue_text = ' '.join(cue_lines)
+            texts.append(cue_text)
+            text_length += len(cue_text)
+            offsets.append(text_length)
+
+        return cls(starts, ends, ''.join(texts), offsets, source=source)
+
+    @classmethod
+    def from_file(
+        cls,
+        subtitle_path: Path,
+        cache_dir: Optional[Path] = None
+    ) -> 'SubtitleTrack':
+        """
+        Parse a VTT or SRT file, streaming it line by line
+
+        Args:
+            subtitle_path: Path to subtitle file
+            cache_dir: Directory for cached parsed tracks (optional). A cached
+                track is reused while the file size and mtime are unchanged.
+
+        Returns:
+            Parsed SubtitleTrack
+        """
+        subtitle_path = Path(subtitle_path)
+        stat = subtitle_path.stat()
+
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = _cache_path(Path(cache_dir), subtitle_path)
+            track = _load_cached(cache_path, subtitle_path, stat)
+            if track is not None:
+                logger.debug(f"Loaded cached subtitle track for {subtitle_path}")
+                return track
+
+        with open(subtitle_path, 'r', encoding='utf-8') as f:
+            track = cls.from_lines(f, source=subtitle_path)
+
+        if cache_path is not None:
+            try:
+                _save_cached(cache_path, track, stat)
+            except OSError as e:
+                logger.warning(f"Failed to cache subtitle track {cache_path}: {e}")
+
+        return track
+
+    # Cue access
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict, List[Dict]]:
+        if isinstance(index, slice):
+            return [self.segment(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("subtitle cue index out of range")
+
+        return self.segment(index)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self.segment(i)
+
+    def cue_text(self, index: int) -> str:
+        """Get the text of one cue"""
+        return self.text[self.offsets[index]:self.offsets[index + 1]]
+
+    def segment(self, index: int) -> Dict:
+        """
+        Build the segment dict for one cue
+
+        Args:
+            index: Cue index
+
+        Returns:
+            Segment dict with index, start, end, start_seconds, end_seconds, text
+        """
+        start = self.starts[index]
+        end = self.ends[index]
+        return {
+            'index': index,
+            'start': format_timestamp(start),
+            'end': format_timestamp(end),
+            'start_seconds': start,
+            'end_seconds': end,
+            'text': self.cue_text(index)
+        }
+
+    @property
+    def duration(self) -> float:
+        """End time of the last cue in seconds"""
+        return self.ends[-1] if len(self) else 0.0
+
+    # Range queries
+
+    def query(self, start_time: float, end_time: float) -> List[int]:
+        """
+        Find cues overlapping a time range
+
+        Args:
+            start_time: Range start in seconds
+            end_time: Range end in seconds
+
+        Returns:
+            Indices of cues with start < end_time and end > start_time,
+            ordered by cue start
+        """
+        self._ensure_index()
+        lo = bisect_right(self._max_ends, start_time)
+        hi = bisect_left(self._sorted_starts, end_time)
+        return self._collect(lo, hi, start_time)
+
+    def query_many(self, ranges: Sequence[Tuple[float, float]]) -> List[List[int]]:
+        """
+        Find cues overlapping each of many time ranges
+
+        Ranges are swept in start order so the lower bound only moves forward
+        across the whole batch.
+
+        Args:
+            ranges: (start_time, end_time) pairs in seconds
+
+        Returns:
+            Cue indices for each range (see query), in input order
+        """
+        self._ensure_index()
+        results: List[List[int]] = [[] for _ in ranges]
+        count = len(self)
+        lo = 0
+
+        for range_index in sorted(range(len(ranges)), key=lambda r: ranges[r][0]):
+            start_time, end_time = ranges[range_index]
+            while lo < count and self._max_ends[lo] <= start_time:
+                lo += 1
+            hi = bisect_left(self._sorted_starts, end_time, lo)
+            results[range_index] = self._collect(lo, hi, start_time)
+
+        return results
+
+    def _collect(self, lo: int, hi: int, start_time: float) -> List[int]:
+        """Map sorted positions [lo, hi) to cue indices ending after start_time"""
+        indices = []
+        for position in range(lo, hi):
+            index = self._order[position] if self._order is not None else position
+            if self.ends[index] > start_time:
+                indices.append(index)
+        return indices
+
+    def _ensure_index(self):
+        """Build the sorted start / running max end index"""
+        if self._max_ends is not None:
+            return
+
+        starts = self.starts
+        if all(starts[i] <= starts[i + 1] for i in range(len(starts) - 1)):
+            # Cues are already in start order (the usual case)
+            self._order = None
+            self._sorted_starts = starts
+        else:
+            order = sorted(range(len(starts)), key=starts.__getitem__)
+            self._order = array('q', order)
+            self._sorted_starts = array('d', (starts[i] for i in order))
+
+        max_ends = array('d')
+        running = float('-inf')
+        for position in range(len(starts)):
+            index = self._order[position] if self._order is not None else position
+            running = max(running, self.ends[index])
+            max_ends.append(running)
+        self._max_ends = max_ends
+
+
+def format_timestamp(seconds: float, separator: str = '.') -> str:
+    """
+    Format seconds as a subtitle timestamp (HH:MM:SS.mmm)
+
+    Args:
+        seconds: Time in seconds
+        separator: Millisecond separator ('.' for VTT, ',' for SRT)
+
+    Returns:
+        Formatted timestamp, rounded to the nearest millisecond
+    """
+    total_ms = max(0, int(round(seconds * 1000)))
+    hours, remainder = divmod(total_ms, 3600000)
+    minutes, remainder = divmod(remainder, 60000)
+    secs, milliseconds = divmod(remainder, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{milliseconds:03d}"
+
+
+def _match_to_seconds(groups) -> float:
+    """Convert (hours, minutes, seconds) timestamp groups to seconds"""
+    hours, minutes, seconds = groups
+    seconds = float(seconds.replace(',', '.'))
+    if hours is None:
+        return float(minutes) * 60 + seconds
+    return float(hours) * 3600 + float(minutes) * 60 + seconds
+
+
+def _cache_path(cache_dir: Path, subtitle_path: Path) -> Path:
+    """Get cache file path for a subtitle file"""
+    key = hashlib.sha1(str(subtitle_path.resolve()).encode('utf-8')).hexdigest()[:16]
+    return cache_dir / f"{subtitle_path.stem}.{key}.track.pkl"
+
+
+def _load_cached(cache_path: Path, subtitle_path: Path, stat: os.stat_result) -> Optional[SubtitleTrack]:
+    """Load a cached track if it matches the subtitle file"""
+    if not cache_path.exists():
+        return None
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable subtitle cache {cache_path}: {e}")
+        return None
+
+    if (cached.get('version') != CACHE_VERSION
+            or cached.get('size') != stat.st_size
+            or cached.get('mtime_ns') != stat.st_mtime_ns):
+        return None
+
+    return SubtitleTrack(
+        cached['starts'],
+        cached['ends'],
+        cached['text'],
+        cached['offsets'],
+        source=subtitle_path
+    )
+
+
+def _save_cached(cache_path: Path, track: SubtitleTrack, stat: os.stat_result):
+    """Write a parsed track to the cache atomically"""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    payload = {
+        'version': CACHE_VERSION,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'starts': track.starts,
+        'ends': track.ends,
+        'text': track.text,
+        'offsets': track.offsets
+    }
+
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{cache_path.name}.", suffix=".tmp", dir=cache_path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
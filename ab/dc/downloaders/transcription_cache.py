@@ -0,0 +1,402 @@
+"""
+Transcription Cache
+Stores Whisper results keyed by the decoded audio so the same audio is
+never transcribed twice
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import logging
+import tempfile
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored representation changes to invalidate cached results
+CACHE_VERSION = 1
+
+SOURCE_INDEX_FILENAME = "sources.json"
+
+# PCM bytes hashed per update, to avoid copying long recordings at once
+_HASH_BLOCK_SAMPLES = 1 << 20
+
+
+class TranscriptionCache:
+    """
+    On-disk cache of transcription results
+
+    Results are keyed by a hash of the decoded PCM audio plus model size and
+    language, so a clip re-cut to another aspect ratio or container, or the
+    same file transcribed from the CLI and the API, reuses one Whisper run.
+    A source index maps file path, size and mtime to the audio key, which
+    skips decoding entirely for files that were already seen. The index is
+    kept in memory (reloaded when another process rewrites it) and pruned
+    of entries for superseded file versions, missing sources and removed
+    results.
+
+    Segments are stored as flat arrays (start, end, text offsets) plus one
+    text string, like SubtitleTrack, instead of one dict per segment.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Directory for cached results
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.cache_dir / SOURCE_INDEX_FILENAME
+        self._lock = threading.Lock()
+        self._index: Dict[str, str] = {}
+        self._index_mtime: Optional[int] = None
+
+    # Keys
+
+    @staticmethod
+    def audio_key(
+        audio,
+        model_size: str,
+        language: Optional[str] = None,
+        variant: str = ""
+    ) -> str:
+        """
+        Build the cache key for decoded audio
+
+        Args:
+            audio: 1-D float32 NumPy array of samples
+            model_size: Whisper model size
+            language: Requested language code or None for auto-detection
+            variant: Tag for options that change the result (e.g. 'vad')
+
+        Returns:
+            Hex digest identifying audio, model, language and variant
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_VERSION}:{model_size}:{language or 'auto'}:{variant}:".encode('utf-8'))
+
+        data = memoryview(audio).cast('B')
+        block = _HASH_BLOCK_SAMPLES * audio.itemsize
+        for offset in range(0, len(data), block):
+            digest.update(data[offset:offset + block])
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def _source_key(
+        source_path: Path,
+        model_size: str,
+        language: Optional[str],
+        variant: str
+    ) -> Optional[str]:
+        """Build the source index key from the file identity"""
+        try:
+            stat = Path(source_path).stat()
+        except OSError:
+            return None
+
+        resolved = Path(source_path).resolve()
+        return f"{resolved}|{stat.st_size}|{stat.st_mtime_ns}|{model_size}|{language or 'auto'}|{variant}"
+
+    @staticmethod
+    def _split_source_key(source_key: str) -> tuple:
+        """Split a source index key into (path, size, mtime_ns, options)"""
+        path, size, mtime_ns, model_size, language, variant = source_key.rsplit('|', 5)
+        return path, size, mtime_ns, f"{model_size}|{language}|{variant}"
+
+    def lookup_source(
+        self,
+        source_path: Path,
+        model_size: str,
+        language: Optional[str] = None,
+        variant: str = ""
+    ) -> Optional[str]:
+        """
+        Get the audio key recorded for an unchanged source file
+
+        Args:
+            source_path: Video or audio file
+            model_size: Whisper model size
+            language: Requested language code or None for auto-detection
+            variant: Tag for options that change the result
+
+        Returns:
+            Audio key or None if the file was not seen (or has changed)
+        """
+        source_key = self._source_key(source_path, model_size, language, variant)
+        if source_key is None:
+            return None
+
+        with self._lock:
+            key = self._load_index().get(source_key)
+            if key is None or self._entry_path(key).exists():
+                return key
+
+            # The result was removed; drop the entries pointing to it
+            self._drop_sources(key)
+            return None
+
+    def record_source(
+        self,
+        source_path: Path,
+        model_size: str,
+        language: Optional[str],
+        key: str,
+        variant: str = ""
+    ):
+        """
+        Remember the audio key of a source file
+
+        Args:
+            source_path: Video or audio file
+            model_size: Whisper model size
+            language: Requested language code or None for auto-detection
+            key: Audio key from audio_key()
+            variant: Tag for options that change the result
+        """
+        source_key = self._source_key(source_path, model_size, language, variant)
+        if source_key is None:
+            return
+
+        path, _, _, options = self._split_source_key(source_key)
+
+        with self._lock:
+            index = self._load_index()
+            if index.get(source_key) == key:
+                return
+
+            # Earlier versions of the file can never match again
+            for other in list(index):
+                other_path, _, _, other_options = self._split_source_key(other)
+                if other_path == path and other_options == options:
+                    del index[other]
+            index[source_key] = key
+            self._save_index()
+
+    def prune(self) -> int:
+        """
+        Drop source index entries whose file changed or whose result is gone
+
+        Returns:
+            Number of entries removed
+        """
+        def stale(source_key: str, key: str) -> bool:
+            path, size, mtime_ns, _ = self._split_source_key(source_key)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return True
+            return (
+                str(stat.st_size) != size
+                or str(stat.st_mtime_ns) != mtime_ns
+                or not self._entry_path(key).exists()
+            )
+
+        with self._lock:
+            index = self._load_index()
+            removed = [source_key for source_key, key in index.items() if stale(source_key, key)]
+            for source_key in removed:
+                del index[source_key]
+            if removed:
+                self._save_index()
+
+        if removed:
+            logger.info(f"Pruned {len(removed)} stale transcription source entries")
+        return len(removed)
+
+    def remove(self, key: str):
+        """
+        Delete a cached result and the source index entries pointing to it
+
+        Args:
+            key: Audio key from audio_key()
+        """
+        try:
+            self._entry_path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove transcription cache {key}: {e}")
+
+        with self._lock:
+            self._load_index()
+            self._drop_sources(key)
+
+    def _drop_sources(self, key: str):
+        """Remove the index entries pointing to an audio key, and save (lock held)"""
+        removed = [source_key for source_key, value in self._index.items() if value == key]
+        for source_key in removed:
+            del self._index[source_key]
+        if removed:
+            self._save_index()
+
+    def _load_index(self) -> Dict[str, str]:
+        """Get the source index, reloading it if the file changed (lock held)"""
+        try:
+            mtime = self._index_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if mtime == self._index_mtime:
+            return self._index
+
+        self._index = {}
+        self._index_mtime = mtime
+        if mtime is not None:
+            try:
+                with open(self._index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable transcription source index: {e}")
+        return self._index
+
+    def _save_index(self):
+        """Write the in-memory source index (lock held)"""
+        try:
+            _write_atomic(
+                self._index_path,
+                json.dumps(self._index, indent=2, ensure_ascii=False).encode('utf-8')
+            )
+            self._index_mtime = self._index_path.stat().st_mtime_ns
+        except OSError as e:
+            logger.warning(f"Failed to update transcription source index: {e}")
+
+    # Results
+
+    def _entry_path(self, key: str) -> Path:
+        """Get cache file path for a key"""
+        return self.cache_dir / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Get a cached transcription result
+
+        Args:
+            key: Audio key from audio_key()
+
+        Returns:
+            Whisper-style result {'text', 'language', 'segments'} or None
+        """
+        path = self._entry_path(key)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                cached = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable transcription cache {path}: {e}")
+            self.remove(key)
+            return None
+
+        if cached.get('version') != CACHE_VERSION:
+            self.remove(key)
+            return None
+
+        starts = cached['starts']
+        ends = cached['ends']
+        offsets = cached['offsets']
+        segment_text = cached['segment_text']
+
+        result = {
+            'text': cached['text'],
+            'language': cached['language'],
+            'segments': [
+                {
+                    'start': starts[i],
+                    'end': ends[i],
+                    'text': segment_text[offsets[i]:offsets[i + 1]]
+                }
+                for i in range(len(starts))
+            ]
+        }
+        if cached.get('skipped_seconds') is not None:
+            result['skipped_seconds'] = cached['skipped_seconds']
+        return result
+
+    def put(self, key: str, result: Dict):
+        """
+        Store a transcription result
+
+        Only the text, language, segment start/end/text and skipped_seconds
+        (set by voice activity detection) are kept.
+
+        Args:
+            key: Audio key from audio_key()
+            result: Whisper transcribe() result
+        """
+        starts = array('d')
+        ends = array('d')
+        offsets = array('q', [0])
+        texts = []
+        text_length = 0
+
+        for seg in result.get('segments', []):
+            starts.append(seg['start'])
+            ends.append(seg['end'])
+            texts.append(seg['text'])
+            text_length += len(seg['text'])
+            offsets.append(text_length)
+
+        payload = {
+            'version': CACHE_VERSION,
+            'text': result.get('text', ''),
+            'language': result.get('language'),
+            'starts': starts,
+            'ends': ends,
+            'offsets': offsets,
+            'segment_text': ''.join(texts),
+            'skipped_seconds': result.get('skipped_seconds')
+        }
+
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(path, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            logger.warning(f"Failed to cache transcription {path}: {e}")
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Write bytes to a file atomically (temp file + rename)"""
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+_cache: Optional[TranscriptionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_transcription_cache() -> Optional[TranscriptionCache]:
+    """
+    Get the process-wide transcription cache
+
+    The directory comes from TRANSCRIPTION_CACHE_DIR (default:
+    transcriptions/.cache); an empty value disables caching.
+
+    Returns:
+        Shared TranscriptionCache instance, or None if disabled
+    """
+    global _cache
+    cache_dir = os.getenv('TRANSCRIPTION_CACHE_DIR', 'transcriptions/.cache')
+    if not cache_dir:
+        return None
+
+    with _cache_lock:
+        if _cache is None or _cache.cache_dir != Path(cache_dir):
+            _cache = TranscriptionCache(Path(cache_dir))
+            _cache.prune()
+        return _cache
@@ -22,6 +22,7 @@ from storage_manager import (
     check_disk_space,
     sanitize_video_id
 )
+from storage_index import get_storage_index, get_storage_evictor
 from video_downloader import (
     download_video,
     get_video_info,
@@ -116,6 +117,7 @@ def process_video_moments(
     storage_path: Optional[Path] = None,
     force_redownload: bool = False,
     force_reprocess: bool = False,
+    encode_deadline: Optional[float] = None,
     **ffmpeg_options
 ) -> Dict:
     """
@@ -127,16 +129,22 @@ def process_video_moments(
         storage_path: Override storage directory (uses config if None)
         force_redownload: Re-download video even if exists
         force_reprocess: Re-cut clips even if they exist
+        encode_deadline: Seconds to finish all clips in, choosing presets
+            adaptively (uses config if None, 0 = fixed preset)
         **ffmpeg_options: Override FFmpeg options (video_codec, audio_codec, etc.)
 
     Returns:
         Dictionary with processing results
     """
     start_time = time.time()
+    storage_index = None
+    pinned_video = None
 
     try:
         # Load configuration
         config = get_config()
+        storage_index = get_storage_index(config)
+        storage_evictor = get_storage_evictor(config)
 
         # Use provided paths or defaults from config
         downloads_path = downloads_path or config.downloads_path
@@ -203,6 +211,10 @@ def process_video_moments(
                     'video_url': video_url
                 }
 
+        # Track the source video and keep it from being evicted while in use
+        if storage_index is not None and storage_index.register(video_path, 'source', pinned=True):
+            pinned_video = video_path
+
         # Validate video file
         logger.info("Validating video file...")
         is_valid, validation_msg = validate_video_file(
@@ -227,7 +239,7 @@ def process_video_moments(
         # Check disk space (estimate: video size × 0.5 for clips)
         video_size_mb = video_info.get('size_mb', 0) if video_info else 0
         estimated_clips_size = video_size_mb * 0.5
-        has_space, space_msg = check_disk_space(storage_path, estimated_clips_size)
+        has_space, space_msg = check_disk_space(storage_path, estimated_clips_size, evictor=storage_evictor)
 
         if not has_space:
             return {
@@ -257,6 +269,8 @@ def process_video_moments(
         if force_reprocess:
             logger.info("Force reprocess enabled, cleaning up old clips...")
             cleanup_old_clips(video_id, storage_path)
+            if storage_index is not None:
+                storage_index.forget(output_dir)
 
         # Prepare FFmpeg options
         ffmpeg_opts = config.get_ffmpeg_options()
@@ -276,6 +290,7 @@ def process_video_moments(
             video_id=video_id,
             parallel=config.enable_parallel_processing,
             max_workers=config.max_concurrent_clips,
+            deadline_seconds=encode_deadline if encode_deadline is not None else config.encode_deadline_seconds,
             **ffmpeg_opts
         )
 
@@ -288,8 +303,16 @@ def process_video_moments(
             for clip in failed_clips:
                 logger.warning(f"  Clip {clip['clip_id']}: {clip.get('error', 'Unknown error')}")
 
+        # Index new clips, then keep storage roots within their budgets
+        if storage_index is not None:
+            storage_index.register_tree(output_dir, 'clip')
+
         # Calculate total size
-        total_size_mb = calculate_directory_size(output_dir)
+        total_size_mb = calculate_directory_size(output_dir, storage_index)
+
+        # Enforce budgets now rather than at the evictor's next pass
+        if storage_evictor is not None:
+            storage_evictor.run_once()
 
         # Calculate processing time
         processing_time = time.time() - start_time
@@ -326,6 +349,10 @@ def process_video_moments(
             'processing_time_seconds': round(processing_time, 2)
         }
 
+    finally:
+        if pinned_video is not None:
+            storage_index.pin(pinned_video, False)
+
 
 def main():
     """Example usage"""
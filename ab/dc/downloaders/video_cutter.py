@@ -5,7 +5,7 @@ Handles cutting video segments using FFmpeg
 
 import subprocess
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
@@ -85,7 +85,9 @@ def cut_video_segment(
     include_audio: bool = True,
     aspect_ratio: str = 'original',
     ffmpeg_path: str = 'ffmpeg',
-    timeout: int = 600
+    timeout: int = 600,
+    on_progress: Optional[Callable] = None,
+    on_stats: Optional[Callable] = None
 ) -> bool:
     """
     Cut a single video segment using FFmpeg
@@ -102,6 +104,8 @@ def cut_video_segment(
         include_audio: Whether to include audio
         ffmpeg_path: Path to ffmpeg binary
         timeout: Timeout in seconds
+        on_progress: Called with FFmpegProgress snapshots while encoding
+        on_stats: Called with the run's FFmpegStats when the encode succeeds
 
     Returns:
         True if successful, False otherwise
@@ -109,6 +113,9 @@ def cut_video_segment(
     Raises:
         CuttingError: If cutting fails
     """
+    from ffmpeg_runner import run_ffmpeg
+    from media_probe import get_media_probe, record_from_encode
+
     if not input_path.exists():
         raise CuttingError(f"Input video not found: {input_path}")
 
@@ -154,12 +161,12 @@ def cut_video_segment(
     logger.info(f"Cutting clip: {start_time:.2f}s - {end_time:.2f}s -> {output_path.name}")
 
     try:
-        result = subprocess.run(
+        result = run_ffmpeg(
             command,
-            capture_output=True,
-            text=True,
             timeout=timeout,
-            check=True
+            on_progress=on_progress,
+            duration=duration,
+            label=output_path.name
         )
 
         # Verify output file was created
@@ -170,6 +177,15 @@ def cut_video_segment(
         if file_size == 0:
             raise CuttingError("Output file is empty")
 
+        if on_stats:
+            on_stats(result.stats)
+
+        # Describe the clip from the encode itself, so validators don't
+        # have to probe it again
+        record = record_from_encode(result, output_path)
+        if record:
+            get_media_probe().store(output_path, record, persist=False)
+
         logger.info(f"Clip created: {output_path.name} ({file_size / 1024 / 1024:.1f}MB)")
         return True
 
@@ -316,6 +332,7 @@ def batch_cut_videos(
     video_id: str,
     parallel: bool = True,
     max_workers: int = 4,
+    deadline_seconds: Optional[float] = None,
     **ffmpeg_options
 ) -> List[Dict]:
     """
@@ -328,6 +345,9 @@ def batch_cut_videos(
         video_id: Video ID for clip naming
         parallel: Whether to process clips in parallel
         max_workers: Maximum concurrent workers
+        deadline_seconds: Finish the batch within this many seconds by
+            choosing x264/x265 presets per clip from measured encode speeds
+            (the configured preset is the slowest used; optional)
         **ffmpeg_options: Options to pass to cut_video_segment
 
     Returns:
@@ -342,35 +362,89 @@ def batch_cut_videos(
         - duration: Duration
         - score: Engagement score (from moment)
         - file_size_mb: File size in MB
+        - preset: Preset chosen for the clip (adaptive mode only)
+        - validation: Probe record captured from the encode (if available)
         - success: Whether cutting succeeded
         - error: Error message if failed
     """
     from storage_manager import get_clip_path, calculate_file_size_mb
+    from media_probe import get_media_probe
 
     clips_info = []
+    parallel = parallel and len(moments) > 1
+
+    planner = None
+    if deadline_seconds:
+        planner = _create_preset_planner(
+            input_path, moments, deadline_seconds,
+            max_workers if parallel else 1, ffmpeg_options
+        )
 
-    if parallel and len(moments) > 1:
+    if parallel:
         # Parallel processing
         logger.info(f"Processing {len(moments)} clips in parallel (max {max_workers} workers)")
         clips_info = _process_clips_parallel(
-            input_path, output_dir, moments, video_id, max_workers, ffmpeg_options
+            input_path, output_dir, moments, video_id, max_workers, ffmpeg_options, planner
         )
     else:
         # Sequential processing
         logger.info(f"Processing {len(moments)} clips sequentially")
         clips_info = _process_clips_sequential(
-            input_path, output_dir, moments, video_id, ffmpeg_options
+            input_path, output_dir, moments, video_id, ffmpeg_options, planner
         )
 
+    # Persist the encode records for validators in other processes
+    get_media_probe().save()
+
     return clips_info
 
 
+def _create_preset_planner(
+    input_path: Path,
+    moments: List[Dict],
+    deadline_seconds: float,
+    workers: int,
+    ffmpeg_options: Dict
+):
+    """
+    Create an adaptive preset planner for a batch
+
+    Returns:
+        AdaptivePresetPlanner, or None if the codec has no presets or the
+        source resolution cannot be read
+    """
+    from encode_planner import AdaptivePresetPlanner, get_encode_stats
+    from video_downloader import get_video_info
+
+    video_codec = ffmpeg_options.get('video_codec', 'libx264')
+    if video_codec not in ['libx264', 'libx265']:
+        logger.info(f"Adaptive presets not available for codec {video_codec}, using fixed settings")
+        return None
+
+    info = get_video_info(input_path)
+    if not info:
+        logger.warning("Could not read source resolution, using fixed preset")
+        return None
+
+    return AdaptivePresetPlanner(
+        stats=get_encode_stats(),
+        codec=video_codec,
+        height=info['height'],
+        aspect_ratio=ffmpeg_options.get('aspect_ratio', 'original'),
+        total_media_seconds=sum(m['duration'] for m in moments),
+        deadline_seconds=deadline_seconds,
+        workers=min(workers, len(moments)),
+        slowest_preset=ffmpeg_options.get('preset', 'medium')
+    )
+
+
 def _process_clips_sequential(
     input_path: Path,
     output_dir: Path,
     moments: List[Dict],
     video_id: str,
-    ffmpeg_options: Dict
+    ffmpeg_options: Dict,
+    planner=None
 ) -> List[Dict]:
     """Process clips sequentially"""
     from storage_manager import get_clip_path, calculate_file_size_mb
@@ -379,7 +453,7 @@ def _process_clips_sequential(
 
     for clip_id, moment in enumerate(moments):
         clip_info = _process_single_clip(
-            clip_id, moment, input_path, output_dir, video_id, ffmpeg_options
+            clip_id, moment, input_path, output_dir, video_id, ffmpeg_options, planner
         )
         clips_info.append(clip_info)
 
@@ -392,7 +466,8 @@ def _process_clips_parallel(
     moments: List[Dict],
     video_id: str,
     max_workers: int,
-    ffmpeg_options: Dict
+    ffmpeg_options: Dict,
+    planner=None
 ) -> List[Dict]:
     """Process clips in parallel using ThreadPoolExecutor"""
     clips_info = []
@@ -402,7 +477,7 @@ def _process_clips_parallel(
         futures = {
             executor.submit(
                 _process_single_clip,
-                clip_id, moment, input_path, output_dir, video_id, ffmpeg_options
+                clip_id, moment, input_path, output_dir, video_id, ffmpeg_options, planner
             ): clip_id
             for clip_id, moment in enumerate(moments)
         }
@@ -434,10 +509,12 @@ def _process_single_clip(
     input_path: Path,
     output_dir: Path,
     video_id: str,
-    ffmpeg_options: Dict
+    ffmpeg_options: Dict,
+    planner=None
 ) -> Dict:
     """Process a single clip and return info"""
     from storage_manager import get_clip_path, calculate_file_size_mb
+    from media_probe import get_media_probe
 
     start_time = moment['start_time']
     end_time = moment['end_time']
@@ -447,19 +524,32 @@ def _process_single_clip(
 
     clip_path = get_clip_path(video_id, clip_id, duration, output_dir, score, aspect_ratio)
 
+    # Presets are chosen when the clip starts, so a backed-up queue
+    # switches the remaining clips to faster presets
+    if planner is not None:
+        ffmpeg_options = dict(ffmpeg_options, preset=planner.next_preset(duration))
+
     try:
         # Cut the clip
+        encode_stats = []
         success = cut_video_segment(
             input_path=input_path,
             output_path=clip_path,
             start_time=start_time,
             end_time=end_time,
+            on_stats=encode_stats.append,
             **ffmpeg_options
         )
 
+        # Speed comes from ffmpeg's own progress: media encoded per second
+        # of the ffmpeg run
+        if planner is not None and encode_stats:
+            stats = encode_stats[0]
+            planner.record(ffmpeg_options['preset'], stats.out_time_seconds or duration, stats.wall_seconds)
+
         file_size_mb = calculate_file_size_mb(clip_path) if success else 0
 
-        return {
+        clip_info = {
             'clip_id': clip_id,
             'filename': clip_path.name,
             'path': str(clip_path),
@@ -471,6 +561,14 @@ def _process_single_clip(
             'success': True,
             'error': None
         }
+        if planner is not None:
+            clip_info['preset'] = ffmpeg_options['preset']
+
+        # Validation record captured from the encode (no ffprobe)
+        validation = get_media_probe().cached(clip_path) if success else None
+        if validation and validation.get('source') == 'encode':
+            clip_info['validation'] = validation
+        return clip_info
 
     except CuttingError as e:
         logger.error(f"Failed to cut clip {clip_id}: {e}")
@@ -488,17 +586,25 @@ def _process_single_clip(
         }
 
 
-def validate_clip_output(clip_path: Path, min_duration: float = 1.0) -> tuple[bool, str]:
+def validate_clip_output(
+    clip_path: Path,
+    min_duration: float = 1.0,
+    validation: Optional[Dict] = None
+) -> tuple[bool, str]:
     """
     Validate generated clip
 
     Args:
         clip_path: Path to clip file
         min_duration: Minimum expected duration in seconds
+        validation: Validation record from the clip info (trusted while
+            the file's fingerprint matches)
 
     Returns:
         Tuple of (is_valid, message)
     """
+    from media_probe import get_media_probe, file_fingerprint
+
     if not clip_path.exists():
         return False, "Clip file does not exist"
 
@@ -509,25 +615,12 @@ def validate_clip_output(clip_path: Path, min_duration: float = 1.0) -> tuple[bo
     if file_size < 1024:  # Less than 1KB
         return False, f"Clip file too small: {file_size} bytes"
 
-    # Optionally check duration with ffprobe
+    # Optionally check duration with ffprobe (cached by the shared media probe)
     try:
-        command = [
-            'ffprobe',
-            '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            str(clip_path)
-        ]
-
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=True
-        )
-
-        duration = float(result.stdout.strip())
+        if validation and validation.get('fingerprint') == file_fingerprint(clip_path):
+            duration = validation['duration']
+        else:
+            duration = get_media_probe().probe(clip_path)['duration']
         if duration < min_duration:
             return False, f"Clip duration ({duration}s) too short"
 
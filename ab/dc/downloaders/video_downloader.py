@@ -10,7 +10,14 @@ from pathlib import Path
 from typing import Optional, Dict
 import logging
 
-from storage_manager import get_video_path, sanitize_video_id
+from storage_manager import (
+    get_video_path,
+    sanitize_video_id,
+    write_download_record,
+    verify_download_record
+)
+from download_coordinator import get_download_coordinator
+from media_probe import get_media_probe, ProbeError
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +38,13 @@ def download_video(
     """
     Download YouTube video using yt-dlp
 
+    Concurrent calls for the same video (threads or processes) share one
+    download, and a complete file already on disk is reused. The file is written to a temporary name and renamed into
+    place once complete. Partial data is kept across retries and restarts
+    so an interrupted download resumes where it stopped. Completed files
+    are checked with a container probe and recorded (size + sample hash)
+    for is_video_downloaded().
+
     Args:
         video_url: YouTube video URL
         video_id: Video ID (for filename)
@@ -48,22 +62,138 @@ def download_video(
     video_id = sanitize_video_id(video_id)
     output_path = get_video_path(video_id, downloads_path)
 
+    container = {}
+
+    def download(temp_path: Path):
+        _run_download(video_url, temp_path, quality, timeout, max_retries)
+
+        probe = probe_container(temp_path)
+        if probe is None:
+            temp_path.unlink()
+            raise DownloadError(f"Downloaded file is not a playable video: {temp_path.name}")
+        container.update(probe)
+
+    path = get_download_coordinator().fetch(output_path, download, is_complete_download)
+
+    # Another caller may have produced the file; record it if we did
+    if container or verify_download_record(path) is not True:
+        write_download_record(path, container or probe_container(path))
+
+    logger.info(f"Download successful: {path} ({path.stat().st_size / 1024 / 1024:.1f}MB)")
+    return path
+
+
+def is_complete_download(video_path: Path) -> bool:
+    """
+    Check whether an existing file is a complete download that can be reused
+
+    Files with a download record must match it; files without one (e.g.
+    downloaded by an older version) must pass a container probe.
+
+    Args:
+        video_path: Path to video file
+
+    Returns:
+        True if the file can be reused instead of downloading it again
+    """
+    verified = verify_download_record(video_path)
+    if verified is None:
+        return probe_container(video_path) is not None
+    return verified
+
+
+def probe_container(video_path: Path) -> Optional[Dict]:
+    """
+    Cheaply check that a file is a complete, readable video container
+
+    Reads only the container header/index (no decoding).
+
+    Args:
+        video_path: Path to video file
+
+    Returns:
+        Dictionary with format_name and duration, or None if the file is
+        unreadable, has no video stream or has no duration
+    """
+    command = [
+        'ffprobe',
+        '-v', 'error',
+        '-show_entries', 'format=format_name,duration:stream=codec_type',
+        '-of', 'json',
+        str(video_path)
+    ]
+
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, check=True, timeout=30)
+        data = json.loads(result.stdout)
+    except (subprocess.SubprocessError, json.JSONDecodeError, OSError) as e:
+        logger.warning(f"Container probe failed for {video_path}: {e}")
+        return None
+
+    format_info = data.get('format', {})
+    duration = float(format_info.get('duration') or 0)
+    has_video = any(s.get('codec_type') == 'video' for s in data.get('streams', []))
+
+    if not has_video or duration <= 0:
+        logger.warning(f"Container probe found no playable video in {video_path}")
+        return None
+
+    return {
+        'format_name': format_info.get('format_name'),
+        'duration': duration
+    }
+
+
+def _run_download(
+    video_url: str,
+    output_path: Path,
+    quality: str,
+    timeout: int,
+    max_retries: int
+):
+    """
+    Run yt-dlp with retries
+
+    Args:
+        video_url: YouTube video URL
+        output_path: File to write
+        quality: Quality setting
+        timeout: Download timeout in seconds
+        max_retries: Maximum number of retry attempts
+
+    Raises:
+        DownloadError: If download fails after all retries
+    """
     # Build format string based on quality
     format_str = _build_format_string(quality)
 
-    # yt-dlp command
+    # yt-dlp command; .part files and fragment state are kept on failure
+    # and picked up by the next attempt (same output name)
     command = [
         'yt-dlp',
         '-f', format_str,
         '-o', str(output_path),
         '--merge-output-format', 'mp4',
+        '--continue',
+        '--part',
+        '--retries', '10',
+        '--fragment-retries', '10',
         '--no-playlist',
         '--no-warnings',
         '--quiet',
         video_url
     ]
 
-    logger.info(f"Downloading video: {video_url} -> {output_path}")
+    partial_bytes = sum(
+        p.stat().st_size for p in output_path.parent.glob(f"{output_path.stem}*.part")
+    )
+    if partial_bytes:
+        logger.info(
+            f"Resuming download: {video_url} -> {output_path} "
+            f"({partial_bytes / 1024 / 1024:.1f}MB already downloaded)"
+        )
+    else:
+        logger.info(f"Downloading video: {video_url} -> {output_path}")
 
     # Retry logic with exponential backoff
     for attempt in range(max_retries):
@@ -84,10 +214,10 @@ def download_video(
             if file_size == 0:
                 raise DownloadError("Downloaded file is empty")
 
-            logger.info(f"Download successful: {output_path} ({file_size / 1024 / 1024:.1f}MB)")
-            return output_path
+            return
 
         except subprocess.TimeoutExpired:
+            # Partial data stays on disk, so the retry resumes from it
             logger.warning(f"Download timeout (attempt {attempt + 1}/{max_retries})")
             if attempt < max_retries - 1:
                 wait_time = 2 ** attempt  # Exponential backoff
@@ -140,76 +270,48 @@ def get_video_info(video_path: Path) -> Optional[Dict]:
     """
     Get video metadata using ffprobe
 
+    Results are cached per file by the shared media probe.
+
     Args:
         video_path: Path to video file
 
     Returns:
         Dictionary with video metadata or None if failed
-        Keys: duration, width, height, codec, fps, bitrate
+        Keys: duration, width, height, codec, fps, bitrate, size_mb
     """
     if not video_path.exists():
         logger.error(f"Video file not found: {video_path}")
         return None
 
     try:
-        # Use ffprobe to get video information
-        command = [
-            'ffprobe',
-            '-v', 'quiet',
-            '-print_format', 'json',
-            '-show_format',
-            '-show_streams',
-            str(video_path)
-        ]
-
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=30
-        )
-
-        data = json.loads(result.stdout)
-
-        # Extract video stream info
-        video_stream = next(
-            (s for s in data.get('streams', []) if s.get('codec_type') == 'video'),
-            None
-        )
-
-        if not video_stream:
-            logger.error("No video stream found in file")
-            return None
-
-        # Extract relevant metadata
-        format_info = data.get('format', {})
-
-        metadata = {
-            'duration': float(format_info.get('duration', 0)),
-            'width': int(video_stream.get('width', 0)),
-            'height': int(video_stream.get('height', 0)),
-            'codec': video_stream.get('codec_name', 'unknown'),
-            'fps': eval(video_stream.get('r_frame_rate', '0/1')),  # Evaluates fraction
-            'bitrate': int(format_info.get('bit_rate', 0)),
-            'size_mb': round(int(format_info.get('size', 0)) / (1024 * 1024), 2)
-        }
-
-        logger.info(f"Video info: {metadata['width']}x{metadata['height']}, "
-                   f"{metadata['duration']:.1f}s, {metadata['codec']}")
-
-        return metadata
-
-    except subprocess.CalledProcessError as e:
-        logger.error(f"ffprobe error: {e.stderr if e.stderr else str(e)}")
-        return None
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse ffprobe output: {e}")
+        info = get_media_probe().probe(video_path)
+    except ProbeError as e:
+        logger.error(f"ffprobe error: {e}")
         return None
     except Exception as e:
         logger.error(f"Error getting video info: {e}")
         return None
 
+    video = info['video']
+    if not video:
+        logger.error("No video stream found in file")
+        return None
+
+    metadata = {
+        'duration': info['duration'],
+        'width': video['width'],
+        'height': video['height'],
+        'codec': video['codec'],
+        'fps': video['fps'],
+        'bitrate': info['bit_rate'],
+        'size_mb': round(info['file_size'] / (1024 * 1024), 2)
+    }
+
+    logger.info(f"Video info: {metadata['width']}x{metadata['height']}, "
+               f"{metadata['duration']:.1f}s, {metadata['codec']}")
+
+    return metadata
+
 
 def validate_video_file(video_path: Path, max_duration: Optional[int] = None) -> tuple[bool, str]:
     """
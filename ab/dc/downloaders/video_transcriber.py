@@ -6,12 +6,18 @@ Transcribes videos from Instagram/YouTube URLs or local video files using OpenAI
 import os
 import sys
 import subprocess
-import tempfile
+import threading
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional, List
 from datetime import datetime
 
+from whisper_model_pool import get_model_registry, max_model_processes
+from transcription_cache import get_transcription_cache
+from media_probe import get_media_probe
+from subtitle_track import format_timestamp as format_vtt_timestamp
+
 # Install dependencies if needed
 def _install_dependencies():
     """Install required dependencies for transcription"""
@@ -44,6 +50,25 @@ AUDIO_FORMATS = {'.mp3', '.m4a', '.wav', '.flac', '.ogg', '.aac', '.wma'}
 VIDEO_FORMATS = {'.mp4', '.mkv', '.avi', '.mov', '.webm', '.flv', '.wmv'}
 SUPPORTED_FORMATS = AUDIO_FORMATS | VIDEO_FORMATS
 
+# Whisper expects 16kHz mono float32 audio
+SAMPLE_RATE = 16000
+
+# Chunked transcription: how far from each target boundary to look for
+# silence, and the analysis frame used to measure loudness
+CHUNK_SEARCH_SECONDS = 30.0
+ENERGY_FRAME_SECONDS = 0.03
+
+# Voice activity detection: frames louder than VAD_ENERGY_RATIO x the noise
+# floor (10th percentile energy) are speech, quieter ones only if their
+# zero-crossing rate marks an unvoiced consonant; broadband hiss is rejected
+VAD_ENERGY_FLOOR = 0.005
+VAD_ENERGY_RATIO = 3.0
+VAD_FRICATIVE_ZCR = 0.25
+VAD_NOISE_ZCR = 0.45
+VAD_MIN_SPEECH_SECONDS = 0.25
+VAD_MIN_SILENCE_SECONDS = 1.0
+VAD_PAD_SECONDS = 0.2
+
 
 def _ensure_whisper_loaded():
     """Ensure whisper is loaded and dependencies are installed"""
@@ -93,6 +118,431 @@ def extract_audio_from_video(video_path: Path, temp_dir: str) -> Path:
     return audio_path
 
 
+def probe_media_duration(media_path: Path) -> Optional[float]:
+    """
+    Get media duration in seconds using ffprobe (cached by the shared
+    media probe)
+
+    Args:
+        media_path: Path to video or audio file
+
+    Returns:
+        Duration in seconds, or None if it cannot be determined
+    """
+    try:
+        duration = get_media_probe().probe(media_path)['duration']
+    except Exception:
+        return None
+    return duration or None
+
+
+def decode_audio_pcm(
+    media_path: Path,
+    sample_rate: int = SAMPLE_RATE,
+    start: Optional[float] = None,
+    duration: Optional[float] = None
+):
+    """
+    Decode audio to mono float32 PCM in memory
+
+    ffmpeg writes raw samples to stdout, which are read straight into a
+    NumPy buffer preallocated from the probed duration (grown if the probe
+    was short). No temporary files are written.
+
+    Args:
+        media_path: Path to video or audio file
+        sample_rate: Output sample rate (default: 16kHz for Whisper)
+        start: Decode from this position in seconds (optional)
+        duration: Decode at most this many seconds (optional)
+
+    Returns:
+        1-D float32 NumPy array of samples
+
+    Raises:
+        TranscriptionError: If decoding fails
+    """
+    import numpy as np
+
+    cmd = ['ffmpeg', '-nostdin', '-loglevel', 'error']  # Only show errors
+    if start:
+        cmd += ['-ss', str(start)]  # Input seek: only the window is decoded
+    cmd += ['-i', str(media_path)]
+    if duration:
+        cmd += ['-t', str(duration)]
+    cmd += [
+        '-vn',  # No video
+        '-ac', '1',  # Mono
+        '-ar', str(sample_rate),
+        '-f', 'f32le',  # Raw little-endian float32
+        '-'
+    ]
+
+    # One second of slack over the expected duration avoids most regrowth
+    if duration is None:
+        duration = probe_media_duration(media_path)
+    capacity = int(((duration or 60.0) + 1.0) * sample_rate)
+    buffer = np.empty(capacity, dtype=np.float32)
+    view = memoryview(buffer).cast('B')
+    filled = 0
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    # Drain stderr in the background so ffmpeg never blocks on it
+    stderr_chunks = []
+    stderr_thread = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()))
+    stderr_thread.start()
+
+    try:
+        while True:
+            if filled == len(view):
+                # Probe was short: grow the buffer and keep reading
+                buffer = np.concatenate([buffer, np.empty(len(buffer), dtype=np.float32)])
+                view = memoryview(buffer).cast('B')
+
+            read = process.stdout.readinto(view[filled:])
+            if not read:
+                break
+            filled += read
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+        stderr_thread.join()
+
+    if returncode != 0:
+        stderr = b''.join(stderr_chunks).decode('utf-8', errors='replace')
+        raise TranscriptionError(f"Failed to decode audio: {stderr}")
+
+    samples = filled // 4
+    if samples == 0:
+        raise TranscriptionError("Audio decoding produced no samples")
+
+    audio = buffer[:samples]
+    logger.info(
+        f"Audio decoded: {samples / sample_rate:.1f}s "
+        f"({audio.nbytes / 1024 / 1024:.1f}MB in memory)"
+    )
+    return audio
+
+
+def _frame_energy(audio, sample_rate: int = SAMPLE_RATE, frame_seconds: float = ENERGY_FRAME_SECONDS):
+    """
+    Compute RMS energy of consecutive non-overlapping frames
+
+    Args:
+        audio: 1-D float32 samples
+        sample_rate: Sample rate of audio
+        frame_seconds: Frame length in seconds
+
+    Returns:
+        Tuple of (energy per frame, frame length in samples)
+    """
+    import numpy as np
+
+    frame_length = max(1, int(sample_rate * frame_seconds))
+    frame_count = len(audio) // frame_length
+    frames = audio[:frame_count * frame_length].reshape(frame_count, frame_length)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1)), frame_length
+
+
+def find_chunk_boundaries(
+    audio,
+    chunk_seconds: float,
+    sample_rate: int = SAMPLE_RATE,
+    search_seconds: float = CHUNK_SEARCH_SECONDS
+) -> List[int]:
+    """
+    Split audio into chunks of about chunk_seconds at quiet points
+
+    Each boundary is placed at the quietest moment (smoothed frame energy)
+    within search_seconds of its target position, so chunks rarely cut
+    through a word.
+
+    Args:
+        audio: 1-D float32 samples
+        chunk_seconds: Target chunk length in seconds
+        sample_rate: Sample rate of audio
+        search_seconds: Window around each target boundary to search
+
+    Returns:
+        Sample offsets of chunk starts, beginning with 0
+    """
+    import numpy as np
+
+    energy, frame_length = _frame_energy(audio, sample_rate)
+    frames_per_second = sample_rate / frame_length
+
+    # Smooth over ~0.5s so a single quiet frame inside a word does not win
+    smooth = max(1, int(frames_per_second * 0.5))
+    energy = np.convolve(energy, np.ones(smooth, dtype=np.float32) / smooth, mode='same')
+
+    boundaries = [0]
+    target_frames = int(chunk_seconds * frames_per_second)
+    search_frames = int(search_seconds * frames_per_second)
+    last_frame = 0
+
+    while last_frame + target_frames + target_frames // 2 < len(energy):
+        target = last_frame + target_frames
+        lo = max(last_frame + target_frames // 2, target - search_frames)
+        hi = min(len(energy), target + search_frames)
+        quietest = lo + int(np.argmin(energy[lo:hi]))
+        boundaries.append(quietest * frame_length)
+        last_frame = quietest
+
+    return boundaries
+
+
+def _frame_zero_crossings(audio, frame_length: int):
+    """Fraction of sign changes in consecutive non-overlapping frames"""
+    import numpy as np
+
+    frame_count = len(audio) // frame_length
+    frames = audio[:frame_count * frame_length].reshape(frame_count, frame_length)
+    signs = np.signbit(frames)
+    return np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame_length
+
+
+def detect_speech_spans(
+    audio,
+    sample_rate: int = SAMPLE_RATE,
+    min_speech_seconds: float = VAD_MIN_SPEECH_SECONDS,
+    min_silence_seconds: float = VAD_MIN_SILENCE_SECONDS,
+    pad_seconds: float = VAD_PAD_SECONDS
+) -> List[tuple]:
+    """
+    Find speech regions with an energy / zero-crossing rate VAD
+
+    Frames are classified from RMS energy relative to the recording's noise
+    floor and zero-crossing rate. Gaps shorter than min_silence_seconds are
+    bridged, blips shorter than min_speech_seconds dropped, and every span
+    padded so word edges are kept.
+
+    Args:
+        audio: 1-D float32 samples
+        sample_rate: Sample rate of audio
+        min_speech_seconds: Shortest span kept as speech
+        min_silence_seconds: Shortest gap that splits two spans
+        pad_seconds: Padding added to both sides of each span
+
+    Returns:
+        List of (start_sample, end_sample) speech spans in order
+    """
+    import numpy as np
+
+    energy, frame_length = _frame_energy(audio, sample_rate)
+    if not len(energy):
+        return []
+
+    zcr = _frame_zero_crossings(audio, frame_length)
+
+    threshold = max(VAD_ENERGY_FLOOR, float(np.percentile(energy, 10)) * VAD_ENERGY_RATIO)
+    voiced = (energy > threshold) & (zcr < VAD_NOISE_ZCR)
+    unvoiced = (energy > threshold / 2) & (zcr >= VAD_FRICATIVE_ZCR) & (zcr < VAD_NOISE_ZCR)
+    speech = voiced | unvoiced
+
+    # Majority vote over ~0.15s so stray frames in noise do not form spans
+    frames_per_second = sample_rate / frame_length
+    window = max(1, int(frames_per_second * 0.15)) | 1
+    votes = np.convolve(speech.astype(np.float32), np.ones(window, dtype=np.float32), mode='same')
+    speech = votes * 2 > window
+
+    # Run boundaries of the speech mask as (start_frame, end_frame) pairs
+    edges = np.flatnonzero(np.diff(speech.astype(np.int8), prepend=0, append=0))
+    runs = edges.reshape(-1, 2)
+
+    min_gap = int(min_silence_seconds * frames_per_second)
+    min_run = int(min_speech_seconds * frames_per_second)
+    pad = int(pad_seconds * sample_rate)
+
+    spans = []
+    for start, end in runs.tolist():
+        if spans and start - spans[-1][1] < min_gap:
+            spans[-1][1] = end
+        else:
+            spans.append([start, end])
+
+    result = []
+    for start, end in spans:
+        if end - start < min_run:
+            continue
+        start_sample = max(0, start * frame_length - pad)
+        end_sample = min(len(audio), end * frame_length + pad)
+        if result and start_sample <= result[-1][1]:
+            result[-1] = (result[-1][0], end_sample)
+        else:
+            result.append((start_sample, end_sample))
+
+    return result
+
+
+def _extract_speech(audio):
+    """
+    Keep only the speech spans of audio
+
+    Args:
+        audio: 1-D float32 samples
+
+    Returns:
+        Tuple of (concatenated speech samples, speech spans, skipped seconds)
+    """
+    import numpy as np
+
+    spans = detect_speech_spans(audio)
+    speech = np.concatenate([audio[start:end] for start, end in spans]) if spans else audio[:0]
+    skipped_seconds = (len(audio) - len(speech)) / SAMPLE_RATE
+
+    logger.info(
+        f"Voice activity: {len(spans)} speech span(s), skipping {skipped_seconds:.1f}s "
+        f"of {len(audio) / SAMPLE_RATE:.1f}s"
+    )
+    return speech, spans, skipped_seconds
+
+
+def _remap_segments(segments: List[Dict], spans: List[tuple], sample_rate: int = SAMPLE_RATE):
+    """
+    Map segment times from concatenated speech spans back to the original audio
+
+    Args:
+        segments: Whisper segments timed against the concatenated spans
+        spans: (start_sample, end_sample) spans that were concatenated
+        sample_rate: Sample rate of audio
+    """
+    from bisect import bisect_right
+
+    # Position of each span in the concatenated audio, in seconds
+    compact_starts = []
+    position = 0
+    for start, end in spans:
+        compact_starts.append(position / sample_rate)
+        position += end - start
+
+    def to_original(t: float) -> float:
+        i = max(0, bisect_right(compact_starts, t) - 1)
+        span_start, span_end = spans[i]
+        return min(span_end, span_start + (t - compact_starts[i]) * sample_rate) / sample_rate
+
+    for seg in segments:
+        seg['start'] = to_original(seg['start'])
+        seg['end'] = to_original(seg['end'])
+        for word in seg.get('words') or []:
+            word['start'] = to_original(word['start'])
+            word['end'] = to_original(word['end'])
+
+
+def _load_model(model_size: str):
+    """Get a Whisper model (loaded once per process and kept in the pool)"""
+    try:
+        return get_model_registry().get(model_size)
+    except Exception as e:
+        raise TranscriptionError(f"Failed to load Whisper model: {e}")
+
+
+def _init_chunk_worker(model_size: str, torch_threads: int):
+    """Chunk worker initializer: limit torch threads and preload the model"""
+    _ensure_whisper_loaded()
+    import torch
+    torch.set_num_threads(torch_threads)
+    get_model_registry().get(model_size)
+
+
+def _transcribe_chunk(model_size: str, audio, options: Dict) -> Dict:
+    """Transcribe one audio chunk in a worker process"""
+    model = get_model_registry().get(model_size)
+    result = model.transcribe(audio, **options)
+    return {
+        'text': result.get('text', ''),
+        'segments': [
+            {'start': seg['start'], 'end': seg['end'], 'text': seg['text']}
+            for seg in result.get('segments', [])
+        ]
+    }
+
+
+def _detect_language(model_size: str, audio) -> str:
+    """Detect spoken language from the first 30 seconds of audio"""
+    model = get_model_registry().get(model_size)
+    mel = whisper.log_mel_spectrogram(
+        whisper.pad_or_trim(audio),
+        n_mels=model.dims.n_mels
+    ).to(model.device)
+    _, probs = model.detect_language(mel)
+    return max(probs, key=probs.get)
+
+
+def _transcribe_chunked(
+    audio,
+    model_size: str,
+    chunk_seconds: float,
+    workers: Optional[int],
+    transcribe_options: Dict
+) -> Dict:
+    """
+    Transcribe long audio as chunks across a process pool
+
+    Returns a result in the same shape as model.transcribe(): 'text',
+    'segments' (timestamps on the original timeline) and 'language'.
+    """
+    boundaries = find_chunk_boundaries(audio, chunk_seconds)
+    chunks = [
+        audio[start:end]
+        for start, end in zip(boundaries, boundaries[1:] + [len(audio)])
+    ]
+
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(workers or cpu_count, len(chunks)))
+
+    # Every worker loads its own model copy, so memory caps the pool too
+    memory_workers = max_model_processes(model_size)
+    if memory_workers and workers > memory_workers:
+        logger.info(f"Limiting to {memory_workers} worker(s): each loads its own '{model_size}' model")
+        workers = memory_workers
+    torch_threads = max(1, cpu_count // workers)
+
+    logger.info(
+        f"Transcribing {len(chunks)} chunk(s) of ~{chunk_seconds:.0f}s "
+        f"with {workers} worker(s) x {torch_threads} thread(s)"
+    )
+
+    options = dict(transcribe_options)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_chunk_worker,
+        initargs=(model_size, torch_threads)
+    ) as executor:
+        # Detect the language once so every chunk decodes consistently
+        if not options.get('language'):
+            options['language'] = executor.submit(
+                _detect_language, model_size, audio[:30 * SAMPLE_RATE]
+            ).result()
+            logger.info(f"Detected language: {options['language']}")
+
+        chunk_results = list(executor.map(
+            _transcribe_chunk,
+            [model_size] * len(chunks),
+            chunks,
+            [options] * len(chunks)
+        ))
+
+    # Merge with chunk offsets added back
+    segments = []
+    texts = []
+    for start, chunk_result in zip(boundaries, chunk_results):
+        offset = start / SAMPLE_RATE
+        texts.append(chunk_result['text'].strip())
+        for seg in chunk_result['segments']:
+            segments.append({
+                'start': seg['start'] + offset,
+                'end': seg['end'] + offset,
+                'text': seg['text']
+            })
+
+    return {
+        'text': ' '.join(text for text in texts if text),
+        'segments': segments,
+        'language': options['language']
+    }
+
+
 def format_timestamp(seconds: float) -> str:
     """
     Format seconds to HH:MM:SS timestamp
@@ -117,7 +567,11 @@ def transcribe_video(
     model_size: str = "base",
     language: Optional[str] = None,
     include_timestamps: bool = True,
-    output_dir: Optional[Path] = None
+    output_dir: Optional[Path] = None,
+    chunk_seconds: Optional[float] = None,
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+    vad: bool = False
 ) -> Dict:
     """
     Transcribe video file to text with metadata
@@ -128,6 +582,14 @@ def transcribe_video(
         language: Language code (e.g., 'pt', 'en') or None for auto-detection
         include_timestamps: Whether to include timestamps in segments
         output_dir: Output directory for transcription files (optional)
+        chunk_seconds: Split audio longer than 1.5x this into chunks at quiet
+            points and transcribe them in parallel (optional)
+        workers: Worker processes for chunked mode (default: CPU count,
+            capped by how many model copies fit in memory)
+        use_cache: Reuse results cached for the same audio, model and language
+            (see transcription_cache)
+        vad: Drop silent stretches with voice activity detection and
+            transcribe only speech (timestamps stay on the original timeline)
 
     Returns:
         Dictionary with transcription data:
@@ -138,6 +600,8 @@ def transcribe_video(
             'full_text': str,
             'segments': List[Dict],  # Only if include_timestamps
             'markdown_file': str,  # Path to saved markdown file (if output_dir provided)
+            'cached': bool,  # Whether the result came from the cache
+            'skipped_seconds': float,  # Non-speech audio not transcribed (if vad)
             'processing_time': float
         }
 
@@ -163,23 +627,30 @@ def transcribe_video(
     logger.info(f"Starting transcription for: {video_path.name}")
     logger.info(f"Model: {model_size}, Language: {language or 'auto'}")
 
-    # Load Whisper model
-    try:
-        logger.info(f"Loading Whisper model '{model_size}'...")
-        model = whisper.load_model(model_size)
-    except Exception as e:
-        raise TranscriptionError(f"Failed to load Whisper model: {e}")
-
-    # Handle video files - extract audio first
-    audio_path = video_path
-    temp_dir = None
-
-    try:
-        if suffix in VIDEO_FORMATS:
-            logger.info("Extracting audio from video...")
-            temp_dir = tempfile.mkdtemp()
-            audio_path = extract_audio_from_video(video_path, temp_dir)
-
+    cache = get_transcription_cache() if use_cache else None
+    cache_variant = "vad" if vad else ""
+    result = None
+
+    # Fast path: this exact file was transcribed before
+    if cache:
+        cache_key = cache.lookup_source(video_path, model_size, language, cache_variant)
+        if cache_key:
+            result = cache.get(cache_key)
+
+    if result is None:
+        # Decode audio straight into memory (no temporary WAV file)
+        logger.info("Decoding audio...")
+        audio = decode_audio_pcm(video_path)
+
+        # Same audio from another file (re-cut, re-muxed) is still a hit
+        if cache:
+            cache_key = cache.audio_key(audio, model_size, language, cache_variant)
+            result = cache.get(cache_key)
+
+    if result is not None:
+        logger.info("Using cached transcription")
+        cached = True
+    else:
         # Transcribe
         logger.info("Transcribing audio (this may take a while)...")
         transcribe_options = {
@@ -189,64 +660,82 @@ def transcribe_video(
         if language:
             transcribe_options["language"] = language
 
-        result = whisper.transcribe(str(audio_path), **transcribe_options)
-
-        # Detected language
-        detected_lang = result.get("language", "unknown")
-        logger.info(f"Detected language: {detected_lang}")
-
-        # Build response
-        response = {
-            'success': True,
-            'video_path': str(video_path),
-            'video_name': video_path.name,
-            'detected_language': detected_lang,
-            'full_text': result.get("text", "").strip(),
-            'model_used': model_size
-        }
-
-        # Add segments with timestamps if requested
-        if include_timestamps and result.get("segments"):
-            response['segments'] = [
-                {
-                    'start': seg['start'],
-                    'end': seg['end'],
-                    'start_formatted': format_timestamp(seg['start']),
-                    'end_formatted': format_timestamp(seg['end']),
-                    'text': seg['text'].strip()
-                }
-                for seg in result['segments']
-            ]
-
-        # Save to markdown file if output directory provided
-        if output_dir:
-            output_dir = Path(output_dir)
-            output_dir.mkdir(parents=True, exist_ok=True)
-
-            markdown_content = _generate_markdown(
-                video_name=video_path.name,
-                transcription_data=response,
-                include_timestamps=include_timestamps
-            )
+        speech_spans = None
+        if vad:
+            audio, speech_spans, skipped_seconds = _extract_speech(audio)
+
+        if not len(audio):
+            result = {"text": "", "segments": [], "language": language or "unknown"}
+        elif chunk_seconds and len(audio) > chunk_seconds * 1.5 * SAMPLE_RATE:
+            result = _transcribe_chunked(audio, model_size, chunk_seconds, workers, transcribe_options)
+        else:
+            result = _load_model(model_size).transcribe(audio, **transcribe_options)
+
+        if vad:
+            _remap_segments(result.get("segments", []), speech_spans)
+            result["skipped_seconds"] = round(skipped_seconds, 2)
+
+        if cache:
+            cache.put(cache_key, result)
+        cached = False
+
+    if cache:
+        cache.record_source(video_path, model_size, language, cache_key, cache_variant)
+
+    # Detected language
+    detected_lang = result.get("language", "unknown")
+    logger.info(f"Detected language: {detected_lang}")
+
+    # Build response
+    response = {
+        'success': True,
+        'video_path': str(video_path),
+        'video_name': video_path.name,
+        'detected_language': detected_lang,
+        'full_text': result.get("text", "").strip(),
+        'model_used': model_size,
+        'cached': cached
+    }
 
-            markdown_file = output_dir / f"{video_path.stem}_transcription.md"
-            markdown_file.write_text(markdown_content, encoding='utf-8')
+    if 'skipped_seconds' in result:
+        response['skipped_seconds'] = result['skipped_seconds']
+
+    # Add segments with timestamps if requested
+    if include_timestamps and result.get("segments"):
+        response['segments'] = [
+            {
+                'start': seg['start'],
+                'end': seg['end'],
+                'start_formatted': format_timestamp(seg['start']),
+                'end_formatted': format_timestamp(seg['end']),
+                'text': seg['text'].strip()
+            }
+            for seg in result['segments']
+        ]
+
+    # Save to markdown file if output directory provided
+    if output_dir:
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        markdown_content = _generate_markdown(
+            video_name=video_path.name,
+            transcription_data=response,
+            include_timestamps=include_timestamps
+        )
 
-            response['markdown_file'] = str(markdown_file)
-            logger.info(f"Transcription saved to: {markdown_file}")
+        markdown_file = output_dir / f"{video_path.stem}_transcription.md"
+        markdown_file.write_text(markdown_content, encoding='utf-8')
 
-        # Calculate processing time
-        end_time = datetime.now()
-        response['processing_time'] = (end_time - start_time).total_seconds()
+        response['markdown_file'] = str(markdown_file)
+        logger.info(f"Transcription saved to: {markdown_file}")
 
-        logger.info(f"Transcription complete in {response['processing_time']:.1f}s")
-        return response
+    # Calculate processing time
+    end_time = datetime.now()
+    response['processing_time'] = (end_time - start_time).total_seconds()
 
-    finally:
-        # Cleanup temp files
-        if temp_dir and os.path.exists(temp_dir):
-            import shutil
-            shutil.rmtree(temp_dir)
+    logger.info(f"Transcription complete in {response['processing_time']:.1f}s")
+    return response
 
 
 def transcribe_from_url(
@@ -257,7 +746,11 @@ def transcribe_from_url(
     model_size: str = "base",
     language: Optional[str] = None,
     include_timestamps: bool = True,
-    download_if_needed: bool = True
+    download_if_needed: bool = True,
+    chunk_seconds: Optional[float] = None,
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+    vad: bool = False
 ) -> Dict:
     """
     Transcribe video from URL (downloads if needed)
@@ -271,6 +764,10 @@ def transcribe_from_url(
         language: Language code or None for auto-detection
         include_timestamps: Whether to include timestamps
         download_if_needed: Download video if not already downloaded
+        chunk_seconds: Chunk length for parallel transcription (optional)
+        workers: Worker processes for chunked mode
+        use_cache: Reuse cached transcription results
+        vad: Transcribe only speech detected by voice activity detection
 
     Returns:
         Dictionary with transcription data (same as transcribe_video)
@@ -311,9 +808,204 @@ def transcribe_from_url(
         model_size=model_size,
         language=language,
         include_timestamps=include_timestamps,
-        output_dir=transcriptions_path
+        output_dir=transcriptions_path,
+        chunk_seconds=chunk_seconds,
+        workers=workers,
+        use_cache=use_cache,
+        vad=vad
+    )
+
+
+def transcribe_moments(
+    video_path: Path,
+    moments: List[Dict],
+    model_size: str = "base",
+    language: Optional[str] = None,
+    padding: float = 1.0,
+    output_dir: Optional[Path] = None,
+    video_id: Optional[str] = None
+) -> Dict:
+    """
+    Transcribe only the moment ranges of a video
+
+    Each moment is decoded as a window padded on both sides (so words at the
+    edges are heard in full) and transcribed with the same loaded model.
+    The language is detected on the first moment and reused for the rest.
+    Segment timestamps are relative to the moment start and clipped to it.
+
+    Args:
+        video_path: Path to video file
+        moments: Moments with start_time and duration (or end_time)
+        model_size: Whisper model size
+        language: Language code or None for auto-detection
+        padding: Seconds of context decoded before and after each moment
+        output_dir: Write per-clip VTT and Markdown files here (optional),
+            named {video_stem}_{index:04d}_{language}.vtt/.md
+        video_id: Video identifier for the Markdown header (optional)
+
+    Returns:
+        Dictionary with transcription data:
+        {
+            'success': bool,
+            'video_path': str,
+            'detected_language': str,
+            'model_used': str,
+            'clips': [
+                {
+                    'clip_id': int,
+                    'start_time': float,
+                    'end_time': float,
+                    'text': str,
+                    'segments': List[Dict],  # parse_vtt_subtitle() segment shape
+                    'vtt_file': str,  # if output_dir provided
+                    'markdown_file': str  # if output_dir provided
+                },
+                ...
+            ],
+            'audio_seconds': float,  # Audio actually transcribed
+            'processing_time': float
+        }
+
+    Raises:
+        TranscriptionError: If transcription fails
+        FileNotFoundError: If video file not found
+    """
+    start_time = datetime.now()
+
+    _ensure_whisper_loaded()
+
+    if not video_path.exists():
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+
+    model = _load_model(model_size)
+
+    transcribe_options = {"verbose": False}
+    if language:
+        transcribe_options["language"] = language
+
+    logger.info(f"Transcribing {len(moments)} moment(s) of {video_path.name} with model '{model_size}'")
+
+    clips = []
+    audio_seconds = 0.0
+
+    for i, moment in enumerate(moments):
+        clip_start = moment['start_time']
+        clip_end = moment.get('end_time', clip_start + moment.get('duration', 0))
+        clip_duration = clip_end - clip_start
+
+        window_start = max(0.0, clip_start - padding)
+        window_duration = clip_end + padding - window_start
+
+        audio = decode_audio_pcm(video_path, start=window_start, duration=window_duration)
+        audio_seconds += len(audio) / SAMPLE_RATE
+
+        result = model.transcribe(audio, **transcribe_options)
+
+        # Detect language once, then keep it for the remaining moments
+        if "language" not in transcribe_options and result.get("language"):
+            transcribe_options["language"] = result["language"]
+            logger.info(f"Detected language: {result['language']}")
+
+        # Shift from window time to clip time and drop the padding
+        segments = []
+        for seg in result.get("segments", []):
+            seg_start = seg['start'] + window_start - clip_start
+            seg_end = seg['end'] + window_start - clip_start
+            text = seg['text'].strip()
+            if seg_end <= 0 or seg_start >= clip_duration or not text:
+                continue
+
+            seg_start = max(0.0, seg_start)
+            seg_end = min(clip_duration, seg_end)
+            segments.append({
+                'index': len(segments),
+                'start': format_vtt_timestamp(seg_start),
+                'end': format_vtt_timestamp(seg_end),
+                'start_seconds': seg_start,
+                'end_seconds': seg_end,
+                'text': text
+            })
+
+        clip = {
+            'clip_id': i,
+            'start_time': clip_start,
+            'end_time': clip_end,
+            'text': ' '.join(seg['text'] for seg in segments),
+            'segments': segments
+        }
+
+        if output_dir:
+            output_dir = Path(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            lang = transcribe_options.get("language", "unknown")
+            stem = f"{video_path.stem}_{i:04d}_{lang}"
+            vtt_file, markdown_file = write_clip_transcript(
+                clip,
+                output_dir / f"{stem}.vtt",
+                output_dir / f"{stem}.md",
+                video_id=video_id
+            )
+            clip['vtt_file'] = str(vtt_file)
+            clip['markdown_file'] = str(markdown_file)
+
+        logger.info(f"Transcribed moment {i+1}/{len(moments)}: {len(segments)} segment(s)")
+        clips.append(clip)
+
+    processing_time = (datetime.now() - start_time).total_seconds()
+    logger.info(
+        f"Moment transcription complete: {audio_seconds:.1f}s of audio in {processing_time:.1f}s"
     )
 
+    return {
+        'success': True,
+        'video_path': str(video_path),
+        'detected_language': transcribe_options.get("language", "unknown"),
+        'model_used': model_size,
+        'clips': clips,
+        'audio_seconds': round(audio_seconds, 2),
+        'processing_time': processing_time
+    }
+
+
+def write_clip_transcript(
+    clip: Dict,
+    vtt_path: Path,
+    markdown_path: Optional[Path] = None,
+    video_id: Optional[str] = None
+) -> tuple:
+    """
+    Write a clip transcript from transcribe_moments() as VTT and Markdown
+
+    The VTT matches the clip subtitles cut from downloaded subtitles and the
+    Markdown matches SubtitleCleaner's LLM format, so metadata generation
+    consumes either source the same way.
+
+    Args:
+        clip: Clip entry from transcribe_moments()
+        vtt_path: Output VTT path
+        markdown_path: Output Markdown path (optional)
+        video_id: Video identifier for the Markdown header (optional)
+
+    Returns:
+        Tuple of (vtt_path, markdown_path or None)
+    """
+    from subtitle_clipper_service import generate_vtt_content
+    from subtitle_cleaner import SubtitleCleaner
+
+    vtt_path = Path(vtt_path)
+    vtt_path.write_text(generate_vtt_content(clip['segments']), encoding='utf-8')
+
+    if markdown_path:
+        markdown_path = Path(markdown_path)
+        content = SubtitleCleaner().create_llm_markdown(
+            text=clip['text'],
+            video_id=video_id,
+            duration=int(clip['end_time'] - clip['start_time'])
+        )
+        markdown_path.write_text(content, encoding='utf-8')
+
+    return vtt_path, markdown_path
+
 
 def _generate_markdown(
     video_name: str,
@@ -383,17 +1075,24 @@ def batch_transcribe_videos(
     output_dir: Path,
     model_size: str = "base",
     language: Optional[str] = None,
-    include_timestamps: bool = True
+    include_timestamps: bool = True,
+    use_cache: bool = True,
+    vad: bool = False
 ) -> Dict:
     """
     Transcribe multiple videos in batch
 
+    The Whisper model is loaded once and reused for every video, and videos
+    whose audio was already transcribed are served from the cache.
+
     Args:
         video_paths: List of video file paths
         output_dir: Directory to save transcriptions
         model_size: Whisper model size
         language: Language code or None for auto-detection
         include_timestamps: Whether to include timestamps
+        use_cache: Reuse cached transcription results
+        vad: Transcribe only speech detected by voice activity detection
 
     Returns:
         Dictionary with batch results:
@@ -401,6 +1100,7 @@ def batch_transcribe_videos(
             'total_videos': int,
             'successful': int,
             'failed': int,
+            'cached': int,  # Served from the transcription cache
             'results': List[Dict],  # Individual transcription results
             'total_time': float
         }
@@ -411,6 +1111,7 @@ def batch_transcribe_videos(
         'total_videos': len(video_paths),
         'successful': 0,
         'failed': 0,
+        'cached': 0,
         'results': [],
         'errors': []
     }
@@ -424,9 +1125,12 @@ def batch_transcribe_videos(
                 model_size=model_size,
                 language=language,
                 include_timestamps=include_timestamps,
-                output_dir=output_dir
+                output_dir=output_dir,
+                use_cache=use_cache,
+                vad=vad
             )
             results['successful'] += 1
+            results['cached'] += int(result.get('cached', False))
             results['results'].append(result)
 
         except Exception as e:
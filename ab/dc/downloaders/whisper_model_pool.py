@@ -0,0 +1,340 @@
+"""
+Whisper Model Pool
+Keeps loaded Whisper models in memory across transcriptions and runs
+long-lived transcription worker processes
+"""
+
+import os
+import gc
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Approximate resident memory (MB) of each model in fp32, used for the ceiling
+MODEL_MEMORY_MB = {
+    'tiny': 150,
+    'base': 300,
+    'small': 1000,
+    'medium': 3000,
+    'large': 6000,
+    'turbo': 3200,
+}
+DEFAULT_MODEL_MEMORY_MB = 1000
+
+
+def estimate_model_memory_mb(model_size: str) -> int:
+    """
+    Estimate memory needed by a Whisper model
+
+    Args:
+        model_size: Model name (e.g. 'base', 'small.en', 'large-v3')
+
+    Returns:
+        Approximate memory in MB
+    """
+    name = model_size.split('.')[0]
+    for prefix, memory_mb in MODEL_MEMORY_MB.items():
+        if name == prefix or name.startswith(f"{prefix}-"):
+            return memory_mb
+    return DEFAULT_MODEL_MEMORY_MB
+
+
+def available_memory_mb() -> Optional[int]:
+    """
+    Get memory available to new processes
+
+    Returns:
+        Available memory in MB, or None if it can't be determined
+    """
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def max_model_processes(model_size: str, max_memory_mb: Optional[int] = None) -> Optional[int]:
+    """
+    How many processes can each hold a copy of a model
+
+    Args:
+        model_size: Whisper model size
+        max_memory_mb: Memory budget in MB (default: WHISPER_MODEL_MEMORY_MB
+            if set, otherwise the memory currently available)
+
+    Returns:
+        Process count (at least 1), or None if memory is unknown
+    """
+    if max_memory_mb is None:
+        max_memory_mb = int(os.getenv('WHISPER_MODEL_MEMORY_MB', '0')) or available_memory_mb()
+    if not max_memory_mb:
+        return None
+    return max(1, max_memory_mb // estimate_model_memory_mb(model_size))
+
+
+def _load_whisper_model(model_size: str, device: Optional[str] = None):
+    """Load a Whisper model from disk"""
+    import whisper
+    return whisper.load_model(model_size, device=device)
+
+
+class WhisperModelRegistry:
+    """
+    Loads each Whisper model once and keeps an LRU of loaded models
+
+    When loading a model would exceed the memory ceiling, the least recently
+    used models are unloaded first. The most recently requested model is
+    always kept, even if it alone exceeds the ceiling.
+    """
+
+    def __init__(
+        self,
+        max_memory_mb: Optional[int] = None,
+        device: Optional[str] = None,
+        loader: Optional[Callable] = None
+    ):
+        """
+        Initialize model registry
+
+        Args:
+            max_memory_mb: Memory ceiling for loaded models in MB
+                (default: WHISPER_MODEL_MEMORY_MB env var, 0 = unlimited)
+            device: Torch device for models (default: Whisper's choice)
+            loader: Function (model_size, device) -> model (default: whisper.load_model)
+        """
+        if max_memory_mb is None:
+            max_memory_mb = int(os.getenv('WHISPER_MODEL_MEMORY_MB', '0'))
+
+        self.max_memory_mb = max_memory_mb
+        self.device = device
+        self._loader = loader or _load_whisper_model
+
+        self._models: 'OrderedDict[str, object]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, model_size: str):
+        """
+        Get a loaded model, loading it on first use
+
+        Args:
+            model_size: Whisper model size
+
+        Returns:
+            Loaded Whisper model
+        """
+        with self._lock:
+            model = self._models.get(model_size)
+            if model is not None:
+                self._models.move_to_end(model_size)
+                return model
+            load_lock = self._load_locks.setdefault(model_size, threading.Lock())
+
+        # Only one thread loads a given size; others wait for it
+        with load_lock:
+            with self._lock:
+                model = self._models.get(model_size)
+                if model is not None:
+                    self._models.move_to_end(model_size)
+                    return model
+                self._make_room(estimate_model_memory_mb(model_size))
+
+            logger.info(f"Loading Whisper model '{model_size}'...")
+            model = self._loader(model_size, self.device)
+
+            with self._lock:
+                self._models[model_size] = model
+                logger.info(
+                    f"Whisper model '{model_size}' loaded "
+                    f"({len(self._models)} cached, ~{self.memory_used_mb}MB)"
+                )
+            return model
+
+    def _make_room(self, needed_mb: int):
+        """Unload least recently used models until needed_mb fits (lock held)"""
+        if not self.max_memory_mb:
+            return
+
+        evicted = False
+        while self._models and self.memory_used_mb + needed_mb > self.max_memory_mb:
+            model_size, _ = self._models.popitem(last=False)
+            logger.info(f"Unloading Whisper model '{model_size}' to stay under {self.max_memory_mb}MB")
+            evicted = True
+
+        if evicted:
+            _release_memory()
+
+    @property
+    def memory_used_mb(self) -> int:
+        """Estimated memory of loaded models in MB"""
+        return sum(estimate_model_memory_mb(size) for size in self._models)
+
+    def loaded_models(self) -> List[str]:
+        """Loaded model sizes, least recently used first"""
+        with self._lock:
+            return list(self._models)
+
+    def unload(self, model_size: str) -> bool:
+        """
+        Unload a model
+
+        Args:
+            model_size: Whisper model size
+
+        Returns:
+            True if the model was loaded
+        """
+        with self._lock:
+            model = self._models.pop(model_size, None)
+        if model is None:
+            return False
+        del model
+        _release_memory()
+        return True
+
+    def clear(self):
+        """Unload all models"""
+        with self._lock:
+            self._models.clear()
+        _release_memory()
+
+
+def _release_memory():
+    """Free memory held by unloaded models"""
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+_registry: Optional[WhisperModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> WhisperModelRegistry:
+    """
+    Get the process-wide model registry
+
+    Returns:
+        Shared WhisperModelRegistry instance
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = WhisperModelRegistry()
+        return _registry
+
+
+def _init_worker(model_size: str, max_memory_mb: Optional[int]):
+    """Worker process initializer: preload the model once"""
+    global _registry
+    from video_transcriber import _ensure_whisper_loaded
+
+    _ensure_whisper_loaded()
+    _registry = WhisperModelRegistry(max_memory_mb=max_memory_mb)
+    _registry.get(model_size)
+
+
+def _run_job(video_path: str, options: Dict) -> Dict:
+    """Run one transcription job in a worker process"""
+    from video_transcriber import transcribe_video
+    return transcribe_video(Path(video_path), **options)
+
+
+class TranscriptionWorker:
+    """
+    Long-lived transcription process(es) with a preloaded Whisper model
+
+    Jobs are queued to the worker processes, which keep their model loaded
+    between jobs, so batches of short clips do not pay the model load time
+    per file.
+
+    Example:
+        with TranscriptionWorker(model_size='small') as worker:
+            futures = [worker.submit(path, output_dir=out) for path in clips]
+            results = [f.result() for f in futures]
+    """
+
+    def __init__(
+        self,
+        model_size: str = "base",
+        processes: int = 1,
+        max_memory_mb: Optional[int] = None
+    ):
+        """
+        Start worker processes
+
+        Args:
+            model_size: Whisper model preloaded in each process
+            processes: Number of worker processes
+            max_memory_mb: Per-process model memory ceiling in MB
+        """
+        if processes < 1:
+            raise ValueError(f"processes must be >= 1, got: {processes}")
+
+        self.model_size = model_size
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_init_worker,
+            initargs=(model_size, max_memory_mb)
+        )
+
+        logger.info(f"Started {processes} transcription worker(s) with model '{model_size}'")
+
+    def submit(self, video_path: Path, **options) -> Future:
+        """
+        Queue a transcription job
+
+        Args:
+            video_path: Path to video or audio file
+            **options: Keyword arguments for transcribe_video
+                (model_size defaults to the worker's model)
+
+        Returns:
+            Future resolving to the transcribe_video result
+        """
+        options.setdefault('model_size', self.model_size)
+        return self._executor.submit(_run_job, str(video_path), options)
+
+    def transcribe(self, video_path: Path, **options) -> Dict:
+        """
+        Transcribe a file and wait for the result
+
+        Args:
+            video_path: Path to video or audio file
+            **options: Keyword arguments for transcribe_video
+
+        Returns:
+            transcribe_video result
+        """
+        return self.submit(video_path, **options).result()
+
+    def close(self, wait: bool = True):
+        """
+        Stop worker processes
+
+        Args:
+            wait: Wait for queued jobs to finish
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self) -> 'TranscriptionWorker':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,260 @@
+"""
+Pipeline State Manifest
+Tracks completed pipeline steps and clip artefacts so interrupted runs can resume
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+STATE_FILENAME = "pipeline_state.json"
+STATE_VERSION = 1
+
+# Bytes hashed from the head and tail of each artefact for its fingerprint
+FINGERPRINT_SAMPLE_BYTES = 64 * 1024
+
+
+def fingerprint_file(path: Path) -> Optional[Dict]:
+    """
+    Build a cheap fingerprint for a file
+
+    Hashes the file size plus its first and last 64KB, which detects
+    truncated, replaced or re-encoded artefacts without reading whole videos.
+
+    Args:
+        path: Path to file
+
+    Returns:
+        Dictionary with size, mtime_ns and sample hash, or None if missing
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    if not path.is_file():
+        return None
+
+    digest = hashlib.sha256()
+    digest.update(str(stat.st_size).encode())
+
+    with open(path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+        if stat.st_size > FINGERPRINT_SAMPLE_BYTES * 2:
+            f.seek(-FINGERPRINT_SAMPLE_BYTES, os.SEEK_END)
+            digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': digest.hexdigest()
+    }
+
+
+def _hash_inputs(inputs: Dict) -> str:
+    """Hash step inputs to a stable key"""
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def write_json_atomic(path: Path, data: Dict):
+    """
+    Write JSON to a file atomically (temp file + rename)
+
+    Args:
+        path: Destination path
+        data: JSON-serializable data
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class PipelineState:
+    """
+    Persistent manifest of pipeline progress for one video directory
+
+    Each step (and each clip within a step) is recorded with a hash of its
+    inputs, the fingerprints of its output files and its result. A recorded
+    entry is reused only when the inputs are unchanged and every output still
+    matches its fingerprint.
+    """
+
+    def __init__(self, video_dir: Path):
+        """
+        Load (or create) the manifest for a video directory
+
+        Args:
+            video_dir: Video output directory
+        """
+        self.video_dir = Path(video_dir)
+        self.path = self.video_dir / STATE_FILENAME
+        self.data = self._load()
+
+    def _load(self) -> Dict:
+        """Load manifest from disk, starting fresh if missing or unreadable"""
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == STATE_VERSION:
+                    return data
+                logger.warning(f"Ignoring pipeline state with unknown version: {self.path}")
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable pipeline state {self.path}: {e}")
+
+        return {
+            'version': STATE_VERSION,
+            'created_at': datetime.now().isoformat(),
+            'steps': {}
+        }
+
+    def save(self):
+        """Persist manifest atomically"""
+        self.data['updated_at'] = datetime.now().isoformat()
+        write_json_atomic(self.path, self.data)
+
+    def reset(self):
+        """Discard all recorded progress"""
+        self.data['steps'] = {}
+        self.save()
+
+    # Step-level records
+
+    def get_step(self, step: str, inputs: Dict) -> Optional[Dict]:
+        """
+        Get the recorded result of a completed step
+
+        Args:
+            step: Step name
+            inputs: Step inputs (must match the recorded inputs)
+
+        Returns:
+            Recorded result or None if the step must run again
+        """
+        entry = self.data['steps'].get(step)
+        if not entry or entry.get('status') != 'completed':
+            return None
+
+        return self._validate_entry(step, entry, inputs)
+
+    def record_step(
+        self,
+        step: str,
+        inputs: Dict,
+        outputs: List[Path],
+        result: Dict
+    ):
+        """
+        Record a completed step and save the manifest
+
+        Args:
+            step: Step name
+            inputs: Step inputs
+            outputs: Output files produced by the step
+            result: JSON-serializable step result
+        """
+        entry = self.data['steps'].setdefault(step, {})
+        entry.update(self._build_entry(inputs, outputs, result))
+        entry['status'] = 'completed'
+        self.save()
+
+    # Item-level records (clips within a step)
+
+    def get_item(self, step: str, item: str, inputs: Dict) -> Optional[Dict]:
+        """
+        Get the recorded result of a completed item within a step
+
+        Args:
+            step: Step name
+            item: Item key (e.g. clip name)
+            inputs: Item inputs (must match the recorded inputs)
+
+        Returns:
+            Recorded result or None if the item must run again
+        """
+        entry = self.data['steps'].get(step, {}).get('items', {}).get(item)
+        if not entry:
+            return None
+
+        return self._validate_entry(f"{step}/{item}", entry, inputs)
+
+    def record_item(
+        self,
+        step: str,
+        item: str,
+        inputs: Dict,
+        outputs: List[Path],
+        result: Dict
+    ):
+        """
+        Record a completed item within a step and save the manifest
+
+        Args:
+            step: Step name
+            item: Item key (e.g. clip name)
+            inputs: Item inputs
+            outputs: Output files produced for the item
+            result: JSON-serializable item result
+        """
+        entry = self.data['steps'].setdefault(step, {'status': 'in_progress'})
+        entry.setdefault('items', {})[item] = self._build_entry(inputs, outputs, result)
+        self.save()
+
+    def _build_entry(self, inputs: Dict, outputs: List[Path], result: Dict) -> Dict:
+        """Build a manifest entry with output fingerprints"""
+        fingerprints = {}
+        for output in outputs:
+            fp = fingerprint_file(Path(output))
+            if fp is None:
+                raise FileNotFoundError(f"Pipeline output not found: {output}")
+            fingerprints[str(output)] = fp
+
+        return {
+            'inputs': inputs,
+            'inputs_hash': _hash_inputs(inputs),
+            'outputs': fingerprints,
+            'result': result,
+            'completed_at': datetime.now().isoformat()
+        }
+
+    def _validate_entry(self, name: str, entry: Dict, inputs: Dict) -> Optional[Dict]:
+        """Return the entry result if its inputs and outputs are still valid"""
+        if entry.get('inputs_hash') != _hash_inputs(inputs):
+            logger.info(f"Inputs changed for '{name}', re-running")
+            return None
+
+        for output, recorded in entry.get('outputs', {}).items():
+            try:
+                stat = Path(output).stat()
+            except OSError:
+                logger.info(f"Output missing for '{name}': {output}, re-running")
+                return None
+
+            # Fast path: unchanged size and mtime, no need to hash
+            if stat.st_size == recorded['size'] and stat.st_mtime_ns == recorded['mtime_ns']:
+                continue
+
+            current = fingerprint_file(Path(output))
+            if current is None or current['sha256'] != recorded['sha256']:
+                logger.info(f"Output changed for '{name}': {output}, re-running")
+                return None
+
+        return entry.get('result')
@@ -6,10 +6,10 @@ Automated video publishing using metadata and thumbnails from AI agents
 import os
 import json
 import logging
-import subprocess
 import sys
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
 # Load environment variables from .env file
@@ -29,13 +29,22 @@ except ImportError:
 try:
     from .youtube_publisher import YouTubePublisher
     from .base_publisher import VideoMetadata, UploadResult
+    from .upload_scheduler import UploadScheduler, PublishJob, clip_score
 except ImportError:
     from youtube_publisher import YouTubePublisher
     from base_publisher import VideoMetadata, UploadResult
+    from upload_scheduler import UploadScheduler, PublishJob, clip_score
 
 logger = logging.getLogger(__name__)
 
 
+def _add_downloaders_path():
+    """Make the flat-import downloader services (ffmpeg_runner, media_probe) importable"""
+    downloaders_dir = str(Path(__file__).parent.parent / 'downloaders')
+    if downloaders_dir not in sys.path:
+        sys.path.insert(0, downloaders_dir)
+
+
 class AutoPublisher:
     """
     Automated video publisher that uses AI-generated metadata and thumbnails
@@ -46,7 +55,9 @@ class AutoPublisher:
         platform: str = "youtube",
         dry_run: bool = False,
         config: Optional[Dict] = None,
-        scan_only: bool = False
+        scan_only: bool = False,
+        max_concurrent_uploads: Optional[int] = None,
+        wait_for_quota: bool = False
     ):
         """
         Initialize auto publisher
@@ -56,10 +67,20 @@ class AutoPublisher:
             dry_run: If True, don't actually publish, just validate
             config: Optional platform configuration (if None, loads from environment)
             scan_only: If True, skip publisher initialization (for scanning only)
+            max_concurrent_uploads: Parallel uploads in batches
+                (default: MAX_CONCURRENT_UPLOADS or 2)
+            wait_for_quota: When the daily quota runs out, wait for the reset
+                instead of deferring the remaining videos
         """
         self.platform = platform
         self.dry_run = dry_run
         self.publisher = None
+        self.max_concurrent_uploads = max_concurrent_uploads or int(os.getenv('MAX_CONCURRENT_UPLOADS', '2'))
+        self.wait_for_quota = wait_for_quota
+
+        # Bounds uploads across concurrent publish_queue calls (e.g. one per
+        # video in a batch), not just within one
+        self._upload_slots = threading.BoundedSemaphore(self.max_concurrent_uploads)
 
         # Skip publisher initialization if scan_only mode
         if scan_only:
@@ -90,6 +111,8 @@ class AutoPublisher:
             YOUTUBE_CLIENT_SECRET: OAuth client secret
             YOUTUBE_REDIRECT_URI: OAuth redirect URI (default: http://localhost:8080)
             YOUTUBE_TOKEN_FILE: Path to token storage file (default: .youtube_tokens.json)
+            YOUTUBE_UPLOAD_SESSIONS_FILE: Path to resumable upload sessions
+                (default: .youtube_upload_sessions.json)
         """
         # Get credentials from environment
         client_id = os.getenv('YOUTUBE_CLIENT_ID')
@@ -106,8 +129,10 @@ class AutoPublisher:
             'client_secret': client_secret,
             'redirect_uri': os.getenv('YOUTUBE_REDIRECT_URI', 'http://localhost:8080'),
             'token_file': Path(os.getenv('YOUTUBE_TOKEN_FILE', '.youtube_tokens.json')),
+            'upload_sessions_file': Path(os.getenv('YOUTUBE_UPLOAD_SESSIONS_FILE', '.youtube_upload_sessions.json')),
             'max_retries': 3,
-            'chunk_size': 10 * 1024 * 1024  # 10MB chunks
+            'chunk_size': 10 * 1024 * 1024,  # First chunk; later ones follow measured throughput
+            'adaptive_chunk_size': os.getenv('YOUTUBE_ADAPTIVE_CHUNK_SIZE', 'true').lower() == 'true'
         }
 
         logger.debug("Built YouTube configuration from environment")
@@ -348,6 +373,9 @@ class AutoPublisher:
         Returns:
             Path to transcoded video or None if failed
         """
+        _add_downloaders_path()
+        from ffmpeg_runner import run_ffmpeg
+
         # Create output path
         output_path = video_path.parent / f"{video_path.stem}_transcoded{video_path.suffix}"
 
@@ -371,18 +399,13 @@ class AutoPublisher:
             ]
 
             # Run ffmpeg
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            result = run_ffmpeg(cmd, check=False, label=output_path.name)
 
             if result.returncode != 0:
                 logger.error(f"Transcoding failed: {result.stderr}")
                 return None
 
-            logger.info(f"Transcoding successful!")
+            logger.info(f"Transcoding successful! ({result.stats.wall_seconds:.1f}s, {result.stats.speed:.2f}x)")
             logger.info(f"Original size: {video_path.stat().st_size / 1024 / 1024:.2f} MB")
             logger.info(f"Transcoded size: {output_path.stat().st_size / 1024 / 1024:.2f} MB")
 
@@ -396,7 +419,8 @@ class AutoPublisher:
         self,
         video_info: Dict,
         thumbnail_index: int = 0,
-        privacy_status: Optional[str] = None
+        privacy_status: Optional[str] = None,
+        quota_reserved: bool = False
     ) -> Optional[UploadResult]:
         """
         Publish a single video with metadata and thumbnail
@@ -405,6 +429,7 @@ class AutoPublisher:
             video_info: Video information dictionary from find_publishable_videos
             thumbnail_index: Which thumbnail to use (0-based)
             privacy_status: Override privacy status
+            quota_reserved: Upload quota was already reserved (see publish_queue)
 
         Returns:
             UploadResult or None if failed
@@ -481,6 +506,8 @@ class AutoPublisher:
             if needs_transcoding:
                 transcoded_file = self._transcode_video(video_file)
                 if not transcoded_file:
+                    if quota_reserved:
+                        self.publisher.rate_limiter.release('video_upload')
                     return UploadResult(
                         success=False,
                         error="Video transcoding failed",
@@ -492,7 +519,8 @@ class AutoPublisher:
             # Upload the video
             result = self.publisher.upload_video(
                 video_path=video_to_upload,
-                metadata=video_metadata
+                metadata=video_metadata,
+                quota_reserved=quota_reserved
             )
 
             if not result.success:
@@ -579,22 +607,23 @@ class AutoPublisher:
             publishable = publishable[:max_videos]
             logger.info(f"Publishing first {max_videos} video(s)")
 
-        # Publish each video
-        results = []
-        for i, video_info in enumerate(publishable, 1):
-            logger.info(f"\n--- Video {i}/{len(publishable)} ---")
-
-            result = self.publish_video(
-                video_info=video_info,
-                thumbnail_index=thumbnail_index,
-                privacy_status=privacy_status
-            )
+        # Probe all videos up front (concurrently); validation then reads
+        # the cached results instead of spawning ffprobe per check
+        _add_downloaders_path()
+        from media_probe import get_media_probe
+        get_media_probe().probe_many([v['video_file'] for v in publishable])
 
-            results.append(result)
+        # Publish concurrently, best-scoring clips first
+        jobs = [
+            PublishJob(key=str(v['video_file']), video_info=v, score=clip_score(v['video_file']))
+            for v in publishable
+        ]
+        results = self.publish_queue(jobs, thumbnail_index=thumbnail_index, privacy_status=privacy_status)
 
         # Summary
         successful = sum(1 for r in results if r.success)
-        failed = len(results) - successful
+        deferred = sum(1 for r in results if r.status == "deferred")
+        failed = len(results) - successful - deferred
 
         logger.info(f"\n{'='*60}")
         logger.info(f"BATCH PUBLISHING COMPLETE")
@@ -602,10 +631,66 @@ class AutoPublisher:
         logger.info(f"Total: {len(results)}")
         logger.info(f"Successful: {successful}")
         logger.info(f"Failed: {failed}")
+        if deferred:
+            logger.info(f"Deferred to next quota reset: {deferred}")
         logger.info(f"{'='*60}")
 
         return results
 
+    def publish_queue(
+        self,
+        jobs: List[PublishJob],
+        thumbnail_index: int = 0,
+        privacy_status: Optional[str] = None,
+        on_result: Optional[Callable[[PublishJob, UploadResult], None]] = None
+    ) -> List[UploadResult]:
+        """
+        Publish videos concurrently, highest score first
+
+        Up to max_concurrent_uploads videos upload at once, counting uploads
+        from other publish_queue calls running on this publisher at the same
+        time. Each one reserves its quota (shared across the process) before
+        it starts; videos that don't fit in
+        today's quota come back with status 'deferred' (or wait for the
+        reset, with wait_for_quota).
+
+        Args:
+            jobs: Videos to publish
+            thumbnail_index: Which thumbnail to use
+            privacy_status: Privacy status for all videos
+            on_result: Called with each finished job and its result
+
+        Returns:
+            List of UploadResults in the order of jobs
+        """
+        if not jobs:
+            return []
+
+        # Authenticate once, before uploads run in parallel
+        if not self.dry_run and not self.publisher._authenticated:
+            logger.info("Authenticating with YouTube...")
+            if not self.publisher.authenticate():
+                return [UploadResult(success=False, error="Authentication failed", status="failed") for _ in jobs]
+
+        scheduler = UploadScheduler(
+            rate_limiter=None if self.dry_run else self.publisher.rate_limiter,
+            max_concurrent=self.max_concurrent_uploads,
+            wait_for_quota=self.wait_for_quota,
+            slots=self._upload_slots
+        )
+        logger.info(f"Publishing {len(jobs)} video(s), {scheduler.max_concurrent} at a time")
+
+        return scheduler.run(
+            jobs,
+            lambda job: self.publish_video(
+                video_info=job.video_info,
+                thumbnail_index=thumbnail_index,
+                privacy_status=privacy_status,
+                quota_reserved=not self.dry_run
+            ),
+            on_result=on_result
+        )
+
 
 def main():
     """Example usage"""
@@ -144,7 +144,9 @@ def batch_command(args):
 
     publisher = AutoPublisher(
         platform=args.platform,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        max_concurrent_uploads=args.concurrency,
+        wait_for_quota=args.wait_for_quota
     )
 
     results = publisher.publish_batch(
@@ -166,6 +168,9 @@ def batch_command(args):
     print(f"{'='*70}")
 
     for i, result in enumerate(results, 1):
+        if result.status == "deferred":
+            print(f"{i}. … Deferred until {result.metadata['scheduled_for']}")
+            continue
         status = "✓" if result.success else "✗"
         print(f"{i}. {status} Video ID: {result.video_id or 'Failed'}")
         if result.video_url:
@@ -327,6 +332,16 @@ Workflow:
         type=int,
         help='Maximum number of videos to publish'
     )
+    batch_parser.add_argument(
+        '--concurrency',
+        type=int,
+        help='Parallel uploads (default: MAX_CONCURRENT_UPLOADS or 2)'
+    )
+    batch_parser.add_argument(
+        '--wait-for-quota',
+        action='store_true',
+        help='Wait for the daily quota reset instead of deferring the remaining videos'
+    )
     batch_parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -46,6 +46,8 @@ def publish_to_youtube(args):
         'ffprobe_path': config.ffprobe_path,
         'max_retries': config.max_retries,
         'chunk_size': config.upload_chunk_size,
+        'adaptive_chunk_size': config.adaptive_chunk_size,
+        'upload_sessions_file': config.upload_sessions_path,
     })
 
     # Authenticate
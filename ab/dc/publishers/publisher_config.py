@@ -44,7 +44,8 @@ class PublisherConfig:
 
         # General Publisher Settings
         self.default_platform = os.getenv('DEFAULT_PLATFORM', 'youtube')
-        self.upload_chunk_size = int(os.getenv('UPLOAD_CHUNK_SIZE', str(10 * 1024 * 1024)))  # 10MB
+        self.upload_chunk_size = int(os.getenv('UPLOAD_CHUNK_SIZE', str(10 * 1024 * 1024)))  # 10MB (initial)
+        self.adaptive_chunk_size = self._str_to_bool(os.getenv('ADAPTIVE_CHUNK_SIZE', 'true'))
         self.max_retries = int(os.getenv('MAX_RETRIES', '3'))
         self.retry_delay = int(os.getenv('RETRY_DELAY', '5'))
         self.enable_auto_retry = self._str_to_bool(os.getenv('ENABLE_AUTO_RETRY', 'true'))
@@ -57,6 +58,12 @@ class PublisherConfig:
             str(Path.home() / '.ab_publisher_tokens.json')
         ))
 
+        # Resumable upload sessions (resume interrupted uploads after restarts)
+        self.upload_sessions_path = Path(os.getenv(
+            'UPLOAD_SESSIONS_PATH',
+            str(Path.home() / '.ab_publisher_upload_sessions.json')
+        ))
+
         # Video processing paths
         self.processed_videos_path = Path(os.getenv('STORED_PROCESSED_VIDEOS', 'processed_videos/'))
         self.thumbnails_path = Path(os.getenv('THUMBNAILS_PATH', 'thumbnails/'))
@@ -0,0 +1,175 @@
+"""
+Upload Scheduler
+Publishes videos concurrently, best clips first, within the platform quota
+"""
+
+import re
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    from .base_publisher import UploadResult
+except ImportError:
+    from base_publisher import UploadResult
+
+logger = logging.getLogger(__name__)
+
+# Clip files carry their engagement score: VIDEO_ID_0000_40s_score_095_original.mp4
+SCORE_PATTERN = re.compile(r'_score_(\d+)')
+
+
+def clip_score(video_file: Path) -> float:
+    """
+    Read the engagement score encoded in a clip filename
+
+    The filename scale differs between producers, so the value is only
+    meant for ordering clips against each other.
+
+    Args:
+        video_file: Clip file
+
+    Returns:
+        Score, or 0.0 if the filename has none
+    """
+    match = SCORE_PATTERN.search(Path(video_file).stem)
+    return float(match.group(1)) if match else 0.0
+
+
+@dataclass
+class PublishJob:
+    """A video waiting to be published"""
+    key: str
+    video_info: Dict
+    score: float = 0.0
+
+
+class UploadScheduler:
+    """
+    Runs uploads in parallel, highest score first
+
+    Every upload reserves its quota through the rate limiter before it
+    starts (publishers return it when they resume a stored session). When the daily quota runs out, the remaining jobs are deferred
+    to the next quota reset: they are returned with status 'deferred' and
+    the reset time in metadata['scheduled_for'], or, with wait_for_quota,
+    the scheduler sleeps until the reset and carries on.
+    """
+
+    def __init__(
+        self,
+        rate_limiter=None,
+        max_concurrent: int = 2,
+        operation: str = 'video_upload',
+        wait_for_quota: bool = False,
+        slots: Optional[threading.Semaphore] = None
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            rate_limiter: Limiter with reserve(operation) (e.g. YouTubeRateLimiter);
+                None admits every job
+            max_concurrent: Maximum parallel uploads
+            operation: Operation reserved for each job
+            wait_for_quota: Sleep until the quota resets instead of deferring
+            slots: Semaphore shared by schedulers running at the same time
+                (e.g. one per video), bounding their uploads together
+        """
+        self.rate_limiter = rate_limiter
+        self.max_concurrent = max(1, max_concurrent)
+        self.operation = operation
+        self.wait_for_quota = wait_for_quota
+        self.slots = slots
+
+    def run(
+        self,
+        jobs: List[PublishJob],
+        publish_fn: Callable[[PublishJob], UploadResult],
+        on_result: Optional[Callable[[PublishJob, UploadResult], None]] = None
+    ) -> List[UploadResult]:
+        """
+        Publish jobs
+
+        Args:
+            jobs: Jobs to publish
+            publish_fn: Publishes one job whose quota is already reserved
+            on_result: Called with each finished job and its result (from
+                the calling thread, so it needs no locking)
+
+        Returns:
+            UploadResults in the order of jobs
+        """
+        results: Dict[int, UploadResult] = {}
+        queue = deque(sorted(range(len(jobs)), key=lambda i: -jobs[i].score))
+        running = {}
+
+        def finish(index: int, result: UploadResult):
+            results[index] = result
+            if on_result:
+                on_result(jobs[index], result)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix='upload') as pool:
+            while queue or running:
+                while queue and len(running) < self.max_concurrent:
+                    if self.slots is not None:
+                        self.slots.acquire()
+
+                    retry_at = self._reserve()
+                    if retry_at is None:
+                        index = queue.popleft()
+                        future = pool.submit(publish_fn, jobs[index])
+                        if self.slots is not None:
+                            future.add_done_callback(lambda _: self.slots.release())
+                        running[future] = index
+                        continue
+
+                    if self.slots is not None:
+                        self.slots.release()
+
+                    if not self.wait_for_quota:
+                        logger.warning(f"Upload quota exhausted, deferring {len(queue)} upload(s) until {retry_at}")
+                        while queue:
+                            finish(queue.popleft(), self._deferred_result(retry_at))
+                    elif not running:
+                        wait_seconds = max(0.0, (retry_at - datetime.now()).total_seconds())
+                        logger.info(f"Upload quota exhausted, waiting {wait_seconds / 3600:.1f}h until {retry_at}")
+                        time.sleep(wait_seconds + 1)
+                        continue
+                    break
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Upload of {jobs[index].key} failed: {e}")
+                        result = UploadResult(success=False, error=str(e), status="failed")
+                    finish(index, result)
+
+        return [results[i] for i in range(len(jobs))]
+
+    def _reserve(self) -> Optional[datetime]:
+        """Reserve quota for one job; returns the retry time if exhausted"""
+        if self.rate_limiter is None:
+            return None
+        return self.rate_limiter.reserve(self.operation)
+
+    @staticmethod
+    def _deferred_result(retry_at: datetime) -> UploadResult:
+        """Result for a job rescheduled to the next quota reset"""
+        return UploadResult(
+            success=False,
+            status="deferred",
+            error=f"Quota exhausted, rescheduled for {retry_at.isoformat()}",
+            metadata={'scheduled_for': retry_at.isoformat()}
+        )
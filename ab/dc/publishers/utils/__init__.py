@@ -4,10 +4,14 @@ from .video_validator import VideoValidator
 from .retry_handler import RetryHandler
 from .rate_limiter import RateLimiter
 from .metadata_builder import MetadataBuilder
+from .upload_session_store import UploadSessionStore
+from .chunk_sizer import AdaptiveChunkSizer
 
 __all__ = [
     'VideoValidator',
     'RetryHandler',
     'RateLimiter',
-    'MetadataBuilder'
+    'MetadataBuilder',
+    'UploadSessionStore',
+    'AdaptiveChunkSizer'
 ]
@@ -0,0 +1,157 @@
+"""
+Chunk Sizer Utility
+Adapts resumable upload chunk sizes to the measured link throughput
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Resumable upload chunks must be multiples of 256 KiB (except the last)
+CHUNK_QUANTUM = 256 * 1024
+
+
+def round_chunk_size(size: float) -> int:
+    """
+    Round a chunk size down to a multiple of 256 KiB (at least 256 KiB)
+
+    Args:
+        size: Desired size in bytes
+
+    Returns:
+        Valid chunk size in bytes
+    """
+    return max(CHUNK_QUANTUM, int(size) // CHUNK_QUANTUM * CHUNK_QUANTUM)
+
+
+class AdaptiveChunkSizer:
+    """
+    Picks the size of each upload chunk from measured throughput
+
+    Each chunk should take about target_seconds: long enough that per
+    request latency is negligible, short enough that a failed chunk loses
+    little. Chunks grow (at most doubling) while the link is fast and
+    stable, shrink towards the target when chunks run long, and halve on
+    errors or timeouts.
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 10 * 1024 * 1024,
+        min_size: int = CHUNK_QUANTUM,
+        max_size: int = 256 * 1024 * 1024,
+        target_seconds: float = 8.0,
+        stable_chunks: int = 2,
+        adaptive: bool = True
+    ):
+        """
+        Initialize sizer
+
+        Args:
+            initial_size: First chunk size in bytes
+            min_size: Smallest chunk size
+            max_size: Largest chunk size
+            target_seconds: Desired duration of one chunk request
+            stable_chunks: Consecutive successes required before growing
+            adaptive: If False, always use initial_size (stats are still kept)
+        """
+        self.min_size = round_chunk_size(min_size)
+        self.max_size = max(self.min_size, round_chunk_size(max_size))
+        self.size = min(self.max_size, max(self.min_size, round_chunk_size(initial_size)))
+        self.target_seconds = target_seconds
+        self.stable_chunks = stable_chunks
+        self.adaptive = adaptive
+
+        self._throughput: Optional[float] = None  # bytes/second, moving average
+        self._successes = 0
+        self._durations: List[float] = []
+        self.bytes_sent = 0
+        self.seconds = 0.0
+        self.errors = 0
+        self.timeouts = 0
+        self.peak_throughput = 0.0
+
+    def next_size(self) -> int:
+        """
+        Get the size for the next chunk
+
+        Returns:
+            Chunk size in bytes (multiple of 256 KiB)
+        """
+        return self.size
+
+    def record_success(self, size: int, seconds: float):
+        """
+        Record a committed chunk and adapt the size
+
+        Args:
+            size: Bytes committed by the request
+            seconds: Request duration
+        """
+        if size <= 0 or seconds <= 0:
+            return
+
+        throughput = size / seconds
+        self._throughput = throughput if self._throughput is None else 0.5 * throughput + 0.5 * self._throughput
+        self.peak_throughput = max(self.peak_throughput, throughput)
+        self.bytes_sent += size
+        self.seconds += seconds
+        self._durations.append(seconds)
+        self._successes += 1
+
+        if not self.adaptive:
+            return
+
+        desired = self._throughput * self.target_seconds
+        if seconds > 2 * self.target_seconds:
+            # Chunks run long: shrink towards the target at once
+            self._resize(desired, "slow chunk")
+        elif self._successes >= self.stable_chunks and desired > self.size:
+            self._resize(min(desired, self.size * 2), "fast, stable link")
+
+    def record_failure(self, timeout: bool = False):
+        """
+        Record a failed chunk and shrink the size
+
+        Args:
+            timeout: Whether the request timed out
+        """
+        self.errors += 1
+        if timeout:
+            self.timeouts += 1
+        self._successes = 0
+
+        if self.adaptive:
+            self._resize(self.size / 2, "timeout" if timeout else "error")
+
+    def _resize(self, size: float, reason: str):
+        """Apply a new chunk size within bounds"""
+        size = min(self.max_size, max(self.min_size, round_chunk_size(size)))
+        if size != self.size:
+            logger.debug(f"Upload chunk size {self.size / 1024 / 1024:.2f}MB -> {size / 1024 / 1024:.2f}MB ({reason})")
+            self.size = size
+            self._successes = 0
+
+    def stats(self) -> Dict:
+        """
+        Summarize the upload for capacity planning
+
+        Returns:
+            Dictionary with bytes, seconds, average and peak throughput
+            (Mbit/s), chunk count, mean chunk latency, errors, timeouts and
+            final chunk size
+        """
+        chunks = len(self._durations)
+        return {
+            'bytes': self.bytes_sent,
+            'seconds': round(self.seconds, 3),
+            'throughput_mbps': round(self.bytes_sent * 8 / self.seconds / 1e6, 2) if self.seconds else 0.0,
+            'peak_throughput_mbps': round(self.peak_throughput * 8 / 1e6, 2),
+            'chunks': chunks,
+            'mean_chunk_seconds': round(self.seconds / chunks, 3) if chunks else 0.0,
+            'max_chunk_seconds': round(max(self._durations), 3) if chunks else 0.0,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'final_chunk_size': self.size
+        }
@@ -157,6 +157,21 @@ class QuotaTracker:
             )
             return True
 
+    def release(self, resource: str, cost: int = 1):
+        """
+        Return quota reserved for an operation that never ran
+
+        Args:
+            resource: Resource identifier
+            cost: Quota cost to return
+        """
+        with self.lock:
+            if resource not in self.quotas:
+                return
+
+            quota = self.quotas[resource]
+            quota['used'] = max(0, quota['used'] - cost)
+
     def get_remaining(self, resource: str) -> int:
         """Get remaining quota for resource"""
         with self.lock:
@@ -337,11 +352,61 @@ class YouTubeRateLimiter:
         # Then check rate limit
         return self.rate_limiter.acquire(tokens=1, blocking=blocking)
 
+    def reserve(self, operation: str) -> Optional[datetime]:
+        """
+        Reserve quota for an operation before it starts
+
+        Waits out the request rate limit, but never the daily quota.
+
+        Args:
+            operation: Operation type (e.g., 'video_upload')
+
+        Returns:
+            None if reserved, otherwise the quota reset time to retry at
+        """
+        cost = self.QUOTA_COSTS.get(operation, 1)
+
+        if not self.quota_tracker.consume('youtube', cost):
+            return self.quota_tracker.get_reset_time('youtube')
+
+        self.rate_limiter.acquire(tokens=1, blocking=True)
+        return None
+
+    def release(self, operation: str):
+        """
+        Return quota reserved for an operation that never ran
+
+        Args:
+            operation: Operation type (e.g., 'video_upload')
+        """
+        self.quota_tracker.release('youtube', self.QUOTA_COSTS.get(operation, 1))
+
     def get_remaining_quota(self) -> int:
         """Get remaining YouTube quota"""
         return self.quota_tracker.get_remaining('youtube')
 
 
+_youtube_limiter: Optional[YouTubeRateLimiter] = None
+_youtube_limiter_lock = threading.Lock()
+
+
+def get_youtube_rate_limiter() -> YouTubeRateLimiter:
+    """
+    Get the process-wide YouTube rate limiter
+
+    The daily quota belongs to the project, not to a publisher instance,
+    so every publisher in the process shares one tracker.
+
+    Returns:
+        Shared YouTubeRateLimiter instance
+    """
+    global _youtube_limiter
+    with _youtube_limiter_lock:
+        if _youtube_limiter is None:
+            _youtube_limiter = YouTubeRateLimiter()
+        return _youtube_limiter
+
+
 class TikTokRateLimiter:
     """Rate limiter for TikTok API"""
 
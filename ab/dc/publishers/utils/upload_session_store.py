@@ -0,0 +1,160 @@
+"""
+Upload Session Store Utility
+Persists resumable upload sessions so uploads survive process restarts
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class UploadSessionStore:
+    """
+    Stores resumable upload session URIs and committed offsets
+
+    Sessions are keyed by the file (path, size, mtime) and the upload
+    metadata, so a changed file or changed title starts a new session
+    instead of resuming an old one. Entries older than max_age_hours are
+    dropped (YouTube upload sessions expire after about a week).
+    """
+
+    def __init__(self, path: Path, max_age_hours: float = 144):
+        """
+        Initialize store
+
+        Args:
+            path: JSON file for sessions
+            max_age_hours: Discard sessions older than this
+        """
+        self.path = Path(path).expanduser()
+        self.max_age_seconds = max_age_hours * 3600
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(video_path: Path, metadata: Dict) -> str:
+        """
+        Build the session key for a file and its upload metadata
+
+        Args:
+            video_path: Video file
+            metadata: Upload metadata sent when the session was created
+
+        Returns:
+            Hex digest
+        """
+        stat = video_path.stat()
+        digest = hashlib.sha256()
+        digest.update(f"{video_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|".encode('utf-8'))
+        digest.update(json.dumps(metadata, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Get a stored session
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Dict with session_uri, offset, file_size, video_path, created_at
+            or None if missing or expired
+        """
+        with self._lock:
+            entry = self._load().get(key)
+
+        if entry and time.time() - entry['created_at'] > self.max_age_seconds:
+            self.remove(key)
+            return None
+        return entry
+
+    def save(self, key: str, session_uri: str, video_path: Path, file_size: int, offset: int = 0):
+        """
+        Store a new session
+
+        Args:
+            key: Key from make_key()
+            session_uri: Resumable upload session URI
+            video_path: Video file
+            file_size: Total upload size
+            offset: Bytes committed so far
+        """
+        with self._lock:
+            sessions = self._load()
+            sessions[key] = {
+                'session_uri': session_uri,
+                'video_path': str(video_path),
+                'file_size': file_size,
+                'offset': offset,
+                'created_at': time.time(),
+                'updated_at': time.time()
+            }
+            self._write(sessions)
+
+    def update_offset(self, key: str, offset: int):
+        """
+        Record the committed offset of a session
+
+        Args:
+            key: Key from make_key()
+            offset: Bytes committed so far
+        """
+        with self._lock:
+            sessions = self._load()
+            if key not in sessions:
+                return
+            sessions[key]['offset'] = offset
+            sessions[key]['updated_at'] = time.time()
+            self._write(sessions)
+
+    def remove(self, key: str):
+        """
+        Remove a finished or expired session
+
+        Args:
+            key: Key from make_key()
+        """
+        with self._lock:
+            sessions = self._load()
+            if sessions.pop(key, None) is not None:
+                self._write(sessions)
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load sessions (lock held)"""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable upload sessions file {self.path}: {e}")
+            return {}
+
+    def _write(self, sessions: Dict[str, Dict]):
+        """Write sessions atomically (lock held)"""
+        now = time.time()
+        sessions = {
+            key: entry for key, entry in sessions.items()
+            if now - entry['created_at'] <= self.max_age_seconds
+        }
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(sessions, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to save upload sessions to {self.path}: {e}")
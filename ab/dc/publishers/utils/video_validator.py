@@ -3,8 +3,7 @@ Video Validator Utility
 Validates video files against platform requirements
 """
 
-import subprocess
-import json
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
@@ -77,71 +76,41 @@ class VideoValidator:
         if not video_path.exists():
             raise FileNotFoundError(f"Video file not found: {video_path}")
 
-        cmd = [
-            self.ffprobe_path,
-            '-v', 'quiet',
-            '-print_format', 'json',
-            '-show_format',
-            '-show_streams',
-            str(video_path)
-        ]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode != 0:
-                raise RuntimeError(f"ffprobe failed: {result.stderr}")
-
-            data = json.loads(result.stdout)
-
-            # Find video stream
-            video_stream = None
-            audio_stream = None
-            for stream in data.get('streams', []):
-                if stream.get('codec_type') == 'video' and not video_stream:
-                    video_stream = stream
-                elif stream.get('codec_type') == 'audio' and not audio_stream:
-                    audio_stream = stream
-
-            if not video_stream:
-                raise RuntimeError("No video stream found in file")
-
-            format_info = data.get('format', {})
-
-            # Calculate aspect ratio
-            width = int(video_stream.get('width', 0))
-            height = int(video_stream.get('height', 0))
-            aspect_ratio = self._calculate_aspect_ratio(width, height)
-
-            return {
-                'file_size': int(format_info.get('size', 0)),
-                'duration': float(format_info.get('duration', 0)),
-                'format': format_info.get('format_name', '').split(',')[0],
-                'bitrate': int(format_info.get('bit_rate', 0)) // 1000,  # kbps
-                'video': {
-                    'codec': video_stream.get('codec_name', ''),
-                    'width': width,
-                    'height': height,
-                    'aspect_ratio': aspect_ratio,
-                    'fps': self._get_fps(video_stream),
-                    'bitrate': int(video_stream.get('bit_rate', 0)) // 1000,  # kbps
-                },
-                'audio': {
-                    'codec': audio_stream.get('codec_name', '') if audio_stream else None,
-                    'channels': audio_stream.get('channels', 0) if audio_stream else 0,
-                    'sample_rate': audio_stream.get('sample_rate', 0) if audio_stream else 0,
-                } if audio_stream else None
-            }
-
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("ffprobe timed out")
-        except json.JSONDecodeError as e:
-            raise RuntimeError(f"Failed to parse ffprobe output: {e}")
+        # Probe results are cached per file and shared with the downloader
+        # services, so validating a clip they already probed is free
+        downloaders_dir = str(Path(__file__).parent.parent.parent / 'downloaders')
+        if downloaders_dir not in sys.path:
+            sys.path.insert(0, downloaders_dir)
+        from media_probe import get_media_probe
+
+        # ProbeError is a RuntimeError
+        info = get_media_probe().probe(video_path, ffprobe_path=self.ffprobe_path)
+
+        video = info['video']
+        if not video:
+            raise RuntimeError("No video stream found in file")
+
+        audio = info['audio']
+
+        return {
+            'file_size': info['file_size'],
+            'duration': info['duration'],
+            'format': info['format_name'].split(',')[0],
+            'bitrate': info['bit_rate'] // 1000,  # kbps
+            'video': {
+                'codec': video['codec'],
+                'width': video['width'],
+                'height': video['height'],
+                'aspect_ratio': self._calculate_aspect_ratio(video['width'], video['height']),
+                'fps': video['fps'],
+                'bitrate': video['bit_rate'] // 1000,  # kbps
+            },
+            'audio': {
+                'codec': audio['codec'],
+                'channels': audio['channels'],
+                'sample_rate': audio['sample_rate'],
+            } if audio else None
+        }
 
     def validate(
         self,
@@ -285,12 +254,3 @@ class VideoValidator:
             return "21:9"
         else:
             return f"{width}:{height}"
-
-    def _get_fps(self, video_stream: Dict) -> float:
-        """Extract FPS from video stream"""
-        fps_str = video_stream.get('r_frame_rate', '0/1')
-        try:
-            num, den = fps_str.split('/')
-            return float(num) / float(den) if float(den) != 0 else 0
-        except (ValueError, ZeroDivisionError):
-            return 0.0
@@ -4,11 +4,15 @@ Implements YouTube Data API v3 for video publishing with resumable uploads
 """
 
 import os
+import mmap
+import time
 import requests
 import json
 import logging
+import threading
+from requests.adapters import HTTPAdapter
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlencode
 
 try:
@@ -20,9 +24,11 @@ try:
     )
     from .oauth_manager import OAuthManager
     from .utils.video_validator import VideoValidator
-    from .utils.rate_limiter import YouTubeRateLimiter
+    from .utils.rate_limiter import get_youtube_rate_limiter
     from .utils.retry_handler import RetryHandler
     from .utils.metadata_builder import MetadataBuilder
+    from .utils.upload_session_store import UploadSessionStore
+    from .utils.chunk_sizer import AdaptiveChunkSizer
 except ImportError:
     from base_publisher import (
         BasePublisher,
@@ -32,13 +38,20 @@ except ImportError:
     )
     from oauth_manager import OAuthManager
     from utils.video_validator import VideoValidator
-    from utils.rate_limiter import YouTubeRateLimiter
+    from utils.rate_limiter import get_youtube_rate_limiter
     from utils.retry_handler import RetryHandler
     from utils.metadata_builder import MetadataBuilder
+    from utils.upload_session_store import UploadSessionStore
+    from utils.chunk_sizer import AdaptiveChunkSizer
 
 logger = logging.getLogger(__name__)
 
 
+class UploadSessionExpired(Exception):
+    """Raised when a resumable upload session no longer exists"""
+    pass
+
+
 class YouTubePublisher(BasePublisher):
     """YouTube video publisher using Data API v3"""
 
@@ -49,6 +62,10 @@ class YouTubePublisher(BasePublisher):
     VIDEO_URL = "https://www.googleapis.com/youtube/v3/videos"
     THUMBNAIL_URL = "https://www.googleapis.com/upload/youtube/v3/thumbnails/set"
 
+    # Connections kept alive per host (uploads, thumbnails and API calls
+    # share one session)
+    HTTP_POOL_SIZE = 10
+
     # OAuth scopes
     SCOPES = [
         'https://www.googleapis.com/auth/youtube.upload',
@@ -76,12 +93,33 @@ class YouTubePublisher(BasePublisher):
             ffprobe_path=config.get('ffprobe_path', 'ffprobe')
         )
 
-        self.rate_limiter = YouTubeRateLimiter()
+        # Shared by every publisher in the process: the quota is per project
+        self.rate_limiter = get_youtube_rate_limiter()
         self.retry_handler = RetryHandler(
             max_retries=config.get('max_retries', 3)
         )
         self.metadata_builder = MetadataBuilder('youtube')
 
+        # Resumable sessions survive restarts and resume from the committed byte
+        self.upload_sessions = UploadSessionStore(
+            config.get('upload_sessions_file') or Path.home() / '.ab_publisher_upload_sessions.json'
+        )
+
+        # Concurrent uploads share the token; only one of them refreshes it
+        self._token_lock = threading.Lock()
+
+        # Chunk size learned by the last upload; the next one starts there
+        self._learned_chunk_size: Optional[int] = None
+
+        # One keep-alive session for all API calls, so upload chunks don't
+        # each pay a new TCP/TLS handshake. Retries are handled per call.
+        pool_size = config.get('http_pool_size', self.HTTP_POOL_SIZE)
+        self.session = requests.Session()
+        self.session.mount(
+            'https://',
+            HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        )
+
         # Load existing tokens
         if self.oauth.load_tokens('youtube'):
             self._authenticated = True
@@ -170,7 +208,8 @@ class YouTubePublisher(BasePublisher):
         self,
         video_path: Path,
         metadata: VideoMetadata,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        quota_reserved: bool = False
     ) -> UploadResult:
         """
         Upload video to YouTube using resumable upload
@@ -179,6 +218,8 @@ class YouTubePublisher(BasePublisher):
             video_path: Path to video file
             metadata: Video metadata
             progress_callback: Optional callback for upload progress (0.0 to 1.0)
+            quota_reserved: Quota was already reserved (see UploadScheduler);
+                it is returned when a stored session is resumed
 
         Returns:
             UploadResult object
@@ -188,54 +229,90 @@ class YouTubePublisher(BasePublisher):
         # Validate video first
         validation = self.validate_video(video_path)
         if not validation.valid:
+            if quota_reserved:
+                self.rate_limiter.release('video_upload')
             return UploadResult(
                 success=False,
                 error=f"Video validation failed: {', '.join(validation.errors)}"
             )
 
-        # Check rate limit and quota
-        if not self.rate_limiter.acquire('video_upload'):
-            return UploadResult(
-                success=False,
-                error="YouTube quota exceeded or rate limited"
-            )
-
         try:
             # Build YouTube metadata
             youtube_metadata = self._build_metadata(metadata, video_path)
-
-            # Initialize resumable upload
-            logger.info(f"Initializing upload for: {video_path.name}")
-            session_uri = self._initialize_resumable_upload(
-                youtube_metadata,
-                video_path.stat().st_size
-            )
-
-            if not session_uri:
+            file_size = video_path.stat().st_size
+            session_key = self.upload_sessions.make_key(video_path, youtube_metadata)
+            chunk_sizer = self._new_chunk_sizer()
+
+            # Only a new session (videos.insert) costs quota; a stored session
+            # was paid for when it was opened
+            quota_held = quota_reserved
+            if self.upload_sessions.get(session_key):
+                if quota_held:
+                    self.rate_limiter.release('video_upload')
+                    quota_held = False
+            elif not quota_held and not self.rate_limiter.acquire('video_upload'):
                 return UploadResult(
                     success=False,
-                    error="Failed to initialize resumable upload"
+                    error="YouTube quota exceeded or rate limited"
                 )
 
-            # Upload video file
-            logger.info("Uploading video file...")
-            video_data = self._upload_video_file(
-                session_uri,
-                video_path,
-                progress_callback
-            )
+            # Resume a stored session if there is one; if it has expired,
+            # start over once with a new session
+            video_data = None
+            for _ in range(2):
+                try:
+                    session_uri, offset, video_data = self._open_upload_session(
+                        session_key, youtube_metadata, video_path, file_size
+                    )
+                    if not session_uri:
+                        return UploadResult(
+                            success=False,
+                            error="Failed to initialize resumable upload"
+                        )
+
+                    if video_data is None:
+                        logger.info("Uploading video file...")
+                        video_data = self._upload_video_file(
+                            session_uri,
+                            video_path,
+                            progress_callback,
+                            offset=offset,
+                            session_key=session_key,
+                            chunk_sizer=chunk_sizer
+                        )
+                    break
+
+                except UploadSessionExpired:
+                    logger.warning("Upload session expired, starting a new session")
+                    self.upload_sessions.remove(session_key)
+                    if not quota_held:
+                        if not self.rate_limiter.acquire('video_upload'):
+                            return UploadResult(
+                                success=False,
+                                error="YouTube quota exceeded or rate limited"
+                            )
+                        quota_held = True
 
             if not video_data:
                 return UploadResult(
                     success=False,
-                    error="Video upload failed"
+                    error="Video upload failed (will resume from the last committed byte on retry)"
                 )
 
+            self.upload_sessions.remove(session_key)
+            self._learned_chunk_size = chunk_sizer.size
+            upload_stats = chunk_sizer.stats()
+
             video_id = video_data.get('id')
             video_url = f"https://www.youtube.com/watch?v={video_id}"
 
             logger.info(f"Upload successful! Video ID: {video_id}")
             logger.info(f"Video URL: {video_url}")
+            if upload_stats['chunks']:
+                logger.info(
+                    f"Upload throughput: {upload_stats['throughput_mbps']} Mbit/s over "
+                    f"{upload_stats['chunks']} chunks ({upload_stats['errors']} errors)"
+                )
 
             # Upload thumbnail if provided
             if metadata.thumbnail_path and metadata.thumbnail_path.exists():
@@ -251,7 +328,8 @@ class YouTubePublisher(BasePublisher):
                     'title': metadata.title,
                     'is_short': self.validator.is_youtube_short(video_path),
                     'duration': validation.duration,
-                    'resolution': f"{validation.resolution[0]}x{validation.resolution[1]}"
+                    'resolution': f"{validation.resolution[0]}x{validation.resolution[1]}",
+                    'upload': upload_stats
                 }
             )
 
@@ -291,7 +369,7 @@ class YouTubePublisher(BasePublisher):
         logger.debug(f"Using access token: {self._access_token[:50]}...")
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 url,
                 headers=headers,
                 json=metadata,
@@ -306,68 +384,245 @@ class YouTubePublisher(BasePublisher):
             logger.error(f"Failed to initialize upload: {e}")
             return None
 
+    def _open_upload_session(
+        self,
+        session_key: str,
+        metadata: Dict,
+        video_path: Path,
+        file_size: int
+    ) -> Tuple[Optional[str], int, Optional[Dict]]:
+        """
+        Resume a stored upload session or initialize a new one
+
+        Args:
+            session_key: Session store key for the file and metadata
+            metadata: Video metadata
+            video_path: Path to video file
+            file_size: Video file size in bytes
+
+        Returns:
+            Tuple of (session URI or None, committed offset, video data if
+            the stored session had already completed)
+
+        Raises:
+            UploadSessionExpired: If the stored session no longer exists
+        """
+        stored = self.upload_sessions.get(session_key)
+        if stored:
+            session_uri = stored['session_uri']
+            try:
+                offset, video_data = self._query_upload_offset(session_uri, file_size)
+            except requests.exceptions.RequestException as e:
+                # Fall back to the last offset we saw committed
+                logger.warning(f"Could not query upload session: {e}")
+                offset, video_data = stored['offset'], None
+
+            logger.info(
+                f"Resuming upload for: {video_path.name} "
+                f"from byte {offset}/{file_size} ({offset / file_size:.0%})"
+            )
+            return session_uri, offset, video_data
+
+        logger.info(f"Initializing upload for: {video_path.name}")
+        session_uri = self._initialize_resumable_upload(metadata, file_size)
+        if session_uri:
+            self.upload_sessions.save(session_key, session_uri, video_path, file_size)
+        return session_uri, 0, None
+
+    def _query_upload_offset(self, session_uri: str, file_size: int) -> Tuple[int, Optional[Dict]]:
+        """
+        Ask the server how many bytes of an upload it has committed
+
+        Args:
+            session_uri: Resumable upload session URI
+            file_size: Video file size in bytes
+
+        Returns:
+            Tuple of (committed offset, video data if the upload is complete)
+
+        Raises:
+            UploadSessionExpired: If the session no longer exists
+            requests.exceptions.RequestException: If the query fails
+        """
+        headers = {
+            'Content-Length': '0',
+            'Content-Range': f'bytes */{file_size}'
+        }
+        response = self.session.put(session_uri, headers=headers, timeout=30)
+
+        if response.status_code in (200, 201):
+            return file_size, response.json()
+        if response.status_code == 308:
+            return self._committed_offset(response), None
+        if response.status_code in (404, 410):
+            raise UploadSessionExpired(session_uri)
+
+        response.raise_for_status()
+        raise requests.exceptions.HTTPError(
+            f"Unexpected status {response.status_code} from upload session",
+            response=response
+        )
+
+    @staticmethod
+    def _committed_offset(response: requests.Response) -> int:
+        """Next byte to send, from the Range header of a 308 response"""
+        committed = response.headers.get('Range')  # e.g. 'bytes=0-1048575'
+        if not committed:
+            return 0
+        return int(committed.rsplit('-', 1)[1]) + 1
+
+    def _new_chunk_sizer(self) -> AdaptiveChunkSizer:
+        """Create a chunk sizer from config, starting at the last learned size"""
+        return AdaptiveChunkSizer(
+            initial_size=self._learned_chunk_size or self.config.get('chunk_size', 10 * 1024 * 1024),
+            max_size=self.config.get('max_chunk_size', 256 * 1024 * 1024),
+            target_seconds=self.config.get('chunk_target_seconds', 8.0),
+            adaptive=self.config.get('adaptive_chunk_size', True)
+        )
+
     def _upload_video_file(
         self,
         session_uri: str,
         video_path: Path,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        offset: int = 0,
+        session_key: Optional[str] = None,
+        chunk_sizer: Optional[AdaptiveChunkSizer] = None
     ) -> Optional[Dict]:
         """
         Upload video file to session URI
 
+        The file is memory-mapped and each chunk is sent as a memoryview
+        slice of the mapping, so chunks are never copied into new buffers.
+        When a chunk fails, the server is asked for the committed range and
+        the upload continues from there after a backoff delay; the retry
+        budget resets whenever a chunk succeeds. Chunk sizes follow the
+        measured throughput (see AdaptiveChunkSizer).
+
         Args:
             session_uri: Resumable upload session URI
             video_path: Path to video file
             progress_callback: Optional progress callback
+            offset: Byte to start from (committed by an earlier attempt)
+            session_key: Session store key to record committed offsets
+            chunk_sizer: Sizer that picks chunk sizes and collects throughput stats
 
         Returns:
             Video data dict or None
+
+        Raises:
+            UploadSessionExpired: If the session no longer exists
         """
         file_size = video_path.stat().st_size
-        chunk_size = self.config.get('chunk_size', 10 * 1024 * 1024)  # 10MB default
-
-        with open(video_path, 'rb') as video_file:
-            uploaded = 0
-
-            while uploaded < file_size:
-                chunk_end = min(uploaded + chunk_size, file_size)
-                chunk = video_file.read(chunk_end - uploaded)
-
-                headers = {
-                    'Content-Length': str(len(chunk)),
-                    'Content-Range': f'bytes {uploaded}-{chunk_end - 1}/{file_size}'
-                }
-
-                try:
-                    response = requests.put(
-                        session_uri,
-                        headers=headers,
-                        data=chunk,
-                        timeout=300
-                    )
-
-                    if response.status_code in (200, 201):
-                        # Upload complete
-                        if progress_callback:
-                            progress_callback(1.0)
-                        return response.json()
-
-                    elif response.status_code == 308:
-                        # Resume incomplete
-                        uploaded = chunk_end
-                        if progress_callback:
-                            progress_callback(uploaded / file_size)
-                    else:
-                        response.raise_for_status()
-
-                except requests.exceptions.RequestException as e:
-                    logger.error(f"Upload failed at byte {uploaded}: {e}")
-                    return None
+        chunk_sizer = chunk_sizer or self._new_chunk_sizer()
+        failures = 0
+
+        with open(video_path, 'rb') as video_file, \
+                mmap.mmap(video_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                uploaded = offset
+
+                while uploaded < file_size:
+                    chunk_end = min(uploaded + chunk_sizer.next_size(), file_size)
+
+                    headers = {
+                        'Content-Length': str(chunk_end - uploaded),
+                        'Content-Range': f'bytes {uploaded}-{chunk_end - 1}/{file_size}'
+                    }
+
+                    chunk = view[uploaded:chunk_end]
+                    started = time.monotonic()
+                    try:
+                        response = self.session.put(
+                            session_uri,
+                            headers=headers,
+                            data=chunk,
+                            timeout=300
+                        )
+                        elapsed = time.monotonic() - started
+
+                        if response.status_code in (200, 201):
+                            # Upload complete
+                            chunk_sizer.record_success(chunk_end - uploaded, elapsed)
+                            if progress_callback:
+                                progress_callback(1.0)
+                            return response.json()
+
+                        elif response.status_code == 308:
+                            # Resume incomplete; the server may commit less than was sent
+                            committed = self._committed_offset(response)
+                            if committed <= uploaded:
+                                # Nothing committed: count it as a failure so a stuck session gives up
+                                chunk_sizer.record_failure()
+                                failures += 1
+                                if failures > self.retry_handler.max_retries:
+                                    logger.error(f"Upload stalled at byte {uploaded} after {failures} attempts")
+                                    return None
+
+                                delay = self.retry_handler.calculate_delay(failures - 1)
+                                logger.warning(f"Server committed no bytes past {uploaded}. Retrying in {delay:.1f}s...")
+                                time.sleep(delay)
+                                continue
+
+                            chunk_sizer.record_success(committed - uploaded, elapsed)
+                            uploaded = committed
+                            failures = 0
+                            if session_key:
+                                self.upload_sessions.update_offset(session_key, uploaded)
+                            if progress_callback:
+                                progress_callback(uploaded / file_size)
+                        elif response.status_code in (404, 410):
+                            raise UploadSessionExpired(session_uri)
+                        else:
+                            response.raise_for_status()
+                            raise requests.exceptions.HTTPError(
+                                f"Unexpected status {response.status_code}",
+                                response=response
+                            )
+
+                    except requests.exceptions.RequestException as e:
+                        chunk_sizer.record_failure(timeout=isinstance(e, requests.exceptions.Timeout))
+                        failures += 1
+                        if failures > self.retry_handler.max_retries:
+                            logger.error(f"Upload failed at byte {uploaded} after {failures} attempts: {e}")
+                            return None
+
+                        delay = self.retry_handler.calculate_delay(failures - 1)
+                        logger.warning(f"Chunk at byte {uploaded} failed: {e}. Resuming in {delay:.1f}s...")
+                        time.sleep(delay)
+
+                        try:
+                            uploaded, video_data = self._query_upload_offset(session_uri, file_size)
+                        except requests.exceptions.RequestException as query_error:
+                            # Retry the same range; the next failure queries again
+                            logger.warning(f"Could not query upload session: {query_error}")
+                            continue
+
+                        if video_data is not None:
+                            if progress_callback:
+                                progress_callback(1.0)
+                            return video_data
+
+                        logger.info(f"Server committed {uploaded}/{file_size} bytes, continuing")
+                        if session_key:
+                            self.upload_sessions.update_offset(session_key, uploaded)
+
+                    finally:
+                        # The mapping can't be closed while slices are exported
+                        chunk.release()
+            finally:
+                view.release()
 
         return None
 
     def _upload_thumbnail(self, video_id: str, thumbnail_path: Path) -> bool:
-        """Upload custom thumbnail"""
+        """Upload custom thumbnail (skipped when the daily quota is spent)"""
+        retry_at = self.rate_limiter.reserve('thumbnail_set')
+        if retry_at is not None:
+            logger.warning(f"YouTube quota exhausted, skipping thumbnail for {video_id} (resets at {retry_at})")
+            return False
+
         self._ensure_token_valid()
 
         url = f"{self.THUMBNAIL_URL}?videoId={video_id}"
@@ -379,7 +634,7 @@ class YouTubePublisher(BasePublisher):
 
         try:
             with open(thumbnail_path, 'rb') as thumbnail:
-                response = requests.post(
+                response = self.session.post(
                     url,
                     headers=headers,
                     data=thumbnail,
@@ -405,7 +660,7 @@ class YouTubePublisher(BasePublisher):
         }
 
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.session.get(url, headers=headers, timeout=30)
             response.raise_for_status()
 
             data = response.json()
@@ -430,7 +685,7 @@ class YouTubePublisher(BasePublisher):
         }
 
         try:
-            response = requests.delete(url, headers=headers, timeout=30)
+            response = self.session.delete(url, headers=headers, timeout=30)
             response.raise_for_status()
             logger.info(f"Video {video_id} deleted")
             return True
@@ -464,7 +719,7 @@ class YouTubePublisher(BasePublisher):
         }
 
         try:
-            response = requests.put(
+            response = self.session.put(
                 url,
                 headers=headers,
                 json=youtube_metadata,
@@ -507,7 +762,14 @@ class YouTubePublisher(BasePublisher):
 
     def _ensure_token_valid(self):
         """Ensure access token is valid, refresh if needed"""
-        if not self.oauth.is_token_valid():
+        if self.oauth.is_token_valid():
+            return
+
+        with self._token_lock:
+            # Another upload may have refreshed it while we waited
+            if self.oauth.is_token_valid():
+                return
+
             logger.info("Access token expired, refreshing...")
             if not self.refresh_access_token():
                 raise RuntimeError("Failed to refresh access token")
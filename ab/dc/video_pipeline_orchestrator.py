@@ -4,12 +4,16 @@ Automates the complete video processing pipeline from URL to published clips
 """
 
 import os
+import sys
 import json
+import threading
+import importlib.util
 import logging
 import subprocess
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
+from dataclasses import asdict
 
 # Load environment variables
 try:
@@ -27,14 +31,35 @@ try:
     from publishers.agents.metadata_generator_agent import MetadataGeneratorAgent
     from publishers.agents.thumbnail_generator_agent import ThumbnailGeneratorAgent
     from publishers.auto_publisher import AutoPublisher
+    from publishers.base_publisher import UploadResult
+    from publishers.upload_scheduler import PublishJob
+    from pipeline_state import PipelineState, fingerprint_file
 except ImportError:
     # Fall back to absolute imports (when run from project root)
-    import sys
     sys.path.insert(0, str(Path(__file__).parent.parent.parent))
     from ab.dc.analysers.replay_heatmap import get_moments_with_metadata, extract_video_id
     from ab.dc.publishers.agents.metadata_generator_agent import MetadataGeneratorAgent
     from ab.dc.publishers.agents.thumbnail_generator_agent import ThumbnailGeneratorAgent
     from ab.dc.publishers.auto_publisher import AutoPublisher
+    from ab.dc.publishers.base_publisher import UploadResult
+    from ab.dc.publishers.upload_scheduler import PublishJob
+    from ab.dc.pipeline_state import PipelineState, fingerprint_file
+
+# Downloader services use flat imports; load them without the package __init__
+sys.path.insert(0, str(Path(__file__).parent / 'downloaders'))
+from subtitle_downloader import parse_vtt_subtitle
+from subtitle_track import SubtitleTrack
+from subtitle_clipper_service import (
+    filter_subtitle_segments_many,
+    generate_vtt_content,
+    generate_srt_content
+)
+from video_transcriber import transcribe_moments, write_clip_transcript
+from download_coordinator import get_download_coordinator
+from video_downloader import is_complete_download
+from storage_manager import write_download_record
+from ffmpeg_runner import run_ffmpeg
+from media_probe import get_media_probe, record_from_encode
 
 logger = logging.getLogger(__name__)
 
@@ -48,14 +73,22 @@ class VideoPipelineOrchestrator:
     4. Generate AI metadata for clips
     5. Generate AI thumbnails from metadata
     6. Optionally publish to YouTube
+
+    Progress is recorded in a pipeline_state.json manifest inside each video
+    directory, so a re-run skips steps and clips whose outputs are still valid.
     """
 
+    # Pipeline stages in execution order (see run_stage)
+    STAGES = ("fetch", "encode", "enrich", "publish")
+
     def __init__(
         self,
         provider: str = "youtube",
         output_base: str = "output",
         max_clip_duration: int = 40,
-        min_clip_duration: int = 10
+        min_clip_duration: int = 10,
+        subtitle_formats: tuple = ("vtt",),
+        transcribe_missing_subtitles: bool = False
     ):
         """
         Initialize the orchestrator
@@ -65,11 +98,21 @@ class VideoPipelineOrchestrator:
             output_base: Base output directory (default: output)
             max_clip_duration: Maximum clip duration in seconds
             min_clip_duration: Minimum clip duration in seconds
+            subtitle_formats: Clip subtitle formats to write ('vtt', 'srt')
+            transcribe_missing_subtitles: Transcribe clip ranges with Whisper
+                when the video has no subtitles (needs openai-whisper installed)
         """
         self.provider = provider
         self.output_base = Path(output_base)
         self.max_clip_duration = max_clip_duration
         self.min_clip_duration = min_clip_duration
+        self.subtitle_formats = tuple(subtitle_formats)
+        self.transcribe_missing_subtitles = transcribe_missing_subtitles
+
+        # One publisher per mode, shared by every video: its upload slots
+        # bound concurrent uploads across parallel publish stages
+        self._publishers: Dict[bool, AutoPublisher] = {}
+        self._publishers_lock = threading.Lock()
 
         # Create base output directory
         self.output_base.mkdir(parents=True, exist_ok=True)
@@ -81,7 +124,8 @@ class VideoPipelineOrchestrator:
         url_or_id: str,
         publish: bool = False,
         privacy: str = "public",
-        dry_run: bool = False
+        dry_run: bool = False,
+        resume: bool = True
     ) -> Dict:
         """
         Process a video through the complete pipeline
@@ -91,104 +135,197 @@ class VideoPipelineOrchestrator:
             publish: Whether to publish clips to YouTube
             privacy: Privacy status (public, private, unlisted)
             dry_run: Test without actually publishing
+            resume: Reuse completed steps recorded in pipeline_state.json
 
         Returns:
             Dictionary with processing results
         """
         try:
-            # Extract video ID
-            video_id = extract_video_id(url_or_id)
-            if not video_id:
-                return {
-                    "success": False,
-                    "error": "Invalid YouTube URL or video ID"
-                }
+            job = self.create_job(url_or_id, resume=resume)
+            if not job["success"]:
+                return job
+
+            for stage in self.STAGES:
+                failure = self.run_stage(
+                    job,
+                    stage,
+                    publish=publish,
+                    privacy=privacy,
+                    dry_run=dry_run
+                )
+                if failure:
+                    return failure
 
-            logger.info(f"Processing video: {video_id}")
+            return job["result"]
 
-            # Create video output directory
-            video_dir = self.output_base / self.provider / video_id
-            video_dir.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logger.error(f"Pipeline error: {e}", exc_info=True)
+            return {
+                "success": False,
+                "error": str(e)
+            }
 
-            result = {
+    def create_job(self, url_or_id: str, resume: bool = True) -> Dict:
+        """
+        Prepare a pipeline job for a video (output directory and step manifest)
+
+        Args:
+            url_or_id: YouTube URL or video ID
+            resume: Reuse completed steps recorded in pipeline_state.json
+
+        Returns:
+            Job dictionary passed to run_stage(), or a failure result
+        """
+        # Extract video ID
+        video_id = extract_video_id(url_or_id)
+        if not video_id:
+            return {
+                "success": False,
+                "error": "Invalid YouTube URL or video ID"
+            }
+
+        logger.info(f"Processing video: {video_id}")
+
+        # Create video output directory
+        video_dir = self.output_base / self.provider / video_id
+        video_dir.mkdir(parents=True, exist_ok=True)
+
+        # Load step manifest (discard recorded progress if not resuming)
+        state = PipelineState(video_dir)
+        if not resume:
+            state.reset()
+
+        return {
+            "success": True,
+            "video_id": video_id,
+            "video_dir": video_dir,
+            "state": state,
+            "result": {
                 "success": True,
                 "video_id": video_id,
                 "video_dir": str(video_dir),
                 "steps": {}
             }
+        }
+
+    def run_stage(
+        self,
+        job: Dict,
+        stage: str,
+        publish: bool = False,
+        privacy: str = "public",
+        dry_run: bool = False
+    ) -> Optional[Dict]:
+        """
+        Run one stage of a pipeline job
+
+        Stages are grouped by the resource they mostly use, so a batch runner
+        can give each one its own worker pool:
+            fetch:   moments, video and subtitle download (I/O-bound)
+            encode:  clip cutting (CPU-bound)
+            enrich:  AI metadata and thumbnails (network/LLM-bound)
+            publish: uploads and summary (quota-bound)
+
+        Args:
+            job: Job dictionary from create_job()
+            stage: Stage name (one of STAGES)
+            publish: Whether to publish clips to YouTube
+            privacy: Privacy status (public, private, unlisted)
+            dry_run: Test without actually publishing
+
+        Returns:
+            None if the stage succeeded, otherwise the failure result
+        """
+        video_id = job["video_id"]
+        video_dir = job["video_dir"]
+        state = job["state"]
+        result = job["result"]
+        steps = result["steps"]
 
+        if stage == "fetch":
             # Step 1: Extract moments and metadata
             logger.info("Step 1: Extracting popular moments and video metadata...")
-            moments_result = self._extract_moments(video_id, video_dir)
-            result["steps"]["extract_moments"] = moments_result
+            moments_result = self._extract_moments(video_id, video_dir, state)
+            steps["extract_moments"] = moments_result
 
             if not moments_result["success"]:
                 return moments_result
 
             # Step 2: Download video
             logger.info("Step 2: Downloading video...")
-            download_result = self._download_video(video_id, video_dir)
-            result["steps"]["download"] = download_result
+            download_result = self._download_video(video_id, video_dir, state)
+            steps["download"] = download_result
 
             if not download_result["success"]:
                 return download_result
 
             # Step 3: Download subtitles
             logger.info("Step 3: Downloading subtitles...")
-            subtitle_result = self._download_subtitles(video_id, video_dir)
-            result["steps"]["subtitles"] = subtitle_result
+            steps["subtitles"] = self._download_subtitles(video_id, video_dir, state)
 
+        elif stage == "encode":
             # Step 4: Create clips for each moment
             logger.info("Step 4: Creating clips for each moment...")
             clips_result = self._create_clips(
                 video_id,
                 video_dir,
-                moments_result["moments"],
-                download_result["video_path"]
+                steps["extract_moments"]["moments"],
+                steps["download"]["video_path"],
+                steps["subtitles"].get("subtitle_path"),
+                state
             )
-            result["steps"]["clips"] = clips_result
+            steps["clips"] = clips_result
 
             if not clips_result["success"]:
                 return clips_result
 
+        elif stage == "enrich":
+            clip_dirs = steps["clips"]["clip_dirs"]
+
             # Step 5: Generate AI metadata for clips
             logger.info("Step 5: Generating AI metadata for clips...")
-            metadata_result = self._generate_metadata(video_dir, clips_result["clip_dirs"])
-            result["steps"]["metadata"] = metadata_result
+            steps["metadata"] = self._generate_metadata(video_dir, clip_dirs, state)
 
             # Step 6: Generate AI thumbnails
             logger.info("Step 6: Generating AI thumbnails...")
-            thumbnails_result = self._generate_thumbnails(video_dir, clips_result["clip_dirs"])
-            result["steps"]["thumbnails"] = thumbnails_result
+            steps["thumbnails"] = self._generate_thumbnails(video_dir, clip_dirs, state)
 
+        elif stage == "publish":
             # Step 7: Publish (if requested)
             if publish:
                 logger.info(f"Step 7: Publishing clips to YouTube (privacy: {privacy})...")
-                publish_result = self._publish_clips(
+                steps["publish"] = self._publish_clips(
                     video_dir,
-                    clips_result["clip_dirs"],
+                    steps["clips"]["clip_dirs"],
                     privacy,
-                    dry_run
+                    dry_run,
+                    state
                 )
-                result["steps"]["publish"] = publish_result
             else:
                 logger.info("Step 7: Skipping publishing (--publish flag not set)")
-                result["steps"]["publish"] = {"skipped": True}
+                steps["publish"] = {"skipped": True}
 
             # Summary
             result["summary"] = self._generate_summary(result)
 
-            return result
+        else:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
 
-        except Exception as e:
-            logger.error(f"Pipeline error: {e}", exc_info=True)
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        return None
 
-    def _extract_moments(self, video_id: str, video_dir: Path) -> Dict:
+    def _extract_moments(self, video_id: str, video_dir: Path, state: PipelineState) -> Dict:
         """Extract popular moments and save metadata"""
+        inputs = {
+            "video_id": video_id,
+            "max_duration": self.max_clip_duration,
+            "min_duration": self.min_clip_duration
+        }
+
+        recorded = state.get_step("extract_moments", inputs)
+        if recorded:
+            logger.info("Reusing extracted moments from previous run")
+            return recorded
+
         try:
             # Get moments with full metadata
             data = get_moments_with_metadata(
@@ -213,13 +350,16 @@ class VideoPipelineOrchestrator:
             logger.info(f"Found {data['total_moments']} popular moments")
             logger.info(f"Saved to: {moments_file}")
 
-            return {
+            result = {
                 "success": True,
                 "moments": data["moments"],
                 "video_info": data["video_info"],
                 "moments_file": str(moments_file),
                 "metadata_file": str(metadata_file)
             }
+            state.record_step("extract_moments", inputs, [moments_file, metadata_file], result)
+
+            return result
 
         except Exception as e:
             return {
@@ -227,25 +367,48 @@ class VideoPipelineOrchestrator:
                 "error": f"Failed to extract moments: {str(e)}"
             }
 
-    def _download_video(self, video_id: str, video_dir: Path) -> Dict:
+    def _download_video(self, video_id: str, video_dir: Path, state: PipelineState) -> Dict:
         """Download video using yt-dlp"""
+        inputs = {"video_id": video_id}
+
+        recorded = state.get_step("download", inputs)
+        if recorded:
+            logger.info(f"Reusing downloaded video: {recorded['video_path']}")
+            return recorded
+
         try:
             output_path = video_dir / f"{video_id}.mp4"
+            downloaded = []
 
-            cmd = [
-                'yt-dlp',
-                '-f', 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
-                '-o', str(output_path),
-                f'https://www.youtube.com/watch?v={video_id}'
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            def download(temp_path: Path):
+                cmd = [
+                    'yt-dlp',
+                    '-f', 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
+                    '--merge-output-format', 'mp4',
+                    '--continue',
+                    '--retries', '10',
+                    '--fragment-retries', '10',
+                    '-o', str(temp_path),
+                    f'https://www.youtube.com/watch?v={video_id}'
+                ]
+                subprocess.run(cmd, capture_output=True, text=True, check=True)
+                downloaded.append(temp_path)
+
+            # Concurrent runs for the same video share one download; a
+            # complete file from an earlier run is reused
+            get_download_coordinator().fetch(output_path, download, is_complete_download)
+            if downloaded:
+                # Record size and hash so later runs reuse the file with one stat
+                write_download_record(output_path)
             logger.info(f"Downloaded video to: {output_path}")
 
-            return {
+            result = {
                 "success": True,
                 "video_path": str(output_path)
             }
+            state.record_step("download", inputs, [output_path], result)
+
+            return result
 
         except subprocess.CalledProcessError as e:
             return {
@@ -253,8 +416,15 @@ class VideoPipelineOrchestrator:
                 "error": f"Failed to download video: {e.stderr}"
             }
 
-    def _download_subtitles(self, video_id: str, video_dir: Path) -> Dict:
+    def _download_subtitles(self, video_id: str, video_dir: Path, state: PipelineState) -> Dict:
         """Download subtitles using yt-dlp"""
+        inputs = {"video_id": video_id, "language": "en"}
+
+        recorded = state.get_step("subtitles", inputs)
+        if recorded:
+            logger.info("Reusing subtitles from previous run")
+            return recorded
+
         try:
             subtitle_path = video_dir / f"{video_id}_full_subtitle"
 
@@ -275,10 +445,12 @@ class VideoPipelineOrchestrator:
             subtitle_files = list(video_dir.glob(f"{video_id}_full_subtitle*.vtt"))
             if subtitle_files:
                 logger.info(f"Downloaded subtitles to: {subtitle_files[0]}")
-                return {
+                result = {
                     "success": True,
                     "subtitle_path": str(subtitle_files[0])
                 }
+                state.record_step("subtitles", inputs, [subtitle_files[0]], result)
+                return result
             else:
                 logger.warning("No subtitles available")
                 return {
@@ -300,11 +472,27 @@ class VideoPipelineOrchestrator:
         video_id: str,
         video_dir: Path,
         moments: List[Dict],
-        video_path: str
+        video_path: str,
+        subtitle_path: Optional[str],
+        state: PipelineState
     ) -> Dict:
         """Create video clips for each moment"""
         try:
             clip_dirs = []
+            reused = 0
+
+            # Parse the full subtitle once and slice every clip from memory
+            subtitles = self._load_subtitle_track(subtitle_path)
+            clip_segments = None
+            if subtitles is not None:
+                clip_segments = filter_subtitle_segments_many(
+                    subtitles,
+                    [(m["start_time"], m["start_time"] + m["duration"]) for m in moments]
+                )
+
+            # Clips depend on the exact source video, so re-cut if it changed
+            source_fingerprint = fingerprint_file(Path(video_path))
+            clip_targets = []
 
             for i, moment in enumerate(moments):
                 # Create clip directory
@@ -317,6 +505,26 @@ class VideoPipelineOrchestrator:
                 score = int(moment["score"] * 1000)
                 clip_filename = f"{clip_name}_{int(duration)}s_score_{score:03d}_original.mp4"
                 clip_path = clip_dir / clip_filename
+                clip_targets.append((clip_name, clip_dir, clip_path.stem, moment))
+
+                # Clip subtitles are cheap to slice, so always rewrite them
+                if clip_segments is not None:
+                    self._write_clip_subtitles(clip_segments[i], clip_dir, clip_path.stem)
+
+                inputs = {
+                    "source": source_fingerprint["sha256"] if source_fingerprint else None,
+                    "start_time": moment["start_time"],
+                    "duration": duration,
+                    "video_codec": os.getenv('VIDEO_CODEC', 'libx264'),
+                    "audio_codec": os.getenv('AUDIO_CODEC', 'aac')
+                }
+
+                recorded = state.get_item("clips", clip_name, inputs)
+                if recorded:
+                    logger.info(f"Reusing clip {i+1}/{len(moments)}: {clip_path.name}")
+                    clip_dirs.append(recorded)
+                    reused += 1
+                    continue
 
                 # Extract clip using ffmpeg
                 cmd = [
@@ -330,22 +538,40 @@ class VideoPipelineOrchestrator:
                     str(clip_path)
                 ]
 
-                subprocess.run(cmd, capture_output=True, check=True)
-                logger.info(f"Created clip {i+1}/{len(moments)}: {clip_path.name}")
-
-                # Extract subtitle for this clip if available
-                self._extract_clip_subtitle(video_id, video_dir, clip_dir, moment, clip_filename)
+                result = run_ffmpeg(cmd, duration=duration, label=clip_path.name)
+                logger.info(
+                    f"Created clip {i+1}/{len(moments)}: {clip_path.name} "
+                    f"({result.stats.wall_seconds:.1f}s, {result.stats.speed:.2f}x)"
+                )
 
-                clip_dirs.append({
+                clip_info = {
                     "dir": str(clip_dir),
                     "clip_file": str(clip_path),
                     "moment": moment
-                })
+                }
+
+                # Describe the clip from the encode so publishing doesn't probe it
+                validation = record_from_encode(result, clip_path)
+                if validation:
+                    get_media_probe().store(clip_path, validation)
+                    clip_info["validation"] = validation
+
+                state.record_item("clips", clip_name, inputs, [clip_path], clip_info)
+
+                clip_dirs.append(clip_info)
+
+            # Persist the encode records once for validators in other processes
+            get_media_probe().save()
+
+            # Without subtitles, transcribe just the clip ranges
+            if subtitles is None and self.transcribe_missing_subtitles:
+                self._transcribe_clips(video_id, video_path, clip_targets, source_fingerprint, state)
 
             return {
                 "success": True,
                 "clip_dirs": clip_dirs,
-                "total_clips": len(clip_dirs)
+                "total_clips": len(clip_dirs),
+                "reused": reused
             }
 
         except subprocess.CalledProcessError as e:
@@ -354,64 +580,138 @@ class VideoPipelineOrchestrator:
                 "error": f"Failed to create clips: {e.stderr}"
             }
 
-    def _extract_clip_subtitle(
+    def _load_subtitle_track(self, subtitle_path: Optional[str]) -> Optional[SubtitleTrack]:
+        """Parse the full video subtitle into an in-memory track"""
+        if not subtitle_path:
+            return None
+
+        try:
+            return parse_vtt_subtitle(Path(subtitle_path))
+        except Exception as e:
+            logger.warning(f"Failed to parse subtitle {subtitle_path}: {e}")
+            return None
+
+    def _transcribe_clips(
         self,
         video_id: str,
-        video_dir: Path,
-        clip_dir: Path,
-        moment: Dict,
-        clip_filename: str
+        video_path: str,
+        clip_targets: List[tuple],
+        source_fingerprint: Optional[Dict],
+        state: PipelineState
     ):
-        """Extract subtitle segment for a clip"""
-        try:
-            # Find full subtitle file
-            subtitle_files = list(video_dir.glob(f"{video_id}_full_subtitle*.vtt"))
-            if not subtitle_files:
-                return
+        """Transcribe moment windows for clips that have no transcript yet"""
+        model_size = os.getenv('WHISPER_MODEL', 'base')
+        padding = 1.0
+
+        pending = []
+        for clip_name, clip_dir, clip_stem, moment in clip_targets:
+            inputs = {
+                "source": source_fingerprint["sha256"] if source_fingerprint else None,
+                "start_time": moment["start_time"],
+                "duration": moment["duration"],
+                "model": model_size,
+                "padding": padding
+            }
+            if state.get_item("transcripts", clip_name, inputs):
+                continue
+            pending.append((clip_name, clip_dir, clip_stem, moment, inputs))
+
+        if not pending:
+            return
+
+        # Never install packages in the middle of a pipeline run
+        if importlib.util.find_spec("whisper") is None:
+            logger.warning(
+                f"No subtitles for {len(pending)} clip(s) and openai-whisper is not installed; "
+                "skipping transcription (pip install openai-whisper)"
+            )
+            return
 
-            full_subtitle = subtitle_files[0]
-            clip_subtitle_path = clip_dir / f"{Path(clip_filename).stem}_en.vtt"
+        logger.info(f"No subtitles available, transcribing {len(pending)} clip range(s)...")
 
-            # Use ffmpeg to extract subtitle segment
-            cmd = [
-                'ffmpeg',
-                '-i', str(full_subtitle),
-                '-ss', str(moment["start_time"]),
-                '-t', str(moment["duration"]),
-                '-y',
-                str(clip_subtitle_path)
-            ]
+        try:
+            # Whisper detects the spoken language on the first moment
+            result = transcribe_moments(
+                Path(video_path),
+                [target[3] for target in pending],
+                model_size=model_size,
+                language=None,
+                padding=padding
+            )
+        except Exception as e:
+            logger.warning(f"Clip transcription failed: {e}")
+            return
+
+        language = result.get("detected_language") or "und"
+        for (clip_name, clip_dir, clip_stem, moment, inputs), clip in zip(pending, result["clips"]):
+            vtt_path, markdown_path = write_clip_transcript(
+                clip,
+                clip_dir / f"{clip_stem}_{language}.vtt",
+                clip_dir / f"{clip_stem}_{language}.md",
+                video_id=video_id
+            )
+            state.record_item(
+                "transcripts",
+                clip_name,
+                inputs,
+                [vtt_path, markdown_path],
+                {"segments": len(clip["segments"]), "vtt_file": str(vtt_path)}
+            )
+            logger.info(f"Transcribed {clip_name}: {len(clip['segments'])} segment(s)")
 
-            subprocess.run(cmd, capture_output=True, check=True)
-            logger.debug(f"Extracted subtitle: {clip_subtitle_path.name}")
+    def _write_clip_subtitles(self, segments: List[Dict], clip_dir: Path, clip_stem: str):
+        """Write subtitle files for a clip from its rebased segments"""
+        for fmt in self.subtitle_formats:
+            if fmt == "srt":
+                content = generate_srt_content(segments)
+            else:
+                content = generate_vtt_content(segments)
 
-        except Exception as e:
-            logger.warning(f"Failed to extract subtitle: {e}")
+            clip_subtitle_path = clip_dir / f"{clip_stem}_en.{fmt}"
+            clip_subtitle_path.write_text(content, encoding='utf-8')
+            logger.debug(f"Wrote subtitle: {clip_subtitle_path.name} ({len(segments)} segments)")
 
-    def _generate_metadata(self, video_dir: Path, clip_dirs: List[Dict]) -> Dict:
+    def _generate_metadata(self, video_dir: Path, clip_dirs: List[Dict], state: PipelineState) -> Dict:
         """Generate AI metadata for all clips"""
         try:
-            agent = MetadataGeneratorAgent(
-                model=os.getenv('OPENAI_MODEL', 'gpt-4-turbo-preview'),
-                platform='youtube'
-            )
+            agent = None
 
             results = []
             for clip_info in clip_dirs:
                 clip_dir = Path(clip_info["dir"])
 
-                # Find transcript file
-                transcript_files = list(clip_dir.glob("*_en.vtt"))
+                # Find transcript file (Whisper transcripts carry the detected language)
+                transcript_files = sorted(clip_dir.glob("*_en.vtt")) or sorted(clip_dir.glob("*.vtt"))
                 if not transcript_files:
                     logger.warning(f"No transcript found for {clip_dir.name}, skipping metadata")
                     continue
 
+                # Metadata is regenerated only if the transcript changed
+                transcript_fingerprint = fingerprint_file(transcript_files[0])
+                inputs = {"transcript": transcript_fingerprint["sha256"]}
+
+                recorded = state.get_item("metadata", clip_dir.name, inputs)
+                if recorded:
+                    logger.info(f"Reusing metadata for {clip_dir.name}")
+                    results.append(recorded)
+                    continue
+
+                if agent is None:
+                    agent = MetadataGeneratorAgent(
+                        model=os.getenv('OPENAI_MODEL', 'gpt-4-turbo-preview'),
+                        platform='youtube'
+                    )
+
                 # Generate metadata
                 result = agent.generate_metadata_from_transcript(
                     transcript_path=transcript_files[0],
                     output_dir=clip_dir
                 )
 
+                metadata_files = list(clip_dir.glob("*_metadata.json"))
+                if result.get("success", False) and metadata_files:
+                    state.record_item("metadata", clip_dir.name, inputs, metadata_files, result)
+
                 results.append(result)
 
             successful = sum(1 for r in results if r.get("success", False))
@@ -430,13 +730,10 @@ class VideoPipelineOrchestrator:
                 "error": f"Failed to generate metadata: {str(e)}"
             }
 
-    def _generate_thumbnails(self, video_dir: Path, clip_dirs: List[Dict]) -> Dict:
+    def _generate_thumbnails(self, video_dir: Path, clip_dirs: List[Dict], state: PipelineState) -> Dict:
         """Generate AI thumbnails from metadata"""
         try:
-            agent = ThumbnailGeneratorAgent(
-                model='gpt-3.5-turbo',
-                image_provider='dalle'
-            )
+            agent = None
 
             results = []
             for clip_info in clip_dirs:
@@ -448,13 +745,34 @@ class VideoPipelineOrchestrator:
                     logger.warning(f"No metadata found for {clip_dir.name}, skipping thumbnails")
                     continue
 
+                # Thumbnails are regenerated only if the metadata changed
+                metadata_fingerprint = fingerprint_file(metadata_files[0])
+                inputs = {"metadata": metadata_fingerprint["sha256"]}
+
+                recorded = state.get_item("thumbnails", clip_dir.name, inputs)
+                if recorded:
+                    logger.info(f"Reusing thumbnails for {clip_dir.name}")
+                    results.append(recorded)
+                    continue
+
+                if agent is None:
+                    agent = ThumbnailGeneratorAgent(
+                        model='gpt-3.5-turbo',
+                        image_provider='dalle'
+                    )
+
                 # Generate thumbnails
+                thumbnails_dir = clip_dir / 'thumbnails'
                 result = agent.generate_thumbnails_from_metadata(
                     metadata_path=metadata_files[0],
-                    output_dir=clip_dir / 'thumbnails',
+                    output_dir=thumbnails_dir,
                     generate_images=True
                 )
 
+                thumbnail_files = sorted(thumbnails_dir.rglob("*.png")) if thumbnails_dir.exists() else []
+                if result.get("success", False) and thumbnail_files:
+                    state.record_item("thumbnails", clip_dir.name, inputs, thumbnail_files, result)
+
                 results.append(result)
 
             successful = sum(1 for r in results if r.get("success", False))
@@ -478,19 +796,27 @@ class VideoPipelineOrchestrator:
         video_dir: Path,
         clip_dirs: List[Dict],
         privacy: str,
-        dry_run: bool
+        dry_run: bool,
+        state: PipelineState
     ) -> Dict:
-        """Publish clips to YouTube"""
+        """Publish clips to YouTube, several at a time and best-scoring first"""
         try:
-            publisher = AutoPublisher(
-                platform='youtube',
-                dry_run=dry_run
-            )
+            publisher = self._get_publisher(dry_run)
 
             results = []
+            jobs = []
+            job_inputs = {}
             for clip_info in clip_dirs:
                 clip_dir = Path(clip_info["dir"])
 
+                # Never upload the same clip twice
+                inputs = {"clip_file": clip_info["clip_file"], "privacy": privacy}
+                recorded = state.get_item("publish", clip_dir.name, inputs)
+                if recorded:
+                    logger.info(f"Already published {clip_dir.name}: {recorded.get('video_url')}")
+                    results.append(UploadResult(**recorded))
+                    continue
+
                 # Find publishable videos
                 videos = publisher.find_publishable_videos(
                     directory=clip_dir,
@@ -502,22 +828,39 @@ class VideoPipelineOrchestrator:
                     logger.warning(f"No publishable video in {clip_dir.name}")
                     continue
 
-                # Publish the clip
-                result = publisher.publish_video(
+                jobs.append(PublishJob(
+                    key=clip_dir.name,
                     video_info=videos[0],
-                    thumbnail_index=0,
-                    privacy_status=privacy
-                )
-
-                results.append(result)
+                    score=clip_info.get("moment", {}).get("score", 0.0)
+                ))
+                job_inputs[clip_dir.name] = inputs
+
+            def record(job: PublishJob, result: UploadResult):
+                if result.success and not dry_run:
+                    state.record_item(
+                        "publish", job.key, job_inputs[job.key],
+                        [job.video_info['video_file']], asdict(result)
+                    )
+
+            # Deferred clips aren't recorded, so the next run picks them up
+            results.extend(publisher.publish_queue(
+                jobs,
+                thumbnail_index=0,
+                privacy_status=privacy,
+                on_result=record
+            ))
 
             successful = sum(1 for r in results if r.success)
+            deferred = sum(1 for r in results if r.status == "deferred")
             logger.info(f"Published {successful}/{len(results)} clips")
+            if deferred:
+                logger.info(f"Deferred {deferred} clip(s) to the next quota reset")
 
             return {
                 "success": True,
                 "results": results,
                 "successful": successful,
+                "deferred": deferred,
                 "total": len(results)
             }
 
@@ -527,6 +870,13 @@ class VideoPipelineOrchestrator:
                 "error": f"Failed to publish clips: {str(e)}"
             }
 
+    def _get_publisher(self, dry_run: bool) -> AutoPublisher:
+        """Get the shared publisher for a mode, creating it on first use"""
+        with self._publishers_lock:
+            if dry_run not in self._publishers:
+                self._publishers[dry_run] = AutoPublisher(platform='youtube', dry_run=dry_run)
+            return self._publishers[dry_run]
+
     def _generate_summary(self, result: Dict) -> Dict:
         """Generate pipeline execution summary"""
         steps = result.get("steps", {})
@@ -542,6 +892,8 @@ class VideoPipelineOrchestrator:
 
         if "publish" in steps and not steps["publish"].get("skipped"):
             summary["published"] = steps["publish"].get("successful", 0)
+            if steps["publish"].get("deferred"):
+                summary["deferred"] = steps["publish"]["deferred"]
 
         return summary
 
@@ -563,15 +915,23 @@ def main():
                         default="public", help="Privacy status (default: public)")
     parser.add_argument("--dry-run", action="store_true", help="Test without publishing")
     parser.add_argument("--output", default="output", help="Output directory")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Ignore pipeline_state.json and re-run every step")
+    parser.add_argument("--transcribe-missing", action="store_true",
+                        help="Transcribe clips with Whisper when the video has no subtitles")
 
     args = parser.parse_args()
 
-    orchestrator = VideoPipelineOrchestrator(output_base=args.output)
+    orchestrator = VideoPipelineOrchestrator(
+        output_base=args.output,
+        transcribe_missing_subtitles=args.transcribe_missing
+    )
     result = orchestrator.process_video(
         url_or_id=args.url,
         publish=args.publish,
         privacy=args.privacy,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        resume=not args.no_resume
     )
 
     if result["success"]: